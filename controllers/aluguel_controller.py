@@ -1,4 +1,4 @@
-from models.aluguel import Aluguel
+from models.aluguel import Aluguel, VALOR_DIARIA, MULTA_POR_DIA_ATRASO
 from database.aluguel_dao import AluguelDAO
 from database.dvd_dao import DVDDAO
 from datetime import datetime, timedelta
@@ -18,11 +18,10 @@ class AluguelController:
         Returns:
             Aluguel: Aluguel registrado com ID ou None se algum DVD não estiver disponível.
         """
-        # Verifica se todos os DVDs estão disponíveis
-        for dvd_id in dvds_ids:
-            dvd = DVDDAO.buscar_por_id(dvd_id)
-            if not dvd or not dvd.disponivel:
-                return None
+        # Cesta conferida no mapa em memória: um pedido com DVD alugado é
+        # recusado sem abrir a transação de escrita
+        if not DVDDAO.disponibilidade.todos_disponiveis(dvds_ids):
+            return None
         
         # Cria o aluguel
         data_aluguel = datetime.now()
@@ -36,9 +35,78 @@ class AluguelController:
             devolvido=False
         )
         
-        aluguel.id = AluguelDAO.inserir(aluguel)
+        # A disponibilidade é verificada e reservada atomicamente pelo DAO
+        if AluguelDAO.inserir(aluguel) is None:
+            return None
         return aluguel
     
+    @staticmethod
+    def verificar_cesta(dvds_ids):
+        """Lista os DVDs de uma cesta que não estão disponíveis, pelo mapa em memória.
+        
+        Args:
+            dvds_ids (list): IDs dos DVDs da cesta.
+            
+        Returns:
+            list: IDs dos DVDs alugados ou inexistentes (vazia se a cesta toda está livre).
+        """
+        return DVDDAO.disponibilidade.indisponiveis(dvds_ids)
+    
+    @staticmethod
+    def registrar_aluguel_por_titulos(cliente_id, titulos_ids, dias_para_devolucao=7):
+        """Registra um novo aluguel com qualquer cópia livre de cada título.
+        
+        Args:
+            cliente_id (int): ID do cliente que está alugando.
+            titulos_ids (list): IDs dos títulos; um título repetido aluga mais de uma cópia.
+            dias_para_devolucao (int, optional): Número de dias para devolução. Defaults to 7.
+            
+        Returns:
+            Aluguel: Aluguel registrado, com as cópias escolhidas em dvds_ids, ou None
+            se algum título não tiver cópia disponível.
+        """
+        data_aluguel = datetime.now()
+        
+        aluguel = Aluguel(
+            data_aluguel=data_aluguel,
+            cliente_id=cliente_id,
+            data_devolucao=data_aluguel + timedelta(days=dias_para_devolucao),
+            devolvido=False
+        )
+        
+        # As cópias são escolhidas e reservadas atomicamente pelo DAO
+        if AluguelDAO.inserir_por_titulos(aluguel, titulos_ids) is None:
+            return None
+        return aluguel
+    
+    @staticmethod
+    def registrar_alugueis_em_lote(pedidos):
+        """Registra vários aluguéis de uma vez, em uma única transação.
+        
+        Args:
+            pedidos (iterable): Tuplas (cliente_id, dvds_ids, dias_para_devolucao).
+            
+        Returns:
+            list: Para cada pedido, na mesma ordem, o Aluguel registrado com ID
+            ou None se algum DVD não estiver disponível.
+        """
+        data_aluguel = datetime.now()
+        
+        alugueis = [
+            Aluguel(
+                data_aluguel=data_aluguel,
+                cliente_id=cliente_id,
+                dvds_ids=list(dvds_ids),
+                data_devolucao=data_aluguel + timedelta(days=dias_para_devolucao),
+                devolvido=False
+            )
+            for cliente_id, dvds_ids, dias_para_devolucao in pedidos
+        ]
+        
+        ids = AluguelDAO.inserir_em_lote(alugueis)
+        
+        return [aluguel if aluguel_id else None for aluguel, aluguel_id in zip(alugueis, ids)]
+    
     @staticmethod
     def registrar_devolucao(aluguel_id):
         """Registra a devolução de um aluguel.
@@ -72,6 +140,35 @@ class AluguelController:
         """
         return AluguelDAO.listar_todos()
     
+    @staticmethod
+    def listar_alugueis_pagina(apos=None, limite=200):
+        """Lista uma página de aluguéis, dos mais recentes para os mais antigos.
+        
+        Args:
+            apos (tuple, optional): (data_aluguel_iso, id) do último aluguel da página anterior.
+                Defaults to None.
+            limite (int, optional): Número máximo de aluguéis. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos Aluguel; menos de limite indica a última página.
+        """
+        return AluguelDAO.listar_pagina(apos, limite)
+    
+    @staticmethod
+    def listar_alugueis_exibicao(filtro_cliente=None, apos=None, limite=None):
+        """Lista os aluguéis prontos para exibição (cliente e DVDs já resolvidos).
+        
+        Args:
+            filtro_cliente (str, optional): Parte do nome do cliente para filtrar. Defaults to None.
+            apos (tuple, optional): (data_aluguel_iso, id) do último aluguel da página anterior.
+                Defaults to None.
+            limite (int, optional): Tamanho da página; None para todos. Defaults to None.
+            
+        Returns:
+            list: Lista de dicionários com os dados de exibição de cada aluguel.
+        """
+        return AluguelDAO.listar_para_exibicao(filtro_cliente, apos, limite)
+    
     @staticmethod
     def listar_alugueis_cliente(cliente_id):
         """Lista todos os aluguéis de um cliente.
@@ -94,13 +191,13 @@ class AluguelController:
         return AluguelDAO.listar_alugueis_em_atraso()
     
     @staticmethod
-    def calcular_valor_aluguel(aluguel_id, valor_diaria=5.0, multa_por_dia_atraso=2.0):
+    def calcular_valor_aluguel(aluguel_id, valor_diaria=VALOR_DIARIA, multa_por_dia_atraso=MULTA_POR_DIA_ATRASO):
         """Calcula o valor de um aluguel, incluindo possíveis multas por atraso.
         
         Args:
             aluguel_id (int): ID do aluguel.
-            valor_diaria (float, optional): Valor da diária por DVD. Defaults to 5.0.
-            multa_por_dia_atraso (float, optional): Valor da multa por dia de atraso. Defaults to 2.0.
+            valor_diaria (float, optional): Valor da diária por DVD. Defaults to VALOR_DIARIA.
+            multa_por_dia_atraso (float, optional): Valor da multa por dia de atraso. Defaults to MULTA_POR_DIA_ATRASO.
             
         Returns:
             dict: Dicionário com os valores calculados ou None se o aluguel não for encontrado.
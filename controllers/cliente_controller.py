@@ -71,6 +71,19 @@ class ClienteController:
         """
         return ClienteDAO.listar_todos()
     
+    @staticmethod
+    def listar_clientes_pagina(apos=None, limite=200):
+        """Lista uma página de clientes em ordem de nome.
+        
+        Args:
+            apos (tuple, optional): (nome, id) do último cliente da página anterior. Defaults to None.
+            limite (int, optional): Número máximo de clientes. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos Cliente; menos de limite indica a última página.
+        """
+        return ClienteDAO.listar_pagina(apos, limite)
+    
     @staticmethod
     def buscar_clientes_por_nome(nome):
         """Busca clientes pelo nome (busca parcial).
@@ -83,6 +96,22 @@ class ClienteController:
         """
         return ClienteDAO.buscar_por_nome(nome)
     
+    @staticmethod
+    def pesquisar_clientes(texto, limite=50):
+        """Pesquisa clientes pelo início das palavras do nome, com ranking de relevância.
+        
+        Ignora acentos e maiúsculas ("joao" encontra "João") e a ordem das
+        palavras ("silva jo" encontra "João Silva").
+        
+        Args:
+            texto (str): Texto da busca.
+            limite (int, optional): Número máximo de resultados. Defaults to 50.
+            
+        Returns:
+            list: Lista de objetos Cliente, do mais relevante para o menos relevante.
+        """
+        return ClienteDAO.pesquisar(texto, limite)
+    
     @staticmethod
     def buscar_cliente_por_cpf(cpf):
         """Busca um cliente pelo CPF.
@@ -93,4 +122,17 @@ class ClienteController:
         Returns:
             Cliente: Cliente encontrado ou None se não encontrado.
         """
-        return ClienteDAO.buscar_por_cpf(cpf)
\ No newline at end of file
+        return ClienteDAO.buscar_por_cpf(cpf)
+    
+    @staticmethod
+    def buscar_clientes_por_prefixo(texto, limite=50):
+        """Busca clientes pelo início do CPF ou do nome (busca enquanto se digita).
+        
+        Args:
+            texto (str): Início do CPF (só dígitos) ou do nome.
+            limite (int, optional): Número máximo de resultados. Defaults to 50.
+            
+        Returns:
+            list: Lista de objetos Cliente encontrados.
+        """
+        return ClienteDAO.buscar_por_prefixo(texto, limite)
@@ -0,0 +1,162 @@
+from database.dashboard_dao import DashboardDAO
+from models.aluguel import VALOR_DIARIA
+from datetime import datetime
+
+# Receita estimada por DVD alugado nos rankings
+VALOR_POR_DVD = VALOR_DIARIA
+
+class DashboardController:
+    """Controlador para as estatísticas exibidas no dashboard."""
+    
+    @staticmethod
+    def estatisticas_gerais():
+        """Obtém os contadores gerais da locadora.
+        
+        Returns:
+            dict: Totais de clientes, DVDs, DVDs disponíveis, DVDs alugados,
+            aluguéis e aluguéis em atraso.
+        """
+        return DashboardDAO.estatisticas_gerais()
+    
+    @staticmethod
+    def filmes_mais_alugados(limite=10):
+        """Obtém os filmes mais alugados com a receita estimada.
+        
+        Args:
+            limite (int, optional): Quantidade de filmes. Defaults to 10.
+            
+        Returns:
+            list: Tuplas (nome, total_alugueis, receita_estimada).
+        """
+        return [
+            (nome, total_alugueis, total_alugueis * VALOR_POR_DVD)
+            for nome, total_alugueis in DashboardDAO.filmes_mais_alugados(limite)
+        ]
+    
+    @staticmethod
+    def clientes_mais_alugam(limite=10):
+        """Obtém os clientes que mais alugam com o valor total estimado.
+        
+        Args:
+            limite (int, optional): Quantidade de clientes. Defaults to 10.
+            
+        Returns:
+            list: Tuplas (nome, cpf, total_alugueis, valor_total).
+        """
+        return [
+            (nome, cpf, total_alugueis, total_alugueis * VALOR_POR_DVD)
+            for nome, cpf, total_alugueis in DashboardDAO.clientes_mais_alugam(limite)
+        ]
+    
+    @staticmethod
+    def _inicio_do_mes(data, deslocamento=0):
+        """Calcula o primeiro instante de um mês relativo à data informada.
+        
+        Args:
+            data (datetime): Data de referência.
+            deslocamento (int, optional): Meses a somar (negativo para voltar). Defaults to 0.
+            
+        Returns:
+            datetime: Dia 1 do mês resultante, à meia-noite.
+        """
+        ano, mes = divmod(data.year * 12 + data.month - 1 + deslocamento, 12)
+        return datetime(ano, mes + 1, 1)
+    
+    @staticmethod
+    def _montar_faturamento(periodos, agrupado):
+        """Monta as linhas de faturamento, preenchendo períodos sem movimento.
+        
+        Args:
+            periodos (list): Tuplas (chave, titulo) em ordem cronológica, onde chave
+                é o período no formato retornado por DashboardDAO.faturamento_agrupado.
+            agrupado (list): Resultado de DashboardDAO.faturamento_agrupado.
+            
+        Returns:
+            dict: "periodos" com tuplas (titulo, total_alugueis, receita, multas, ticket_medio),
+            do período mais recente ao mais antigo, e "total" com a mesma tupla
+            somada para o intervalo inteiro.
+        """
+        valores = {periodo: (alugueis, receita, multas) for periodo, alugueis, _, receita, multas in agrupado}
+        
+        def linha(titulo, total_alugueis, receita, multas):
+            ticket_medio = receita / total_alugueis if total_alugueis > 0 else 0
+            return (titulo, total_alugueis, receita, multas, ticket_medio)
+        
+        linhas = [linha(titulo, *valores.get(chave, (0, 0.0, 0.0))) for chave, titulo in reversed(periodos)]
+        total = linha(
+            "Total do Período",
+            sum(v[0] for v in valores.values()),
+            sum(v[1] for v in valores.values()),
+            sum(v[2] for v in valores.values())
+        )
+        
+        return {"periodos": linhas, "total": total}
+    
+    @staticmethod
+    def faturamento_periodo(inicio, fim):
+        """Calcula o faturamento mês a mês de um período qualquer.
+        
+        Os valores vêm do resumo diário: a receita é a cobrada nas locações de
+        cada mês e as multas, as recebidas nas devoluções do mês.
+        
+        Args:
+            inicio (datetime): Início do período (inclusivo); normalmente o dia 1 de um mês.
+            fim (datetime): Fim do período (exclusivo).
+            
+        Returns:
+            dict: Linhas por mês, incluindo meses sem aluguéis, e o total (veja _montar_faturamento).
+        """
+        meses = []
+        mes = DashboardController._inicio_do_mes(inicio)
+        while mes < fim:
+            meses.append((mes.strftime('%Y-%m'), mes.strftime('%B %Y')))
+            mes = DashboardController._inicio_do_mes(mes, 1)
+        
+        return DashboardController._montar_faturamento(
+            meses, DashboardDAO.faturamento_agrupado(inicio, fim, "mes")
+        )
+    
+    @staticmethod
+    def faturamento_mensal(meses=3):
+        """Calcula o faturamento dos últimos meses, incluindo o mês atual.
+        
+        Args:
+            meses (int, optional): Quantidade de meses. Defaults to 3.
+            
+        Returns:
+            dict: Mesmo formato de faturamento_periodo.
+        """
+        hoje = datetime.now()
+        inicio = DashboardController._inicio_do_mes(hoje, -(meses - 1))
+        fim = DashboardController._inicio_do_mes(hoje, 1)
+        return DashboardController.faturamento_periodo(inicio, fim)
+    
+    @staticmethod
+    def faturamento_ano_atual():
+        """Calcula o faturamento de janeiro até o mês atual.
+        
+        Returns:
+            dict: Mesmo formato de faturamento_periodo.
+        """
+        hoje = datetime.now()
+        return DashboardController.faturamento_periodo(
+            datetime(hoje.year, 1, 1), DashboardController._inicio_do_mes(hoje, 1)
+        )
+    
+    @staticmethod
+    def faturamento_anual(anos=10):
+        """Calcula o faturamento ano a ano, incluindo o ano atual.
+        
+        Args:
+            anos (int, optional): Quantidade de anos. Defaults to 10.
+            
+        Returns:
+            dict: Linhas por ano e o total (veja _montar_faturamento).
+        """
+        ano_atual = datetime.now().year
+        primeiro = ano_atual - anos + 1
+        
+        return DashboardController._montar_faturamento(
+            [(str(ano), str(ano)) for ano in range(primeiro, ano_atual + 1)],
+            DashboardDAO.faturamento_agrupado(datetime(primeiro, 1, 1), datetime(ano_atual + 1, 1, 1), "ano")
+        )
\ No newline at end of file
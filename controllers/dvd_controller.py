@@ -1,5 +1,6 @@
 from models.dvd import DVD
 from database.dvd_dao import DVDDAO
+from database.titulo_dao import TituloDAO
 
 class DVDController:
     """Controlador para gerenciar operações relacionadas a DVDs."""
@@ -85,6 +86,19 @@ class DVDController:
         """
         return DVDDAO.listar_todos()
     
+    @staticmethod
+    def listar_dvds_pagina(apos=None, limite=200):
+        """Lista uma página de DVDs em ordem de nome.
+        
+        Args:
+            apos (tuple, optional): (nome, id) do último DVD da página anterior. Defaults to None.
+            limite (int, optional): Número máximo de DVDs. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos DVD; menos de limite indica a última página.
+        """
+        return DVDDAO.listar_pagina(apos, limite)
+    
     @staticmethod
     def buscar_dvds_por_nome(nome):
         """Busca DVDs pelo nome (busca parcial).
@@ -97,6 +111,42 @@ class DVDController:
         """
         return DVDDAO.buscar_por_nome(nome)
     
+    @staticmethod
+    def pesquisar_dvds(texto, limite=100):
+        """Pesquisa DVDs pelo título e pela sinopse, com ranking de relevância.
+        
+        Aceita palavras incompletas ("matr" encontra "Matrix") e ignora
+        acentos ("leao" encontra "Leão").
+        
+        Se nenhum DVD tiver as palavras buscadas, tenta a busca aproximada
+        pelo título, que tolera erros de digitação ("Matirx" encontra "Matrix").
+        
+        Args:
+            texto (str): Texto da busca.
+            limite (int, optional): Número máximo de resultados. Defaults to 100.
+            
+        Returns:
+            list: Lista de objetos DVD, do mais relevante para o menos relevante.
+        """
+        dvds = DVDDAO.pesquisar(texto, limite)
+        if dvds:
+            return dvds
+        
+        return [dvd for dvd, _ in DVDDAO.buscar_aproximado(texto, limite)]
+    
+    @staticmethod
+    def buscar_dvds_aproximado(texto, limite=20):
+        """Busca DVDs pelo título tolerando erros de digitação, com a similaridade de cada um.
+        
+        Args:
+            texto (str): Título digitado.
+            limite (int, optional): Número máximo de resultados. Defaults to 20.
+            
+        Returns:
+            list: Tuplas (DVD, similaridade de 0 a 1), da mais parecida para a menos parecida.
+        """
+        return DVDDAO.buscar_aproximado(texto, limite)
+    
     @staticmethod
     def listar_dvds_disponiveis():
         """Lista todos os DVDs disponíveis para aluguel.
@@ -106,6 +156,45 @@ class DVDController:
         """
         return DVDDAO.listar_disponiveis()
     
+    @staticmethod
+    def listar_titulos_disponiveis():
+        """Lista os títulos com alguma cópia livre, com a quantidade de cópias livres de cada um.
+        
+        Returns:
+            list: Lista de objetos Titulo, em ordem de nome.
+        """
+        return TituloDAO.listar_disponiveis()
+    
+    @staticmethod
+    def copias_disponiveis(titulo_id):
+        """Obtém quantas cópias de um título estão livres para aluguel.
+        
+        Args:
+            titulo_id (int): ID do título.
+            
+        Returns:
+            int: Cópias disponíveis (0 se o título não existir).
+        """
+        return TituloDAO.copias_disponiveis(titulo_id)
+    
+    @staticmethod
+    def carregar_disponibilidade():
+        """Lê do banco o mapa em memória da disponibilidade de todos os DVDs.
+        
+        Returns:
+            int: Quantidade de DVDs disponíveis.
+        """
+        return DVDDAO.disponibilidade.carregar()
+    
+    @staticmethod
+    def verificar_disponibilidade():
+        """Compara o mapa de disponibilidade em memória com a tabela de DVDs.
+        
+        Returns:
+            tuple: (IDs disponíveis só no mapa, IDs disponíveis só no banco).
+        """
+        return DVDDAO.disponibilidade.verificar()
+    
     @staticmethod
     def atualizar_disponibilidade(dvd_id, disponivel):
         """Atualiza a disponibilidade de um DVD.
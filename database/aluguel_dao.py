@@ -1,54 +1,256 @@
 from database.config import DatabaseConfig
+from database.dvd_dao import DVDDAO
 from models.aluguel import Aluguel
+from collections import Counter
 from datetime import datetime
 
+# Limite de parâmetros por cláusula IN, abaixo do mínimo garantido pelo SQLite (999)
+TAMANHO_BLOCO_IN = 900
+
+# Data gravada por datetime.isoformat() lida como microssegundos desde 1970-01-01:
+# segundos inteiros pelo julianday (2440587.5 é 1970-01-01) mais os seis dígitos
+# da fração, quando houver. É exato, ao contrário de multiplicar o julianday da
+# data completa, que o SQLite guarda em milissegundos.
+_MICROSSEGUNDOS = (
+    "CAST(round((julianday(substr({0}, 1, 19)) - 2440587.5) * 86400) AS INTEGER) * 1000000"
+    " + CAST(substr({0}, 21, 6) AS INTEGER)"
+)
+
+# Consultas do DAO, também conferidas por scripts/verificar_planos.py
+CONSULTA_DVDS_DO_ALUGUEL = "SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?"
+# Cópias livres de um título, pelo índice parcial idx_dvds_copias_livres
+CONSULTA_COPIAS_LIVRES = "SELECT id FROM dvds WHERE titulo_id = ? AND disponivel = 1 ORDER BY id LIMIT ?"
+
+# Filtros (sobre alugueis, alias a) e ordenações de _consulta_com_dvds
+FILTRO_POR_ID = "WHERE a.id = ?"
+FILTRO_EM_ABERTO = "WHERE a.id = ? AND a.devolvido = 0"
+FILTRO_POR_CLIENTE = "WHERE a.cliente_id = ?"
+FILTRO_EM_ATRASO = "WHERE a.devolvido = 0 AND a.data_devolucao < ?"
+ORDEM_PADRAO = "a.data_aluguel DESC"
+ORDEM_EM_ATRASO = "a.data_devolucao"
+
 class AluguelDAO:
     """Data Access Object para a entidade Aluguel."""
     
+    @staticmethod
+    def _reservar_dvds(cursor, dvds_ids):
+        """Marca DVDs como alugados somente se todos estiverem disponíveis.
+        
+        A condição disponivel = 1 faz parte do próprio UPDATE, então dois
+        terminais nunca conseguem reservar o mesmo DVD. Deve ser chamado
+        dentro de uma transação; se retornar False, ela precisa ser desfeita.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor da transação em andamento.
+            dvds_ids (list): IDs distintos dos DVDs a reservar.
+            
+        Returns:
+            bool: True se todos os DVDs foram reservados, False caso contrário.
+        """
+        reservados = 0
+        for inicio in range(0, len(dvds_ids), TAMANHO_BLOCO_IN):
+            bloco = dvds_ids[inicio:inicio + TAMANHO_BLOCO_IN]
+            marcadores = ", ".join("?" * len(bloco))
+            cursor.execute(
+                f"UPDATE dvds SET disponivel = 0 WHERE disponivel = 1 AND id IN ({marcadores})", bloco
+            )
+            reservados += cursor.rowcount
+        
+        return reservados == len(dvds_ids)
+    
     @staticmethod
     def inserir(aluguel):
-        """Insere um novo aluguel no banco de dados.
+        """Insere um novo aluguel no banco de dados, reservando seus DVDs.
+        
+        A reserva e a inserção acontecem na mesma transação BEGIN IMMEDIATE;
+        se algum DVD não existir ou já estiver alugado, nada é gravado.
         
         Args:
             aluguel (Aluguel): Objeto Aluguel a ser inserido.
             
         Returns:
-            int: ID do aluguel inserido.
+            int: ID do aluguel inserido ou None se algum DVD não estiver disponível.
+        """
+        dvds_ids = list(dict.fromkeys(aluguel.dvds_ids))
+        
+        with DatabaseConfig.transacao() as conn:
+            cursor = conn.cursor()
+            
+            # Reserva os DVDs antes de gravar o aluguel
+            reservados = AluguelDAO._reservar_dvds(cursor, dvds_ids)
+            if reservados:
+                AluguelDAO._gravar(cursor, aluguel, dvds_ids)
+            else:
+                conn.rollback()
+        
+        if not reservados:
+            # O mapa pode ter dado como livre um DVD alugado em outro terminal
+            DVDDAO.disponibilidade.sincronizar(dvds_ids)
+            return None
+        
+        DVDDAO.cache.invalidar(*dvds_ids)
+        DVDDAO.disponibilidade.marcar(dvds_ids, False)
+        return aluguel.id
+    
+    @staticmethod
+    def _reservar_copias(cursor, titulos_ids):
+        """Marca como alugada uma cópia livre de cada título pedido.
+        
+        As cópias são escolhidas pelo índice parcial das cópias livres e
+        marcadas com a mesma condição disponivel = 1 de _reservar_dvds. Como
+        a transação é BEGIN IMMEDIATE, nenhum outro terminal grava entre a
+        escolha e a marcação. Se retornar None, a transação precisa ser desfeita.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor da transação em andamento.
+            titulos_ids (list): IDs dos títulos; um título repetido pede mais de uma cópia.
+            
+        Returns:
+            list: IDs das cópias (DVDs) reservadas, ou None se algum título não tiver cópias livres suficientes.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        dvds_ids = []
+        for titulo_id, quantidade in Counter(titulos_ids).items():
+            cursor.execute(CONSULTA_COPIAS_LIVRES, (titulo_id, quantidade))
+            copias = [row["id"] for row in cursor.fetchall()]
+            if len(copias) < quantidade:
+                return None
+            dvds_ids.extend(copias)
+        
+        if not AluguelDAO._reservar_dvds(cursor, dvds_ids):
+            return None
+        return dvds_ids
+    
+    @staticmethod
+    def inserir_por_titulos(aluguel, titulos_ids):
+        """Insere um novo aluguel com qualquer cópia livre de cada título pedido.
+        
+        A escolha das cópias, a reserva e a inserção acontecem na mesma
+        transação BEGIN IMMEDIATE: dois terminais alugando o mesmo título ao
+        mesmo tempo recebem cópias diferentes, e se não houver cópias para
+        todos os títulos nada é gravado.
         
+        Args:
+            aluguel (Aluguel): Objeto Aluguel a ser inserido; dvds_ids é preenchido
+                com as cópias escolhidas.
+            titulos_ids (list): IDs dos títulos; um título repetido pede mais de uma cópia.
+            
+        Returns:
+            int: ID do aluguel inserido ou None se algum título não tiver cópia disponível.
+        """
+        if not titulos_ids:
+            return None
+        
+        with DatabaseConfig.transacao() as conn:
+            cursor = conn.cursor()
+            
+            dvds_ids = AluguelDAO._reservar_copias(cursor, titulos_ids)
+            if dvds_ids is None:
+                conn.rollback()
+                return None
+            
+            aluguel.dvds_ids = dvds_ids
+            AluguelDAO._gravar(cursor, aluguel, dvds_ids)
+        
+        DVDDAO.cache.invalidar(*dvds_ids)
+        DVDDAO.disponibilidade.marcar(dvds_ids, False)
+        return aluguel.id
+    
+    @staticmethod
+    def _gravar(cursor, aluguel, dvds_ids):
+        """Insere o aluguel e seus DVDs, já reservados, e preenche aluguel.id.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor da transação em andamento.
+            aluguel (Aluguel): Objeto Aluguel a ser inserido.
+            dvds_ids (list): IDs distintos dos DVDs do aluguel.
+        """
         # Insere o aluguel
         cursor.execute("""
-        INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido, valor)
+        VALUES (?, ?, ?, ?, ?)
         """, (
-            aluguel.data_aluguel.isoformat(),
+            aluguel.data_aluguel_iso,
             aluguel.cliente_id,
-            aluguel.data_devolucao.isoformat() if aluguel.data_devolucao else None,
-            1 if aluguel.devolvido else 0
+            aluguel.data_devolucao_iso,
+            1 if aluguel.devolvido else 0,
+            aluguel.calcular_valor()
         ))
         
         aluguel.id = cursor.lastrowid
         
         # Insere os DVDs do aluguel
-        for dvd_id in aluguel.dvds_ids:
-            cursor.execute("""
-            INSERT INTO aluguel_dvd (aluguel_id, dvd_id)
-            VALUES (?, ?)
-            """, (aluguel.id, dvd_id))
+        cursor.executemany("""
+        INSERT INTO aluguel_dvd (aluguel_id, dvd_id)
+        VALUES (?, ?)
+        """, [(aluguel.id, dvd_id) for dvd_id in dvds_ids])
+    
+    @staticmethod
+    def inserir_em_lote(alugueis):
+        """Insere vários aluguéis em uma única transação.
+        
+        A disponibilidade de todos os DVDs é verificada com uma consulta por
+        conjunto de IDs, e as inserções em aluguel_dvd e as atualizações de
+        disponibilidade usam executemany. Um aluguel é recusado se algum de
+        seus DVDs não existir, estiver alugado ou já tiver sido reservado por
+        um aluguel anterior do mesmo lote.
+        
+        Args:
+            alugueis (list): Objetos Aluguel a serem inseridos.
             
-            # Atualiza a disponibilidade do DVD
-            cursor.execute("""
-            UPDATE dvds
-            SET disponivel = 0
-            WHERE id = ?
-            """, (dvd_id,))
+        Returns:
+            list: ID de cada aluguel inserido, ou None para os recusados, na mesma ordem.
+        """
+        ids_solicitados = list({dvd_id for aluguel in alugueis for dvd_id in aluguel.dvds_ids})
         
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.transacao() as conn:
+            cursor = conn.cursor()
+            
+            # Verifica a disponibilidade de todos os DVDs do lote de uma vez
+            disponiveis = set()
+            for inicio in range(0, len(ids_solicitados), TAMANHO_BLOCO_IN):
+                bloco = ids_solicitados[inicio:inicio + TAMANHO_BLOCO_IN]
+                marcadores = ", ".join("?" * len(bloco))
+                cursor.execute(
+                    f"SELECT id FROM dvds WHERE disponivel = 1 AND id IN ({marcadores})", bloco
+                )
+                disponiveis.update(row["id"] for row in cursor.fetchall())
+            
+            resultados = []
+            relacoes = []
+            for aluguel in alugueis:
+                dvds_ids = list(dict.fromkeys(aluguel.dvds_ids))
+                if not dvds_ids or not disponiveis.issuperset(dvds_ids):
+                    resultados.append(None)
+                    continue
+                
+                cursor.execute("""
+                INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido, valor)
+                VALUES (?, ?, ?, ?, ?)
+                """, (
+                    aluguel.data_aluguel_iso,
+                    aluguel.cliente_id,
+                    aluguel.data_devolucao_iso,
+                    1 if aluguel.devolvido else 0,
+                    aluguel.calcular_valor()
+                ))
+                aluguel.id = cursor.lastrowid
+                
+                # Reserva os DVDs para que aluguéis seguintes do lote não os usem
+                disponiveis.difference_update(dvds_ids)
+                relacoes.extend((aluguel.id, dvd_id) for dvd_id in dvds_ids)
+                resultados.append(aluguel.id)
+            
+            cursor.executemany(
+                "INSERT INTO aluguel_dvd (aluguel_id, dvd_id) VALUES (?, ?)", relacoes
+            )
+            cursor.executemany(
+                "UPDATE dvds SET disponivel = 0 WHERE id = ?",
+                [(dvd_id,) for _, dvd_id in relacoes]
+            )
         
-        return aluguel.id
+        DVDDAO.cache.invalidar(*(dvd_id for _, dvd_id in relacoes))
+        DVDDAO.disponibilidade.marcar((dvd_id for _, dvd_id in relacoes), False)
+        return resultados
     
     @staticmethod
     def atualizar(aluguel):
@@ -60,25 +262,22 @@ class AluguelDAO:
         Returns:
             bool: True se a atualização foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        UPDATE alugueis
-        SET data_aluguel = ?, cliente_id = ?, data_devolucao = ?, devolvido = ?
-        WHERE id = ?
-        """, (
-            aluguel.data_aluguel.isoformat(),
-            aluguel.cliente_id,
-            aluguel.data_devolucao.isoformat() if aluguel.data_devolucao else None,
-            1 if aluguel.devolvido else 0,
-            aluguel.id
-        ))
-        
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            UPDATE alugueis
+            SET data_aluguel = ?, cliente_id = ?, data_devolucao = ?, devolvido = ?
+            WHERE id = ?
+            """, (
+                aluguel.data_aluguel_iso,
+                aluguel.cliente_id,
+                aluguel.data_devolucao_iso,
+                1 if aluguel.devolvido else 0,
+                aluguel.id
+            ))
+            
+            success = cursor.rowcount > 0
         
         return success
     
@@ -92,34 +291,121 @@ class AluguelDAO:
         Returns:
             bool: True se a exclusão foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        # Obtém os DVDs do aluguel
-        cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-        dvd_ids = [row["dvd_id"] for row in cursor.fetchall()]
-        
-        # Exclui as relações com DVDs
-        cursor.execute("DELETE FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            # Obtém os DVDs do aluguel
+            cursor.execute(CONSULTA_DVDS_DO_ALUGUEL, (aluguel_id,))
+            dvd_ids = [row["dvd_id"] for row in cursor.fetchall()]
+            
+            # Exclui as relações com DVDs
+            cursor.execute("DELETE FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
+            
+            # Exclui o aluguel
+            cursor.execute("DELETE FROM alugueis WHERE id = ?", (aluguel_id,))
+            
+            success = cursor.rowcount > 0
+            
+            # Se a exclusão foi bem-sucedida, atualiza a disponibilidade dos DVDs
+            if success:
+                for dvd_id in dvd_ids:
+                    cursor.execute("""
+                    UPDATE dvds
+                    SET disponivel = 1
+                    WHERE id = ?
+                    """, (dvd_id,))
         
-        # Exclui o aluguel
-        cursor.execute("DELETE FROM alugueis WHERE id = ?", (aluguel_id,))
+        if success:
+            DVDDAO.cache.invalidar(*dvd_ids)
+            DVDDAO.disponibilidade.marcar(dvd_ids, True)
+        return success
+    
+    @staticmethod
+    def _consulta_com_dvds(filtro="", ordem=ORDEM_PADRAO, origem="alugueis"):
+        """Monta a consulta de _iterar_com_dvds.
         
-        success = cursor.rowcount > 0
+        Args:
+            filtro (str, optional): Cláusula WHERE aplicada sobre alugueis (alias a). Defaults to "".
+            ordem (str, optional): Ordenação dos aluguéis. Defaults to ORDEM_PADRAO.
+            origem (str, optional): Tabela ou subconsulta lida como alias a. Defaults to "alugueis".
+            
+        Returns:
+            str: Consulta SQL.
+        """
+        return f"""
+        SELECT a.id,
+               {_MICROSSEGUNDOS.format("a.data_aluguel")} AS data_aluguel,
+               a.cliente_id,
+               {_MICROSSEGUNDOS.format("a.data_devolucao")} AS data_devolucao,
+               a.devolvido,
+               ad.dvd_id
+        FROM {origem} a
+        LEFT JOIN aluguel_dvd ad ON ad.aluguel_id = a.id
+        {filtro}
+        ORDER BY {ordem}, a.id DESC
+        """
+    
+    @staticmethod
+    def _iterar_com_dvds(cursor, filtro="", parametros=(), ordem=ORDEM_PADRAO, origem="alugueis",
+                         tamanho_lote=1000):
+        """Percorre aluguéis e os IDs de seus DVDs em uma única consulta.
         
-        # Se a exclusão foi bem-sucedida, atualiza a disponibilidade dos DVDs
-        if success:
-            for dvd_id in dvd_ids:
-                cursor.execute("""
-                UPDATE dvds
-                SET disponivel = 1
-                WHERE id = ?
-                """, (dvd_id,))
+        As linhas do JOIN chegam agrupadas por aluguel (a ordenação termina em
+        a.id, o que mantém a varredura pelo índice), então cada Aluguel é
+        montado em uma única passada e entregue assim que sua última linha é
+        lida. As datas vêm do SQLite já como inteiros e só viram datetime
+        quando o modelo as usa.
         
-        conn.commit()
-        conn.close()
+        Args:
+            cursor (sqlite3.Cursor): Cursor da conexão em uso.
+            filtro (str, optional): Cláusula WHERE aplicada sobre alugueis (alias a). Defaults to "".
+            parametros (tuple, optional): Parâmetros da cláusula WHERE. Defaults to ().
+            ordem (str, optional): Ordenação dos aluguéis. Defaults to ORDEM_PADRAO.
+            origem (str, optional): Tabela ou subconsulta lida como alias a; seus parâmetros
+                vêm antes dos do filtro. Defaults to "alugueis".
+            tamanho_lote (int, optional): Linhas lidas do cursor por vez (fetchmany). Defaults to 1000.
+            
+        Yields:
+            Aluguel: Um aluguel por vez, na ordem pedida.
+        """
+        cursor.execute(AluguelDAO._consulta_com_dvds(filtro, ordem, origem), parametros)
+        
+        atual = None
+        for lote in iter(lambda: cursor.fetchmany(tamanho_lote), []):
+            for row in lote:
+                if atual is None or atual.id != row["id"]:
+                    if atual is not None:
+                        yield atual
+                    atual = Aluguel(
+                        id=row["id"],
+                        data_aluguel=row["data_aluguel"],
+                        cliente_id=row["cliente_id"],
+                        # Lista do tamanho exato: a maioria dos aluguéis tem um só DVD
+                        dvds_ids=[row["dvd_id"]] if row["dvd_id"] is not None else [],
+                        data_devolucao=row["data_devolucao"],
+                        devolvido=bool(row["devolvido"])
+                    )
+                elif row["dvd_id"] is not None:
+                    atual.dvds_ids.append(row["dvd_id"])
+        
+        if atual is not None:
+            yield atual
+    
+    @staticmethod
+    def _carregar_com_dvds(cursor, filtro="", parametros=(), ordem=ORDEM_PADRAO, origem="alugueis"):
+        """Carrega em uma lista os aluguéis de _iterar_com_dvds.
         
-        return success
+        Args:
+            cursor (sqlite3.Cursor): Cursor da conexão em uso.
+            filtro (str, optional): Cláusula WHERE aplicada sobre alugueis (alias a). Defaults to "".
+            parametros (tuple, optional): Parâmetros da cláusula WHERE. Defaults to ().
+            ordem (str, optional): Ordenação dos aluguéis. Defaults to ORDEM_PADRAO.
+            origem (str, optional): Tabela ou subconsulta lida como alias a. Defaults to "alugueis".
+            
+        Returns:
+            list: Lista de objetos Aluguel.
+        """
+        return list(AluguelDAO._iterar_com_dvds(cursor, filtro, parametros, ordem, origem))
     
     @staticmethod
     def buscar_por_id(aluguel_id):
@@ -131,30 +417,10 @@ class AluguelDAO:
         Returns:
             Aluguel: Objeto Aluguel encontrado ou None se não encontrado.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            alugueis = AluguelDAO._carregar_com_dvds(conn.cursor(), FILTRO_POR_ID, (aluguel_id,))
         
-        cursor.execute("SELECT * FROM alugueis WHERE id = ?", (aluguel_id,))
-        row = cursor.fetchone()
-        
-        if not row:
-            conn.close()
-            return None
-        
-        # Busca os DVDs do aluguel
-        cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-        dvd_ids = [row["dvd_id"] for row in cursor.fetchall()]
-        
-        conn.close()
-        
-        return Aluguel(
-            id=row["id"],
-            data_aluguel=datetime.fromisoformat(row["data_aluguel"]),
-            cliente_id=row["cliente_id"],
-            dvds_ids=dvd_ids,
-            data_devolucao=datetime.fromisoformat(row["data_devolucao"]) if row["data_devolucao"] else None,
-            devolvido=bool(row["devolvido"])
-        )
+        return alugueis[0] if alugueis else None
     
     @staticmethod
     def listar_todos():
@@ -163,33 +429,76 @@ class AluguelDAO:
         Returns:
             list: Lista de objetos Aluguel.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM alugueis ORDER BY data_aluguel DESC")
-        rows = cursor.fetchall()
-        
-        alugueis = []
-        for row in rows:
-            aluguel_id = row["id"]
-            
-            # Busca os DVDs do aluguel
-            cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-            dvd_ids = [r["dvd_id"] for r in cursor.fetchall()]
-            
-            aluguel = Aluguel(
-                id=aluguel_id,
-                data_aluguel=datetime.fromisoformat(row["data_aluguel"]),
-                cliente_id=row["cliente_id"],
-                dvds_ids=dvd_ids,
-                data_devolucao=datetime.fromisoformat(row["data_devolucao"]) if row["data_devolucao"] else None,
-                devolvido=bool(row["devolvido"])
-            )
-            alugueis.append(aluguel)
+        with DatabaseConfig.connection() as conn:
+            return AluguelDAO._carregar_com_dvds(conn.cursor())
+    
+    @staticmethod
+    def iter_todos(tamanho_lote=1000):
+        """Percorre todos os aluguéis sem montar a lista inteira na memória.
+        
+        Para exportações e rotinas em lote: as linhas são lidas com fetchmany
+        e cada Aluguel é entregue assim que completo, então a memória usada
+        não cresce com o tamanho da tabela. A conexão fica emprestada do pool
+        só enquanto a iteração durar; se o laço for interrompido, ela volta
+        ao pool quando o gerador é fechado (use contextlib.closing para que
+        isso aconteça na hora).
+        
+        Args:
+            tamanho_lote (int, optional): Linhas lidas do banco por vez. Defaults to 1000.
+            
+        Yields:
+            Aluguel: Um aluguel por vez, na ordem de listar_todos.
+        """
+        with DatabaseConfig.connection() as conn:
+            yield from AluguelDAO._iterar_com_dvds(conn.cursor(), tamanho_lote=tamanho_lote)
+    
+    @staticmethod
+    def _origem_pagina(apos, limite):
+        """Monta a subconsulta que escolhe os aluguéis de uma página de listar_pagina.
         
-        conn.close()
+        Args:
+            apos (tuple): (data_aluguel em texto ISO, id) do último aluguel da página
+                anterior, ou None.
+            limite (int): Número máximo de aluguéis.
+            
+        Returns:
+            tuple: (subconsulta, usada como origem de _consulta_com_dvds, e seus parâmetros).
+        """
+        filtro = ""
+        parametros = ()
+        if apos is not None:
+            filtro = "WHERE (data_aluguel, id) < (?, ?)"
+            parametros = tuple(apos)
+        
+        return f"""(
+            SELECT id, data_aluguel, cliente_id, data_devolucao, devolvido
+            FROM alugueis
+            {filtro}
+            ORDER BY data_aluguel DESC, id DESC
+            LIMIT ?
+        )""", parametros + (limite,)
+    
+    @staticmethod
+    def listar_pagina(apos=None, limite=200):
+        """Lista uma página de aluguéis, na mesma ordem de listar_todos.
+        
+        A página é escolhida por uma subconsulta que continua pelo índice de
+        data a partir do último aluguel da página anterior (paginação por
+        chave, sem OFFSET); só então seus DVDs são buscados.
+        
+        Args:
+            apos (tuple, optional): (data_aluguel em texto ISO, id) do último aluguel da
+                página anterior, ou seja, (aluguel.data_aluguel_iso, aluguel.id); None
+                para a primeira página. Defaults to None.
+            limite (int, optional): Número máximo de aluguéis. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos Aluguel; menos de limite indica a última página.
+        """
+        pagina, parametros = AluguelDAO._origem_pagina(apos, limite)
         
-        return alugueis
+        with DatabaseConfig.connection() as conn:
+            return AluguelDAO._carregar_com_dvds(conn.cursor(), parametros=parametros, origem=pagina)
     
     @staticmethod
     def listar_por_cliente(cliente_id):
@@ -201,77 +510,50 @@ class AluguelDAO:
         Returns:
             list: Lista de objetos Aluguel do cliente.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT * FROM alugueis 
-        WHERE cliente_id = ? 
-        ORDER BY data_aluguel DESC
-        """, (cliente_id,))
-        rows = cursor.fetchall()
-        
-        alugueis = []
-        for row in rows:
-            aluguel_id = row["id"]
-            
-            # Busca os DVDs do aluguel
-            cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-            dvd_ids = [r["dvd_id"] for r in cursor.fetchall()]
-            
-            aluguel = Aluguel(
-                id=aluguel_id,
-                data_aluguel=datetime.fromisoformat(row["data_aluguel"]),
-                cliente_id=row["cliente_id"],
-                dvds_ids=dvd_ids,
-                data_devolucao=datetime.fromisoformat(row["data_devolucao"]) if row["data_devolucao"] else None,
-                devolvido=bool(row["devolvido"])
-            )
-            alugueis.append(aluguel)
-        
-        conn.close()
-        
-        return alugueis
+        with DatabaseConfig.connection() as conn:
+            return AluguelDAO._carregar_com_dvds(conn.cursor(), FILTRO_POR_CLIENTE, (cliente_id,))
     
     @staticmethod
     def registrar_devolucao(aluguel_id):
         """Registra a devolução de um aluguel.
         
+        A data da entrega e a multa por atraso ficam gravadas no aluguel; os
+        gatilhos do banco as somam no resumo diário do dia da entrega.
+        
         Args:
             aluguel_id (int): ID do aluguel a ser devolvido.
             
         Returns:
             bool: True se a devolução foi registrada com sucesso, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        # Atualiza o status do aluguel
-        cursor.execute("""
-        UPDATE alugueis
-        SET devolvido = 1
-        WHERE id = ?
-        """, (aluguel_id,))
-        
-        success = cursor.rowcount > 0
-        
-        if success:
-            # Obtém os DVDs do aluguel
-            cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-            dvd_ids = [row["dvd_id"] for row in cursor.fetchall()]
+        with DatabaseConfig.transacao() as conn:
+            cursor = conn.cursor()
+            
+            alugueis = AluguelDAO._carregar_com_dvds(cursor, FILTRO_EM_ABERTO, (aluguel_id,))
+            
+            # Um aluguel já devolvido não pode liberar DVDs que entretanto
+            # foram alugados de novo
+            if not alugueis:
+                return False
+            
+            aluguel = alugueis[0]
+            
+            cursor.execute("""
+            UPDATE alugueis
+            SET devolvido = 1, multa = ?, data_entrega = ?
+            WHERE id = ?
+            """, (aluguel.calcular_multa(), datetime.now().isoformat(), aluguel_id))
             
             # Atualiza a disponibilidade dos DVDs
-            for dvd_id in dvd_ids:
-                cursor.execute("""
-                UPDATE dvds
-                SET disponivel = 1
-                WHERE id = ?
-                """, (dvd_id,))
-        
-        conn.commit()
-        conn.close()
+            cursor.executemany("""
+            UPDATE dvds
+            SET disponivel = 1
+            WHERE id = ?
+            """, [(dvd_id,) for dvd_id in aluguel.dvds_ids])
         
-        return success
+        DVDDAO.cache.invalidar(*aluguel.dvds_ids)
+        DVDDAO.disponibilidade.marcar(aluguel.dvds_ids, True)
+        return True
     
     @staticmethod
     def listar_alugueis_em_atraso():
@@ -280,36 +562,100 @@ class AluguelDAO:
         Returns:
             list: Lista de objetos Aluguel em atraso.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
         hoje = datetime.now().date().isoformat()
         
-        cursor.execute("""
-        SELECT * FROM alugueis 
-        WHERE devolvido = 0 AND data_devolucao < ? 
-        ORDER BY data_devolucao
-        """, (hoje,))
-        rows = cursor.fetchall()
-        
-        alugueis = []
-        for row in rows:
-            aluguel_id = row["id"]
-            
-            # Busca os DVDs do aluguel
-            cursor.execute("SELECT dvd_id FROM aluguel_dvd WHERE aluguel_id = ?", (aluguel_id,))
-            dvd_ids = [r["dvd_id"] for r in cursor.fetchall()]
-            
-            aluguel = Aluguel(
-                id=aluguel_id,
-                data_aluguel=datetime.fromisoformat(row["data_aluguel"]),
-                cliente_id=row["cliente_id"],
-                dvds_ids=dvd_ids,
-                data_devolucao=datetime.fromisoformat(row["data_devolucao"]) if row["data_devolucao"] else None,
-                devolvido=False
-            )
-            alugueis.append(aluguel)
+        with DatabaseConfig.connection() as conn:
+            return AluguelDAO._carregar_com_dvds(conn.cursor(), FILTRO_EM_ATRASO, (hoje,), ordem=ORDEM_EM_ATRASO)
+    
+    @staticmethod
+    def _consulta_exibicao(filtro_cliente=None, apos=None, limite=None):
+        """Monta a consulta de listar_para_exibicao.
+        
+        Args:
+            filtro_cliente (str, optional): Parte do nome do cliente para filtrar. Defaults to None.
+            apos (tuple, optional): (data_aluguel_iso, id) do último aluguel da página
+                anterior. Defaults to None.
+            limite (int, optional): Número máximo de aluguéis; None para todos. Defaults to None.
+            
+        Returns:
+            tuple: (consulta SQL, lista de parâmetros).
+        """
+        condicoes = []
+        parametros = []
+        if filtro_cliente:
+            condicoes.append("c.nome LIKE ?")
+            parametros.append(f"%{filtro_cliente}%")
+        if apos is not None:
+            condicoes.append("(a.data_aluguel, a.id) < (?, ?)")
+            parametros.extend(apos)
+        
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        paginacao = ""
+        if limite is not None:
+            paginacao = "LIMIT ?"
+            parametros.append(limite)
+        
+        return f"""
+        SELECT a.id,
+               strftime('%d/%m/%Y', a.data_aluguel) AS data_aluguel,
+               c.nome AS cliente_nome,
+               (SELECT group_concat(d.nome, ', ')
+                FROM aluguel_dvd ad
+                JOIN dvds d ON d.id = ad.dvd_id
+                WHERE ad.aluguel_id = a.id) AS dvds,
+               strftime('%d/%m/%Y', a.data_devolucao) AS data_devolucao,
+               a.devolvido,
+               CASE
+                   WHEN a.devolvido = 0 AND date(a.data_devolucao) < date('now', 'localtime')
+                   THEN CAST(julianday(date('now', 'localtime')) - julianday(date(a.data_devolucao)) AS INTEGER)
+                   ELSE 0
+               END AS dias_atraso,
+               a.data_aluguel AS data_aluguel_iso
+        FROM alugueis a
+        LEFT JOIN clientes c ON c.id = a.cliente_id
+        {filtro}
+        ORDER BY a.data_aluguel DESC, a.id DESC
+        {paginacao}
+        """, parametros
+    
+    @staticmethod
+    def listar_para_exibicao(filtro_cliente=None, apos=None, limite=None):
+        """Lista os aluguéis já no formato de exibição, em uma única consulta.
         
-        conn.close()
+        Nome do cliente, títulos dos DVDs (concatenados) e dias de atraso são
+        resolvidos pelo próprio SQL, sem consultas adicionais por aluguel.
+        Com limite, retorna uma página, continuando pelo índice de data a
+        partir de apos (paginação por chave, como em listar_pagina).
         
-        return alugueis
\ No newline at end of file
+        Args:
+            filtro_cliente (str, optional): Parte do nome do cliente para filtrar. Defaults to None.
+            apos (tuple, optional): (data_aluguel_iso, id) do último aluguel da página
+                anterior. Defaults to None.
+            limite (int, optional): Número máximo de aluguéis; None para todos. Defaults to None.
+            
+        Returns:
+            list: Lista de dicionários com id, data_aluguel, cliente_nome, dvds,
+            data_devolucao (datas em dd/mm/aaaa), devolvido, dias_atraso e
+            data_aluguel_iso (a data gravada, usada como chave de página).
+        """
+        consulta, parametros = AluguelDAO._consulta_exibicao(filtro_cliente, apos, limite)
+        
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(consulta, parametros)
+            rows = cursor.fetchall()
+        
+        return [
+            {
+                "id": row["id"],
+                "data_aluguel": row["data_aluguel"] or "",
+                "cliente_nome": row["cliente_nome"] or "Cliente não encontrado",
+                "dvds": row["dvds"] or "Nenhum DVD",
+                "data_devolucao": row["data_devolucao"] or "",
+                "devolvido": bool(row["devolvido"]),
+                "dias_atraso": row["dias_atraso"],
+                "data_aluguel_iso": row["data_aluguel_iso"]
+            }
+            for row in rows
+        ]
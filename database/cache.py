@@ -0,0 +1,150 @@
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+# Todos os caches criados, para que possam ser esvaziados de uma vez
+_caches = weakref.WeakSet()
+
+
+def limpar_caches():
+    """Esvazia todos os caches (por exemplo, ao trocar de arquivo de banco)."""
+    for cache in list(_caches):
+        cache.limpar()
+
+
+def registrar_cache(cache):
+    """Inclui um cache entre os esvaziados por limpar_caches.
+    
+    Args:
+        cache (object): Objeto com um método limpar().
+    """
+    _caches.add(cache)
+
+
+class CacheLRU:
+    """Cache em memória, de tamanho limitado, para consultas por chave dos DAOs.
+    
+    Quando o limite é atingido, sai a entrada usada há mais tempo. O cache é
+    compartilhado entre as threads do carregador, então todas as operações
+    são protegidas por um lock.
+    
+    As leituras devolvem uma cópia do objeto guardado, para que alterações
+    feitas pela interface não apareçam no cache antes de serem gravadas.
+    
+    Para evitar que uma leitura feita antes de uma gravação guarde o valor
+    antigo depois da invalidação, quem lê do banco obtém versao() antes da
+    consulta e a repassa a guardar(): se alguma invalidação aconteceu no
+    meio, o valor é descartado.
+    """
+    
+    def __init__(self, capacidade=1024, validade=None):
+        """Inicializa o cache.
+        
+        Args:
+            capacidade (int, optional): Número máximo de entradas. Defaults to 1024.
+            validade (float, optional): Segundos até uma entrada expirar; None para
+                não expirar. Defaults to None.
+        """
+        self.capacidade = capacidade
+        self.validade = validade
+        
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self._versao = 0
+        
+        self.acertos = 0
+        self.falhas = 0
+        
+        registrar_cache(self)
+    
+    def obter(self, chave):
+        """Obtém uma cópia do valor guardado para a chave.
+        
+        Args:
+            chave: Chave consultada.
+            
+        Returns:
+            object: Cópia do valor ou None se a chave não estiver no cache (ou tiver expirado).
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            
+            if entrada is not None and self.validade is not None and time.monotonic() > entrada[1]:
+                del self._entradas[chave]
+                entrada = None
+            
+            if entrada is None:
+                self.falhas += 1
+                return None
+            
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            valor = entrada[0]
+        
+        return copy.copy(valor)
+    
+    def versao(self):
+        """Retorna o contador de invalidações, a ser repassado a guardar().
+        
+        Returns:
+            int: Versão atual do cache.
+        """
+        with self._lock:
+            return self._versao
+    
+    def guardar(self, chave, valor, versao):
+        """Guarda uma cópia do valor, se nada foi invalidado desde versao.
+        
+        Args:
+            chave: Chave do valor.
+            valor (object): Valor lido do banco.
+            versao (int): Resultado de versao() obtido antes da leitura.
+        """
+        expira = time.monotonic() + self.validade if self.validade is not None else None
+        
+        with self._lock:
+            if versao != self._versao:
+                return
+            
+            self._entradas[chave] = (copy.copy(valor), expira)
+            self._entradas.move_to_end(chave)
+            
+            while len(self._entradas) > self.capacidade:
+                self._entradas.popitem(last=False)
+    
+    def invalidar(self, *chaves):
+        """Remove as chaves informadas do cache.
+        
+        Deve ser chamada depois do commit da gravação que alterou os registros.
+        
+        Args:
+            *chaves: Chaves a remover.
+        """
+        with self._lock:
+            self._versao += 1
+            for chave in chaves:
+                self._entradas.pop(chave, None)
+    
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._versao += 1
+            self._entradas.clear()
+    
+    def estatisticas(self):
+        """Retorna os contadores de uso do cache.
+        
+        Returns:
+            dict: Acertos, falhas, taxa de acerto, entradas atuais e capacidade.
+        """
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "entradas": len(self._entradas),
+                "capacidade": self.capacidade
+            }
\ No newline at end of file
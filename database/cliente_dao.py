@@ -1,9 +1,42 @@
+from database.cache import CacheLRU
 from database.config import DatabaseConfig
+from database.normalizacao import chave_busca, termos
 from models.cliente import Cliente
 
+# Maior caractere: somado a um termo, dá o limite superior da faixa de prefixo
+FIM_PREFIXO = "\U0010ffff"
+
+# Clientes examinados pela busca ranqueada antes de ordenar por relevância
+LIMITE_CANDIDATOS = 1000
+# Entradas do índice de termos percorridas, no máximo, pela busca ranqueada
+LIMITE_VARREDURA = 5000
+
+# Consultas do DAO, também conferidas por scripts/verificar_planos.py
+CONSULTA_POR_ID = "SELECT * FROM clientes WHERE id = ?"
+CONSULTA_POR_CPF = "SELECT * FROM clientes WHERE cpf = ?"
+CONSULTA_TODOS = "SELECT * FROM clientes ORDER BY nome"
+# Faixa sobre o índice único de cpf: ":" é o caractere seguinte a "9", então
+# (prefixo, prefixo + ":") cobre todos os CPFs com o prefixo
+CONSULTA_POR_PREFIXO_CPF = "SELECT * FROM clientes WHERE cpf >= ? AND cpf < ? ORDER BY cpf LIMIT ?"
+# Clientes gravados sem passar pelo DAO; usam idx_clientes_nome_busca
+CONSULTA_HA_PENDENTES = "SELECT 1 FROM clientes WHERE nome_busca IS NULL LIMIT 1"
+CONSULTA_PENDENTES = "SELECT id, nome FROM clientes WHERE nome_busca IS NULL"
+# Entradas do índice de termos que começam com um termo, até um limite
+CONSULTA_CONTAGEM_TERMO = """
+SELECT COUNT(*) FROM (
+    SELECT 1 FROM clientes_termos WHERE termo >= ? AND termo < ? LIMIT ?
+)
+"""
+
 class ClienteDAO:
     """Data Access Object para a entidade Cliente."""
     
+    # Clientes por ID
+    cache = CacheLRU(DatabaseConfig.CACHE_CAPACIDADE, DatabaseConfig.CACHE_VALIDADE)
+    # ID do cliente por CPF; a entrada é conferida contra o cliente em cache,
+    # então uma troca de CPF não precisa saber o CPF antigo
+    cache_cpf = CacheLRU(DatabaseConfig.CACHE_CAPACIDADE, DatabaseConfig.CACHE_VALIDADE)
+    
     @staticmethod
     def inserir(cliente):
         """Insere um novo cliente no banco de dados.
@@ -14,18 +47,16 @@ class ClienteDAO:
         Returns:
             int: ID do cliente inserido.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO clientes (cpf, nome, telefone, endereco)
-        VALUES (?, ?, ?, ?)
-        """, (cliente.cpf, cliente.nome, cliente.telefone, cliente.endereco))
-        
-        cliente.id = cursor.lastrowid
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            INSERT INTO clientes (cpf, nome, telefone, endereco)
+            VALUES (?, ?, ?, ?)
+            """, (cliente.cpf, cliente.nome, cliente.telefone, cliente.endereco))
+            
+            cliente.id = cursor.lastrowid
+            ClienteDAO._gravar_termos(conn, [(cliente.id, cliente.nome)])
         
         return cliente.id
     
@@ -39,21 +70,114 @@ class ClienteDAO:
         Returns:
             bool: True se a atualização foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            UPDATE clientes
+            SET cpf = ?, nome = ?, telefone = ?, endereco = ?
+            WHERE id = ?
+            """, (cliente.cpf, cliente.nome, cliente.telefone, cliente.endereco, cliente.id))
+            
+            success = cursor.rowcount > 0
+            if success:
+                ClienteDAO._gravar_termos(conn, [(cliente.id, cliente.nome)])
         
-        cursor.execute("""
-        UPDATE clientes
-        SET cpf = ?, nome = ?, telefone = ?, endereco = ?
-        WHERE id = ?
-        """, (cliente.cpf, cliente.nome, cliente.telefone, cliente.endereco, cliente.id))
+        ClienteDAO.cache.invalidar(cliente.id)
+        return success
+    
+    @staticmethod
+    def _gravar_termos(conn, clientes):
+        """Regrava a chave de busca e os termos normalizados dos nomes.
         
-        success = cursor.rowcount > 0
+        Deve rodar na mesma transação que gravou os nomes.
+        
+        Args:
+            conn (sqlite3.Connection): Conexão com a transação aberta.
+            clientes (list): Tuplas (cliente_id, nome).
+        """
+        conn.executemany("DELETE FROM clientes_termos WHERE cliente_id = ?", ((cliente_id,) for cliente_id, _ in clientes))
+        conn.executemany(
+            "INSERT OR IGNORE INTO clientes_termos (cliente_id, termo) VALUES (?, ?)",
+            ((cliente_id, termo) for cliente_id, nome in clientes for termo in termos(nome or ""))
+        )
+        conn.executemany(
+            "UPDATE clientes SET nome_busca = ? WHERE id = ?",
+            ((chave_busca(nome or ""), cliente_id) for cliente_id, nome in clientes)
+        )
+    
+    @staticmethod
+    def indexar_nomes_pendentes():
+        """Indexa os clientes gravados sem passar pelo DAO (nome_busca nulo).
         
-        conn.commit()
-        conn.close()
+        Inserções em massa e trocas de nome feitas direto no banco deixam
+        nome_busca nulo (o gatilho clientes_nome_busca_au cuida das trocas);
+        a consulta por pendentes usa idx_clientes_nome_busca, então custa
+        quase nada quando não há nenhum.
         
-        return success
+        Returns:
+            int: Quantidade de clientes indexados.
+        """
+        with DatabaseConfig.connection() as conn:
+            pendente = conn.execute(CONSULTA_HA_PENDENTES).fetchone()
+        
+        if pendente is None:
+            return 0
+        
+        with DatabaseConfig.transacao() as conn:
+            clientes = [tuple(row) for row in conn.execute(CONSULTA_PENDENTES)]
+            ClienteDAO._gravar_termos(conn, clientes)
+        
+        return len(clientes)
+    
+    @staticmethod
+    def _termos_por_seletividade(cursor, texto):
+        """Normaliza o texto buscado e ordena os termos do mais raro para o mais comum.
+        
+        O primeiro termo escolhe os candidatos pelo índice e os demais são
+        conferidos candidato a candidato, então começar pelo termo com menos
+        clientes reduz o trabalho. As contagens param em LIMITE_VARREDURA.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor para as contagens.
+            texto (str): Texto digitado.
+            
+        Returns:
+            list: Termos normalizados, sem repetição.
+        """
+        termos_busca = sorted(set(termos(texto)), key=len, reverse=True)
+        if len(termos_busca) < 2:
+            return termos_busca
+        
+        contagens = {}
+        for termo in termos_busca:
+            cursor.execute(CONSULTA_CONTAGEM_TERMO, (termo, termo + FIM_PREFIXO, LIMITE_VARREDURA))
+            contagens[termo] = cursor.fetchone()[0]
+        
+        # sorted é estável: nos empates, o termo mais longo continua na frente
+        return sorted(termos_busca, key=contagens.get)
+    
+    @staticmethod
+    def _condicao_termos(termos_busca, coluna_id):
+        """Monta a condição de que cada termo é início de algum termo do nome do cliente.
+        
+        Args:
+            termos_busca (list): Termos normalizados.
+            coluna_id (str): Coluna com o ID do cliente na consulta externa (por exemplo, "c.id").
+            
+        Returns:
+            tuple: (condição SQL, lista de parâmetros); condição "1" se não houver termos.
+        """
+        condicoes = []
+        parametros = []
+        for termo in termos_busca:
+            condicoes.append(f"""EXISTS (
+                SELECT 1 FROM clientes_termos o
+                WHERE o.cliente_id = {coluna_id} AND o.termo >= ? AND o.termo < ?
+            )""")
+            parametros += [termo, termo + FIM_PREFIXO]
+        
+        return " AND ".join(condicoes) or "1", parametros
     
     @staticmethod
     def excluir(cliente_id):
@@ -65,21 +189,19 @@ class ClienteDAO:
         Returns:
             bool: True se a exclusão foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM clientes WHERE id = ?", (cliente_id,))
-        
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM clientes WHERE id = ?", (cliente_id,))
+            
+            success = cursor.rowcount > 0
         
+        ClienteDAO.cache.invalidar(cliente_id)
         return success
     
     @staticmethod
     def buscar_por_id(cliente_id):
-        """Busca um cliente pelo ID.
+        """Busca um cliente pelo ID, passando antes pelo cache.
         
         Args:
             cliente_id (int): ID do cliente a ser buscado.
@@ -87,22 +209,28 @@ class ClienteDAO:
         Returns:
             Cliente: Objeto Cliente encontrado ou None se não encontrado.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        cliente = ClienteDAO.cache.obter(cliente_id)
+        if cliente is not None:
+            return cliente
         
-        cursor.execute("SELECT * FROM clientes WHERE id = ?", (cliente_id,))
-        row = cursor.fetchone()
+        versao = ClienteDAO.cache.versao()
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_POR_ID, (cliente_id,))
+            row = cursor.fetchone()
         
         if row:
-            return Cliente(
+            cliente = Cliente(
                 id=row["id"],
                 cpf=row["cpf"],
                 nome=row["nome"],
                 telefone=row["telefone"],
                 endereco=row["endereco"]
             )
+            ClienteDAO.cache.guardar(cliente_id, cliente, versao)
+            return cliente
         
         return None
     
@@ -113,13 +241,74 @@ class ClienteDAO:
         Returns:
             list: Lista de objetos Cliente.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_TODOS)
+            rows = cursor.fetchall()
+        
+        clientes = []
+        for row in rows:
+            cliente = Cliente(
+                id=row["id"],
+                cpf=row["cpf"],
+                nome=row["nome"],
+                telefone=row["telefone"],
+                endereco=row["endereco"]
+            )
+            clientes.append(cliente)
+        
+        return clientes
+    
+    @staticmethod
+    def iter_todos(tamanho_lote=1000):
+        """Percorre todos os clientes sem montar a lista inteira na memória.
+        
+        As linhas são lidas com fetchmany; a conexão fica emprestada do pool
+        só enquanto a iteração durar (veja AluguelDAO.iter_todos).
+        
+        Args:
+            tamanho_lote (int, optional): Linhas lidas do banco por vez. Defaults to 1000.
+            
+        Yields:
+            Cliente: Um cliente por vez, na ordem de listar_todos.
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_TODOS)
+            for lote in iter(lambda: cursor.fetchmany(tamanho_lote), []):
+                for row in lote:
+                    yield Cliente(
+                        id=row["id"],
+                        cpf=row["cpf"],
+                        nome=row["nome"],
+                        telefone=row["telefone"],
+                        endereco=row["endereco"]
+                    )
+    
+    @staticmethod
+    def listar_pagina(apos=None, limite=200):
+        """Lista uma página de clientes, na mesma ordem de listar_todos.
+        
+        A consulta continua pelo índice de nome a partir do último cliente da
+        página anterior (paginação por chave, sem OFFSET).
         
-        cursor.execute("SELECT * FROM clientes ORDER BY nome")
-        rows = cursor.fetchall()
+        Args:
+            apos (tuple, optional): (nome, id) do último cliente da página anterior;
+                None para a primeira página. Defaults to None.
+            limite (int, optional): Número máximo de clientes. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos Cliente; menos de limite indica a última página.
+        """
+        consulta, parametros = ClienteDAO._consulta_pagina(apos, limite)
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(consulta, parametros)
+            rows = cursor.fetchall()
         
         clientes = []
         for row in rows:
@@ -134,9 +323,28 @@ class ClienteDAO:
         
         return clientes
     
+    @staticmethod
+    def _consulta_pagina(apos, limite):
+        """Monta a consulta de uma página de listar_pagina.
+        
+        Args:
+            apos (tuple): (nome, id) do último cliente da página anterior, ou None.
+            limite (int): Número máximo de clientes.
+            
+        Returns:
+            tuple: (consulta SQL, parâmetros).
+        """
+        filtro = ""
+        parametros = ()
+        if apos is not None:
+            filtro = "WHERE (nome, id) > (?, ?)"
+            parametros = tuple(apos)
+        
+        return f"SELECT * FROM clientes {filtro} ORDER BY nome, id LIMIT ?", parametros + (limite,)
+    
     @staticmethod
     def buscar_por_cpf(cpf):
-        """Busca um cliente pelo CPF.
+        """Busca um cliente pelo CPF, passando antes pelo cache.
         
         Args:
             cpf (str): CPF do cliente a ser buscado.
@@ -144,52 +352,232 @@ class ClienteDAO:
         Returns:
             Cliente: Objeto Cliente encontrado ou None se não encontrado.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        cliente_id = ClienteDAO.cache_cpf.obter(cpf)
+        if cliente_id is not None:
+            cliente = ClienteDAO.buscar_por_id(cliente_id)
+            if cliente is not None and cliente.cpf == cpf:
+                return cliente
         
-        cursor.execute("SELECT * FROM clientes WHERE cpf = ?", (cpf,))
-        row = cursor.fetchone()
+        versao = ClienteDAO.cache.versao()
+        versao_cpf = ClienteDAO.cache_cpf.versao()
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_POR_CPF, (cpf,))
+            row = cursor.fetchone()
         
         if row:
-            return Cliente(
+            cliente = Cliente(
                 id=row["id"],
                 cpf=row["cpf"],
                 nome=row["nome"],
                 telefone=row["telefone"],
                 endereco=row["endereco"]
             )
+            ClienteDAO.cache.guardar(cliente.id, cliente, versao)
+            ClienteDAO.cache_cpf.guardar(cpf, cliente.id, versao_cpf)
+            return cliente
         
         return None
     
+    @staticmethod
+    def _consulta_por_nome(termos_busca):
+        """Monta a consulta de buscar_por_nome.
+        
+        O primeiro termo (o mais raro) escolhe os candidatos pelo índice; os
+        demais são conferidos cliente a cliente.
+        
+        Args:
+            termos_busca (list): Termos normalizados, do mais raro para o mais comum.
+            
+        Returns:
+            tuple: (consulta SQL, parâmetros).
+        """
+        condicao, parametros = ClienteDAO._condicao_termos(termos_busca[1:], "c.id")
+        
+        return f"""
+        SELECT c.*
+        FROM clientes c
+        WHERE c.id IN (SELECT cliente_id FROM clientes_termos WHERE termo >= ? AND termo < ?)
+          AND {condicao}
+        ORDER BY c.nome, c.id
+        """, [termos_busca[0], termos_busca[0] + FIM_PREFIXO] + parametros
+    
     @staticmethod
     def buscar_por_nome(nome):
-        """Busca clientes pelo nome (busca parcial).
+        """Busca clientes pelo nome (busca parcial), sem diferenciar acentos nem maiúsculas.
+        
+        Cada palavra buscada precisa ser o início de alguma palavra do nome,
+        em qualquer ordem: "joao sil" encontra "Silva, João".
         
         Args:
             nome (str): Nome ou parte do nome a ser buscado.
             
         Returns:
-            list: Lista de objetos Cliente que correspondem à busca.
+            list: Lista de objetos Cliente que correspondem à busca, em ordem de nome.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        if not termos(nome):
+            return []
         
-        cursor.execute("SELECT * FROM clientes WHERE nome LIKE ? ORDER BY nome", (f"%{nome}%",))
-        rows = cursor.fetchall()
+        ClienteDAO.indexar_nomes_pendentes()
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            termos_busca = ClienteDAO._termos_por_seletividade(cursor, nome)
+            consulta, parametros = ClienteDAO._consulta_por_nome(termos_busca)
+            
+            cursor.execute(consulta, parametros)
+            rows = cursor.fetchall()
         
         clientes = []
         for row in rows:
             cliente = Cliente(
                 id=row["id"],
-                cpf=row.get("cpf", ""),
+                cpf=row["cpf"],
                 nome=row["nome"],
                 telefone=row["telefone"],
                 endereco=row["endereco"]
             )
             clientes.append(cliente)
-
-        return clientes
\ No newline at end of file
+        
+        return clientes
+    
+    @staticmethod
+    def _consulta_pesquisa(termos_busca, chave, limite):
+        """Monta a consulta de pesquisar.
+        
+        Os candidatos saem do índice de termos já em ordem de termo, então
+        quem tem a palavra inteira vem antes de quem só a começa; os nomes
+        com a chave exata entram pelo índice de nome_busca.
+        
+        Args:
+            termos_busca (list): Termos normalizados, do mais raro para o mais comum.
+            chave (str): Chave de busca do texto inteiro (chave_busca).
+            limite (int): Número máximo de resultados.
+            
+        Returns:
+            tuple: (consulta SQL, parâmetros).
+        """
+        condicao, parametros = ClienteDAO._condicao_termos(termos_busca[1:], "t.cliente_id")
+        marcadores = ", ".join("?" * len(termos_busca))
+        
+        return f"""
+        SELECT c.*,
+               (SELECT COUNT(*) FROM clientes_termos e
+                WHERE e.cliente_id = c.id AND e.termo IN ({marcadores})) AS inteiros
+        FROM clientes c
+        WHERE c.id IN (
+            SELECT id FROM clientes WHERE nome_busca = ?
+            UNION ALL
+            SELECT t.cliente_id
+            FROM (
+                SELECT cliente_id, termo
+                FROM clientes_termos
+                WHERE termo >= ? AND termo < ?
+                ORDER BY termo
+                LIMIT ?
+            ) t
+            WHERE {condicao}
+            LIMIT ?
+        )
+        ORDER BY c.nome_busca = ? DESC, inteiros DESC, length(c.nome_busca), c.nome_busca, c.id
+        LIMIT ?
+        """, (
+            termos_busca
+            + [chave, termos_busca[0], termos_busca[0] + FIM_PREFIXO, LIMITE_VARREDURA]
+            + parametros
+            + [LIMITE_CANDIDATOS, chave, limite]
+        )
+    
+    @staticmethod
+    def pesquisar(texto, limite=50):
+        """Busca clientes pelo início das palavras do nome, ordenados por relevância.
+        
+        Como em buscar_por_nome, cada palavra buscada precisa ser o início de
+        alguma palavra do nome, sem diferenciar acentos nem maiúsculas. Vêm
+        primeiro os nomes com exatamente as palavras buscadas, depois os com
+        mais palavras inteiras (e não só começos) e, por fim, os mais curtos.
+        
+        Para responder em tempo constante em bases grandes, a busca percorre
+        no máximo LIMITE_VARREDURA entradas do índice para o termo mais raro e
+        ordena no máximo LIMITE_CANDIDATOS clientes. Quando todos os termos são
+        comuns, o ranking é aproximado e, se a combinação for rara, pode faltar
+        alguém; o nome digitado por inteiro (em qualquer ordem) é sempre
+        encontrado, pelo índice de nome_busca.
+        
+        Args:
+            texto (str): Texto da busca.
+            limite (int, optional): Número máximo de resultados. Defaults to 50.
+            
+        Returns:
+            list: Lista de objetos Cliente, do mais relevante para o menos relevante.
+        """
+        if not termos(texto):
+            return []
+        
+        ClienteDAO.indexar_nomes_pendentes()
+        
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            termos_busca = ClienteDAO._termos_por_seletividade(cursor, texto)
+            consulta, parametros = ClienteDAO._consulta_pesquisa(termos_busca, chave_busca(texto), limite)
+            
+            cursor.execute(consulta, parametros)
+            rows = cursor.fetchall()
+        
+        clientes = []
+        for row in rows:
+            cliente = Cliente(
+                id=row["id"],
+                cpf=row["cpf"],
+                nome=row["nome"],
+                telefone=row["telefone"],
+                endereco=row["endereco"]
+            )
+            clientes.append(cliente)
+        
+        return clientes
+    
+    @staticmethod
+    def buscar_por_prefixo(texto, limite=50):
+        """Busca clientes pelo início do CPF ou do nome, para a busca enquanto se digita.
+        
+        Texto só com dígitos é tratado como início de CPF, buscado como uma
+        faixa sobre o índice único de cpf; qualquer outro vai para pesquisar().
+        Nos dois casos o tempo depende de limite, e não do número de clientes.
+        
+        Args:
+            texto (str): Início do CPF ou do nome.
+            limite (int, optional): Número máximo de resultados. Defaults to 50.
+            
+        Returns:
+            list: Lista de objetos Cliente, em ordem de CPF ou de relevância.
+        """
+        texto = texto.strip()
+        if not texto:
+            return []
+        
+        if not texto.isdigit():
+            return ClienteDAO.pesquisar(texto, limite)
+        
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_POR_PREFIXO_CPF, (texto, texto + ":", limite))
+            rows = cursor.fetchall()
+        
+        clientes = []
+        for row in rows:
+            cliente = Cliente(
+                id=row["id"],
+                cpf=row["cpf"],
+                nome=row["nome"],
+                telefone=row["telefone"],
+                endereco=row["endereco"]
+            )
+            clientes.append(cliente)
+        
+        return clientes
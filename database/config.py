@@ -1,84 +1,393 @@
 import os
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+from database import migracoes
+from database.cache import limpar_caches
+
+class ConnectionPool:
+    """Pool de conexões SQLite compartilhado entre os DAOs.
+    
+    As conexões são criadas sob demanda até o limite configurado e devolvidas
+    ao pool ao final de cada uso, evitando o custo de abrir e fechar o arquivo
+    do banco a cada consulta.
+    """
+    
+    def __init__(self, db_path, tamanho=5, timeout=30.0, pragmas=None):
+        """Inicializa o pool.
+        
+        Args:
+            db_path (str): Caminho do arquivo do banco de dados.
+            tamanho (int, optional): Número máximo de conexões abertas. Defaults to 5.
+            timeout (float, optional): Tempo máximo (em segundos) de espera por uma conexão livre. Defaults to 30.0.
+            pragmas (dict, optional): PRAGMAs aplicados a cada nova conexão. Defaults to None.
+        """
+        self.db_path = db_path
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
+        
+        self._livres = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._criadas = 0
+        self._fechado = False
+        
+        self.conexoes_abertas = 0
+        self.conexoes_reutilizadas = 0
+        self.conexoes_descartadas = 0
+    
+    def _criar_conexao(self):
+        """Abre uma nova conexão com o banco de dados.
+        
+        Returns:
+            sqlite3.Connection: Nova conexão configurada.
+        """
+        # check_same_thread=False: a conexão pode ser usada por outra thread,
+        # mas o pool garante que apenas uma thread a utiliza por vez
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Para acessar as colunas pelo nome
+        
+        for nome, valor in self.pragmas.items():
+            conn.execute(f"PRAGMA {nome} = {valor}")
+        
+        return conn
+    
+    @staticmethod
+    def _conexao_saudavel(conn):
+        """Verifica se uma conexão do pool ainda está utilizável.
+        
+        Args:
+            conn (sqlite3.Connection): Conexão a ser verificada.
+            
+        Returns:
+            bool: True se a conexão respondeu corretamente, False caso contrário.
+        """
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def adquirir(self):
+        """Obtém uma conexão do pool, criando uma nova se necessário.
+        
+        Returns:
+            sqlite3.Connection: Conexão pronta para uso.
+            
+        Raises:
+            RuntimeError: Se o pool foi fechado ou se nenhuma conexão ficou livre dentro do timeout.
+        """
+        if self._fechado:
+            raise RuntimeError("O pool de conexões foi fechado.")
+        
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                conn = None
+            
+            if conn is None:
+                with self._lock:
+                    pode_criar = self._criadas < self.tamanho
+                    if pode_criar:
+                        self._criadas += 1
+                
+                if pode_criar:
+                    try:
+                        conn = self._criar_conexao()
+                    except Exception:
+                        with self._lock:
+                            self._criadas -= 1
+                        raise
+                    with self._lock:
+                        self.conexoes_abertas += 1
+                    return conn
+                
+                # Pool cheio: aguarda uma conexão ser devolvida
+                try:
+                    conn = self._livres.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise RuntimeError("Tempo esgotado aguardando uma conexão livre no pool.")
+            
+            if self._conexao_saudavel(conn):
+                with self._lock:
+                    self.conexoes_reutilizadas += 1
+                return conn
+            
+            # Conexão com problema: descarta e tenta novamente
+            self._descartar(conn)
+    
+    def liberar(self, conn):
+        """Devolve uma conexão ao pool.
+        
+        Args:
+            conn (sqlite3.Connection): Conexão obtida por adquirir().
+        """
+        if conn.in_transaction:
+            conn.rollback()
+        
+        if self._fechado:
+            self._descartar(conn)
+        else:
+            self._livres.put(conn)
+    
+    def _descartar(self, conn):
+        """Fecha uma conexão e libera sua vaga no pool.
+        
+        Args:
+            conn (sqlite3.Connection): Conexão a ser descartada.
+        """
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        
+        with self._lock:
+            self._criadas -= 1
+            self.conexoes_descartadas += 1
+    
+    @contextmanager
+    def conexao(self):
+        """Context manager que empresta uma conexão do pool.
+        
+        Faz commit ao final do bloco, ou rollback se ocorrer uma exceção,
+        e devolve a conexão ao pool em ambos os casos.
+        
+        Yields:
+            sqlite3.Connection: Conexão emprestada.
+        """
+        conn = self.adquirir()
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.liberar(conn)
+    
+    @contextmanager
+    def transacao(self):
+        """Context manager que empresta uma conexão já dentro de BEGIN IMMEDIATE.
+        
+        O bloqueio de escrita é obtido logo no início, então leituras feitas
+        dentro do bloco não podem ser invalidadas por outro escritor antes do
+        commit.
+        
+        Yields:
+            sqlite3.Connection: Conexão emprestada, com a transação aberta.
+        """
+        with self.conexao() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+    
+    def fechar(self):
+        """Fecha todas as conexões livres e impede novos empréstimos."""
+        self._fechado = True
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._descartar(conn)
+    
+    def estatisticas(self):
+        """Retorna os contadores de uso do pool.
+        
+        Returns:
+            dict: Conexões abertas, reutilizadas, descartadas e atualmente criadas.
+        """
+        with self._lock:
+            return {
+                "abertas": self.conexoes_abertas,
+                "reutilizadas": self.conexoes_reutilizadas,
+                "descartadas": self.conexoes_descartadas,
+                "ativas": self._criadas,
+                "tamanho": self.tamanho
+            }
+
+
+class _ConexaoPool:
+    """Conexão emprestada do pool cujo close() a devolve em vez de fechá-la."""
+    
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+    
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+    
+    def close(self):
+        """Devolve a conexão ao pool."""
+        if self._conn is not None:
+            self._pool.liberar(self._conn)
+            self._conn = None
+
 
 class DatabaseConfig:
     """Classe para configuração e gerenciamento do banco de dados SQLite."""
     
+    DB_DIR = "database"
     DB_FILE = "locadora.db"
+    POOL_SIZE = 5
+    POOL_TIMEOUT = 30.0
+    
+    # Caches de consultas por chave dos DAOs. As gravações feitas por este
+    # processo os invalidam na hora; as de outros terminais passam a ser vistas
+    # quando a entrada expira
+    CACHE_CAPACIDADE = 4096
+    CACHE_VALIDADE = 30.0
+    
+    # Perfil de desempenho aplicado a cada conexão nova. O modo WAL permite
+    # que leitores continuem trabalhando enquanto outro terminal grava; ele
+    # exige que todos os terminais acessem o arquivo pelo sistema de arquivos
+    # local da máquina que o hospeda (não funciona em compartilhamentos de rede,
+    # caso em que journal_mode deve voltar para DELETE).
+    PERFIL_DESEMPENHO = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",      # seguro com WAL; evita fsync a cada commit
+        "cache_size": -16000,         # valores negativos são em KiB (~16 MB)
+        "mmap_size": 134217728,       # 128 MB de leitura via mmap
+        "temp_store": "MEMORY",       # ordenações e índices temporários em memória
+        "busy_timeout": 5000          # ms aguardando um bloqueio antes de falhar
+    }
+    
+    # Comportamento padrão do SQLite, útil para comparação em benchmarks
+    PERFIL_PADRAO_SQLITE = {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000
+    }
+    
+    _pool = None
+    _pool_lock = threading.Lock()
+    
+    @classmethod
+    def get_db_path(cls):
+        """Obtém o caminho do arquivo do banco de dados.
+        
+        Returns:
+            str: Caminho do arquivo do banco de dados.
+        """
+        return os.path.join(cls.DB_DIR, cls.DB_FILE)
+    
+    @classmethod
+    def get_pool(cls):
+        """Obtém o pool de conexões compartilhado, criando-o no primeiro uso.
+        
+        Returns:
+            ConnectionPool: Pool de conexões da aplicação.
+        """
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    # Verifica se o diretório database existe
+                    os.makedirs(cls.DB_DIR, exist_ok=True)
+                    cls._pool = ConnectionPool(
+                        cls.get_db_path(), cls.POOL_SIZE, cls.POOL_TIMEOUT, cls.PERFIL_DESEMPENHO
+                    )
+        return cls._pool
+    
+    @classmethod
+    def configurar_pool(cls, tamanho=None, timeout=None):
+        """Redefine os parâmetros do pool, fechando o pool atual.
+        
+        Args:
+            tamanho (int, optional): Número máximo de conexões. Defaults to None (mantém o atual).
+            timeout (float, optional): Tempo de espera por uma conexão livre. Defaults to None (mantém o atual).
+        """
+        if tamanho is not None:
+            cls.POOL_SIZE = tamanho
+        if timeout is not None:
+            cls.POOL_TIMEOUT = timeout
+        cls.fechar_pool()
+    
+    @classmethod
+    def configurar_perfil(cls, perfil=None, **pragmas):
+        """Redefine o perfil de PRAGMAs, fechando o pool atual.
+        
+        Args:
+            perfil (dict, optional): Perfil completo a ser usado. Defaults to None (mantém o atual).
+            **pragmas: PRAGMAs a sobrescrever no perfil, por exemplo cache_size=-64000.
+        """
+        novo = dict(cls.PERFIL_DESEMPENHO if perfil is None else perfil)
+        novo.update(pragmas)
+        cls.PERFIL_DESEMPENHO = novo
+        cls.fechar_pool()
+    
+    @classmethod
+    def fechar_pool(cls):
+        """Fecha o pool atual; o próximo acesso cria um novo.
+        
+        Os caches dos DAOs também são esvaziados, já que o próximo acesso
+        pode ser a outro arquivo de banco.
+        """
+        with cls._pool_lock:
+            if cls._pool is not None:
+                cls._pool.fechar()
+                cls._pool = None
+        limpar_caches()
+    
+    @classmethod
+    def connection(cls):
+        """Empresta uma conexão do pool para uso em um bloco with.
+        
+        Returns:
+            contextmanager: Context manager que fornece a conexão, faz commit
+            ao final do bloco (ou rollback em caso de erro) e a devolve ao pool.
+        """
+        return cls.get_pool().conexao()
+    
+    @classmethod
+    def transacao(cls):
+        """Empresta uma conexão do pool com uma transação BEGIN IMMEDIATE aberta.
+        
+        Returns:
+            contextmanager: Context manager que fornece a conexão e faz commit
+            ao final do bloco (ou rollback em caso de erro).
+        """
+        return cls.get_pool().transacao()
     
     @classmethod
     def get_connection(cls):
         """Obtém uma conexão com o banco de dados.
         
+        A conexão vem do pool; chamar close() a devolve ao pool.
+        
         Returns:
             sqlite3.Connection: Conexão com o banco de dados.
         """
-        # Verifica se o diretório database existe
-        os.makedirs("database", exist_ok=True)
-        
-        # Cria a conexão com o banco de dados
-        conn = sqlite3.connect(os.path.join("database", cls.DB_FILE))
-        conn.row_factory = sqlite3.Row  # Para acessar as colunas pelo nome
+        pool = cls.get_pool()
+        return _ConexaoPool(pool, pool.adquirir())
+    
+    @classmethod
+    def estatisticas_pool(cls):
+        """Retorna os contadores de uso do pool de conexões.
         
-        return conn
+        Returns:
+            dict: Conexões abertas, reutilizadas, descartadas e atualmente criadas.
+        """
+        return cls.get_pool().estatisticas()
     
     @classmethod
     def initialize_database(cls):
-        """Inicializa o banco de dados criando as tabelas necessárias."""
-        conn = cls.get_connection()
-        cursor = conn.cursor()
-        
-        # Tabela de Clientes
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS clientes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            cpf TEXT UNIQUE NOT NULL,
-            nome TEXT NOT NULL,
-            telefone TEXT,
-            endereco TEXT
-        )
-        """)
-        
-        # Adiciona coluna CPF se não existir (para compatibilidade com banco existente)
-        try:
-            cursor.execute("ALTER TABLE clientes ADD COLUMN cpf TEXT UNIQUE")
-        except sqlite3.OperationalError:
-            pass  # Coluna já existe
-        
-        # Tabela de DVDs
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS dvds (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nome TEXT NOT NULL,
-            sinopse TEXT,
-            ano_lancamento INTEGER,
-            ano_aquisicao INTEGER,
-            disponivel INTEGER DEFAULT 1
-        )
-        """)
-        
-        # Tabela de Aluguéis
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS alugueis (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            data_aluguel TEXT NOT NULL,
-            cliente_id INTEGER NOT NULL,
-            data_devolucao TEXT,
-            devolvido INTEGER DEFAULT 0,
-            FOREIGN KEY (cliente_id) REFERENCES clientes (id)
-        )
-        """)
-        
-        # Tabela de relação entre Aluguéis e DVDs
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS aluguel_dvd (
-            aluguel_id INTEGER,
-            dvd_id INTEGER,
-            PRIMARY KEY (aluguel_id, dvd_id),
-            FOREIGN KEY (aluguel_id) REFERENCES alugueis (id),
-            FOREIGN KEY (dvd_id) REFERENCES dvds (id)
-        )
-        """)
-        
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        """Inicializa o banco de dados aplicando as migrações pendentes.
+        
+        Com o esquema já atualizado, faz apenas a leitura de PRAGMA user_version.
+        """
+        with cls.connection() as conn:
+            migracoes.migrar(conn)
+    
+    @classmethod
+    def versao_esquema(cls):
+        """Obtém a versão de esquema do banco de dados.
+        
+        Returns:
+            int: Versão registrada em PRAGMA user_version.
+        """
+        with cls.connection() as conn:
+            return migracoes.versao_atual(conn)
\ No newline at end of file
@@ -0,0 +1,232 @@
+from database.config import DatabaseConfig
+from datetime import datetime
+
+# Expressão SQL que leva o dia (AAAA-MM-DD) de resumo_diario a cada agrupamento
+AGRUPAMENTOS_FATURAMENTO = {
+    "dia": "dia",
+    "semana": "date(dia, 'weekday 0', '-6 days')",
+    "mes": "substr(dia, 1, 7)",
+    "ano": "substr(dia, 1, 4)"
+}
+
+# Consultas do dashboard, também conferidas por scripts/verificar_planos.py
+CONSULTA_ESTATISTICAS = """
+SELECT
+    (SELECT COUNT(*) FROM clientes) AS total_clientes,
+    (SELECT COUNT(*) FROM dvds) AS total_dvds,
+    (SELECT COUNT(*) FROM dvds WHERE disponivel = 1) AS dvds_disponiveis,
+    (SELECT COUNT(*) FROM alugueis) AS total_alugueis,
+    (SELECT COUNT(*) FROM alugueis
+     WHERE devolvido = 0 AND data_devolucao < ?) AS alugueis_atraso
+"""
+CONSULTA_FILMES_MAIS_ALUGADOS = """
+SELECT t.nome, r.total_alugueis
+FROM resumo_titulo r
+JOIN titulos t ON t.id = r.titulo_id
+ORDER BY r.total_alugueis DESC
+LIMIT ?
+"""
+CONSULTA_CLIENTES_MAIS_ALUGAM = """
+SELECT c.nome, c.cpf, r.total_alugueis
+FROM resumo_cliente r
+JOIN clientes c ON c.id = r.cliente_id
+ORDER BY r.total_alugueis DESC
+LIMIT ?
+"""
+# {expressao}: um dos valores de AGRUPAMENTOS_FATURAMENTO
+CONSULTA_FATURAMENTO = """
+SELECT {expressao} AS periodo,
+       SUM(total_alugueis) AS total_alugueis,
+       SUM(total_dvds) AS total_dvds_alugados,
+       SUM(receita) AS receita,
+       SUM(multas) AS multas
+FROM resumo_diario
+WHERE dia >= ? AND dia < ?
+GROUP BY periodo
+ORDER BY periodo
+"""
+
+# Conteúdo esperado de cada tabela de resumo, calculado a partir dos aluguéis:
+# tabela -> (colunas, consulta). As colunas da consulta têm os nomes das da
+# tabela. Usado na reconstrução (recalcular_resumos) e na verificação de
+# scripts/recalcular_resumos.py. As migrações têm as suas próprias consultas,
+# escritas para o esquema da sua versão
+RESUMOS = {
+    "resumo_dvd": (("dvd_id", "total_alugueis"), """
+    SELECT dvd_id, COUNT(*) AS total_alugueis FROM aluguel_dvd GROUP BY dvd_id
+    """),
+    "resumo_titulo": (("titulo_id", "total_alugueis"), """
+    SELECT d.titulo_id, COUNT(*) AS total_alugueis
+    FROM aluguel_dvd ad
+    JOIN dvds d ON d.id = ad.dvd_id
+    WHERE d.titulo_id IS NOT NULL
+    GROUP BY d.titulo_id
+    """),
+    "resumo_cliente": (("cliente_id", "total_alugueis"), """
+    SELECT cliente_id, COUNT(*) AS total_alugueis FROM alugueis GROUP BY cliente_id
+    """),
+    # A receita entra no dia do aluguel; a multa, no dia da entrega
+    "resumo_diario": (("dia", "total_alugueis", "total_dvds", "receita", "multas"), """
+    SELECT dia, SUM(alugueis) AS total_alugueis, SUM(dvds) AS total_dvds,
+           SUM(receita) AS receita, SUM(multas) AS multas
+    FROM (
+        SELECT substr(a.data_aluguel, 1, 10) AS dia,
+               1 AS alugueis,
+               (SELECT COUNT(*) FROM aluguel_dvd ad WHERE ad.aluguel_id = a.id) AS dvds,
+               a.valor AS receita,
+               0 AS multas
+        FROM alugueis a
+        UNION ALL
+        SELECT substr(data_entrega, 1, 10), 0, 0, 0, multa
+        FROM alugueis
+        WHERE data_entrega IS NOT NULL AND multa <> 0
+    )
+    GROUP BY dia
+    """),
+}
+
+class DashboardDAO:
+    """Data Access Object para as consultas agregadas do dashboard."""
+    
+    @staticmethod
+    def estatisticas_gerais():
+        """Calcula todos os contadores gerais em uma única consulta.
+        
+        Cada contador é um COUNT resolvido pelos índices, sem carregar
+        nenhum registro na memória.
+        
+        Returns:
+            dict: Totais de clientes, DVDs, DVDs disponíveis, DVDs alugados,
+            aluguéis e aluguéis em atraso.
+        """
+        hoje = datetime.now().date().isoformat()
+        
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_ESTATISTICAS, (hoje,))
+            row = cursor.fetchone()
+        
+        return {
+            "total_clientes": row["total_clientes"],
+            "total_dvds": row["total_dvds"],
+            "dvds_disponiveis": row["dvds_disponiveis"],
+            "dvds_alugados": row["total_dvds"] - row["dvds_disponiveis"],
+            "total_alugueis": row["total_alugueis"],
+            "alugueis_atraso": row["alugueis_atraso"]
+        }
+    
+    @staticmethod
+    def filmes_mais_alugados(limite=10):
+        """Lista os filmes com mais aluguéis, somando todas as cópias de cada título.
+        
+        Lê a tabela resumo_titulo, mantida por gatilhos, percorrendo o índice
+        de total_alugueis apenas até o limite.
+        
+        Args:
+            limite (int, optional): Quantidade de filmes. Defaults to 10.
+            
+        Returns:
+            list: Tuplas (nome, total_alugueis).
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_FILMES_MAIS_ALUGADOS, (limite,))
+            rows = cursor.fetchall()
+        
+        return [(row["nome"], row["total_alugueis"]) for row in rows]
+    
+    @staticmethod
+    def clientes_mais_alugam(limite=10):
+        """Lista os clientes com mais aluguéis.
+        
+        Lê a tabela resumo_cliente, mantida por gatilhos.
+        
+        Args:
+            limite (int, optional): Quantidade de clientes. Defaults to 10.
+            
+        Returns:
+            list: Tuplas (nome, cpf, total_alugueis).
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_CLIENTES_MAIS_ALUGAM, (limite,))
+            rows = cursor.fetchall()
+        
+        return [(row["nome"], row["cpf"], row["total_alugueis"]) for row in rows]
+    
+    @staticmethod
+    def faturamento_agrupado(inicio, fim, agrupamento="mes"):
+        """Soma o resumo diário por dia, semana, mês ou ano.
+        
+        Lê apenas resumo_diario (uma linha por dia com movimento), percorrendo
+        a chave primária no intervalo pedido; dez anos de loja são no máximo
+        alguns milhares de linhas, qualquer que seja o volume de aluguéis.
+        
+        Args:
+            inicio (datetime): Início do período (inclusivo).
+            fim (datetime): Fim do período (exclusivo).
+            agrupamento (str, optional): "dia", "semana", "mes" ou "ano". Defaults to "mes".
+            
+        Returns:
+            list: Tuplas (periodo, total_alugueis, total_dvds_alugados, receita, multas) em
+            ordem crescente. O período é AAAA-MM-DD (dia, ou a segunda-feira da
+            semana), AAAA-MM (mês) ou AAAA (ano); períodos sem movimento não aparecem.
+            
+        Raises:
+            ValueError: Se o agrupamento não for reconhecido.
+        """
+        expressao = AGRUPAMENTOS_FATURAMENTO.get(agrupamento)
+        if expressao is None:
+            raise ValueError(f"Agrupamento inválido: {agrupamento}")
+        
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(
+                CONSULTA_FATURAMENTO.format(expressao=expressao), (inicio.date().isoformat(), fim.date().isoformat())
+            )
+            rows = cursor.fetchall()
+        
+        return [
+            (row["periodo"], row["total_alugueis"], row["total_dvds_alugados"], row["receita"], row["multas"])
+            for row in rows
+        ]
+    
+    @staticmethod
+    def reconstruir_resumo(conn, tabela):
+        """Apaga uma tabela de resumo e a grava de novo a partir dos aluguéis.
+        
+        Deve ser chamada dentro de uma transação.
+        
+        Args:
+            conn (sqlite3.Connection): Conexão (ou cursor) em uso.
+            tabela (str): Nome da tabela, uma das chaves de RESUMOS.
+            
+        Returns:
+            int: Quantidade de linhas gravadas.
+        """
+        colunas, consulta = RESUMOS[tabela]
+        
+        conn.execute(f"DELETE FROM {tabela}")
+        return conn.execute(f"INSERT INTO {tabela} ({', '.join(colunas)}) {consulta}").rowcount
+    
+    @staticmethod
+    def recalcular_resumos():
+        """Reconstrói as tabelas de resumo a partir dos aluguéis gravados.
+        
+        Os gatilhos mantêm os resumos a cada gravação; esta rotina só é
+        necessária se os dados forem alterados com os gatilhos desativados
+        (por exemplo, em uma importação direta no arquivo do banco).
+        
+        Returns:
+            dict: Quantidade de linhas gravadas em cada tabela de resumo.
+        """
+        with DatabaseConfig.transacao() as conn:
+            cursor = conn.cursor()
+            
+            linhas = {tabela: DashboardDAO.reconstruir_resumo(cursor, tabela) for tabela in RESUMOS}
+        
+        return linhas
\ No newline at end of file
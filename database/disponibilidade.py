@@ -0,0 +1,229 @@
+import threading
+
+from database.cache import registrar_cache
+from database.config import DatabaseConfig
+
+# Limite de parâmetros por cláusula IN, como em AluguelDAO
+TAMANHO_BLOCO_IN = 900
+
+
+class MapaDisponibilidade:
+    """Mapa de bits, em memória, dos DVDs disponíveis para aluguel.
+    
+    O bit de posição dvd_id fica ligado enquanto o DVD está disponível: um
+    milhão de DVDs ocupam 125 KB, e saber se uma cesta inteira está livre
+    não consulta o banco. O mapa é lido de dvds no primeiro uso e, a partir
+    daí, os DAOs o atualizam depois de cada gravação que muda disponivel.
+    
+    O mapa é só um atalho de leitura: quem impede que um DVD seja alugado
+    duas vezes continua sendo o UPDATE com disponivel = 1 do AluguelDAO.
+    Gravações de outros terminais (outros processos) não passam por este
+    mapa, então um DVD que o mapa dá como alugado é conferido no banco
+    (sincronizar) antes de um aluguel ser recusado, e verificar() compara
+    o mapa inteiro com a tabela.
+    
+    Todas as operações são protegidas por um lock, e as leituras do banco
+    também acontecem com ele: uma gravação que termina durante a carga só
+    é aplicada ao mapa depois dela, e nunca se perde.
+    """
+    
+    def __init__(self):
+        """Inicializa um mapa ainda não carregado."""
+        self._bits = bytearray()
+        self._carregado = False
+        self._lock = threading.Lock()
+        
+        registrar_cache(self)
+    
+    @staticmethod
+    def _ler_disponiveis(cursor):
+        """Lê os IDs de todos os DVDs disponíveis.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor da conexão em uso.
+            
+        Returns:
+            list: IDs dos DVDs com disponivel = 1.
+        """
+        cursor.execute("SELECT id FROM dvds WHERE disponivel = 1")
+        return [row[0] for row in cursor.fetchall()]
+    
+    def _ligar(self, dvd_id, disponivel):
+        """Liga ou desliga o bit de um DVD, aumentando o mapa se preciso (chamar com o lock).
+        
+        Args:
+            dvd_id (int): ID do DVD.
+            disponivel (bool): Novo valor do bit.
+        """
+        byte, bit = divmod(dvd_id, 8)
+        if byte >= len(self._bits):
+            if not disponivel:
+                return
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        
+        if disponivel:
+            self._bits[byte] |= 1 << bit
+        else:
+            self._bits[byte] &= ~(1 << bit) & 0xFF
+    
+    def _livre(self, dvd_id):
+        """Indica se o bit de um DVD está ligado (chamar com o lock).
+        
+        Args:
+            dvd_id (int): ID do DVD.
+            
+        Returns:
+            bool: True se o DVD consta como disponível.
+        """
+        byte, bit = divmod(dvd_id, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] >> bit & 1)
+    
+    def carregar(self):
+        """Lê de dvds a disponibilidade de todos os DVDs, substituindo o mapa.
+        
+        Returns:
+            int: Quantidade de DVDs disponíveis.
+        """
+        with self._lock:
+            with DatabaseConfig.connection() as conn:
+                disponiveis = self._ler_disponiveis(conn.cursor())
+            
+            self._bits = bytearray(max(disponiveis, default=-1) // 8 + 1)
+            for dvd_id in disponiveis:
+                self._ligar(dvd_id, True)
+            self._carregado = True
+        
+        return len(disponiveis)
+    
+    def _garantir_carregado(self):
+        """Carrega o mapa se ainda não foi carregado."""
+        if not self._carregado:
+            self.carregar()
+    
+    def limpar(self):
+        """Descarta o mapa; o próximo uso o lê de novo do banco."""
+        with self._lock:
+            self._bits = bytearray()
+            self._carregado = False
+    
+    def marcar(self, dvds_ids, disponivel):
+        """Registra no mapa a nova disponibilidade de DVDs já gravada no banco.
+        
+        Deve ser chamada depois do commit da gravação, como CacheLRU.invalidar.
+        Se o mapa ainda não foi carregado, não há o que atualizar.
+        
+        Args:
+            dvds_ids (iterable): IDs dos DVDs.
+            disponivel (bool): Nova disponibilidade.
+        """
+        with self._lock:
+            if not self._carregado:
+                return
+            for dvd_id in dvds_ids:
+                self._ligar(dvd_id, disponivel)
+    
+    def sincronizar(self, dvds_ids):
+        """Relê do banco a disponibilidade de alguns DVDs.
+        
+        Usada quando o mapa e o banco discordam (por exemplo, um DVD
+        devolvido em outro terminal). DVDs que não existem mais ficam como
+        indisponíveis.
+        
+        Args:
+            dvds_ids (list): IDs dos DVDs.
+        """
+        dvds_ids = list(dvds_ids)
+        
+        with self._lock:
+            if not self._carregado:
+                return
+            
+            disponiveis = set()
+            with DatabaseConfig.connection() as conn:
+                cursor = conn.cursor()
+                for inicio in range(0, len(dvds_ids), TAMANHO_BLOCO_IN):
+                    bloco = dvds_ids[inicio:inicio + TAMANHO_BLOCO_IN]
+                    marcadores = ", ".join("?" * len(bloco))
+                    cursor.execute(f"SELECT id FROM dvds WHERE disponivel = 1 AND id IN ({marcadores})", bloco)
+                    disponiveis.update(row[0] for row in cursor.fetchall())
+            
+            for dvd_id in dvds_ids:
+                self._ligar(dvd_id, dvd_id in disponiveis)
+    
+    def disponivel(self, dvd_id):
+        """Indica se um DVD consta como disponível no mapa.
+        
+        Args:
+            dvd_id (int): ID do DVD.
+            
+        Returns:
+            bool: True se o DVD está disponível.
+        """
+        self._garantir_carregado()
+        with self._lock:
+            return self._livre(dvd_id)
+    
+    def indisponiveis(self, dvds_ids):
+        """Lista os DVDs de uma cesta que o mapa dá como alugados ou inexistentes.
+        
+        Args:
+            dvds_ids (iterable): IDs dos DVDs da cesta.
+            
+        Returns:
+            list: IDs que não estão disponíveis, na ordem recebida.
+        """
+        self._garantir_carregado()
+        with self._lock:
+            return [dvd_id for dvd_id in dvds_ids if not self._livre(dvd_id)]
+    
+    def todos_disponiveis(self, dvds_ids):
+        """Indica se todos os DVDs de uma cesta estão disponíveis.
+        
+        Quando a cesta está livre no mapa, o banco não é consultado. Os DVDs
+        que o mapa dá como alugados são conferidos no banco antes da
+        resposta, já que podem ter sido devolvidos em outro terminal.
+        
+        Args:
+            dvds_ids (iterable): IDs dos DVDs da cesta.
+            
+        Returns:
+            bool: True se todos os DVDs estão disponíveis.
+        """
+        faltando = self.indisponiveis(dvds_ids)
+        if faltando:
+            self.sincronizar(faltando)
+            faltando = self.indisponiveis(faltando)
+        return not faltando
+    
+    def total_disponiveis(self):
+        """Conta os DVDs disponíveis no mapa.
+        
+        Returns:
+            int: Quantidade de bits ligados.
+        """
+        self._garantir_carregado()
+        with self._lock:
+            return bin(int.from_bytes(self._bits, "little")).count("1")
+    
+    def verificar(self):
+        """Compara o mapa com a tabela dvds.
+        
+        A tabela é lida com o lock do mapa, então gravações deste processo
+        não interferem; gravações de outros terminais aparecem como
+        divergências até serem sincronizadas.
+        
+        Returns:
+            tuple: (IDs disponíveis só no mapa, IDs disponíveis só no banco), em ordem crescente.
+        """
+        self._garantir_carregado()
+        with self._lock:
+            with DatabaseConfig.connection() as conn:
+                no_banco = set(self._ler_disponiveis(conn.cursor()))
+            
+            no_mapa = {
+                byte * 8 + bit
+                for byte, valor in enumerate(self._bits) if valor
+                for bit in range(8) if valor >> bit & 1
+            }
+        
+        return sorted(no_mapa - no_banco), sorted(no_banco - no_mapa)
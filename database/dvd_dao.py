@@ -1,9 +1,53 @@
+import re
+
+from database.cache import CacheLRU
 from database.config import DatabaseConfig
+from database.disponibilidade import MapaDisponibilidade
+from database.normalizacao import termos, trigramas
 from models.dvd import DVD
 
+# Pesos do bm25 para as colunas de dvds_fts: o título vale mais que a sinopse
+PESO_NOME = 10.0
+PESO_SINOPSE = 1.0
+
+# Similaridade mínima (trigramas em comum / trigramas distintos dos dois
+# textos) para a busca aproximada, entre títulos e entre palavras. O pg_trgm
+# usa 0.3, mas em palavras curtas uma única troca de letras já fica abaixo
+# disso ("Matirx" x "Matrix": 0.27)
+SIMILARIDADE_MINIMA = 0.25
+
+# Palavras do acervo aproveitadas para cada palavra digitada na busca aproximada
+PALAVRAS_POR_TERMO = 5
+# DVDs examinados, no máximo, para cada palavra aproveitada
+DVDS_POR_PALAVRA = 1000
+
+# Consultas do DAO, também conferidas por scripts/verificar_planos.py
+CONSULTA_POR_ID = "SELECT * FROM dvds WHERE id = ?"
+CONSULTA_TODOS = "SELECT * FROM dvds ORDER BY nome"
+CONSULTA_DISPONIVEIS = "SELECT * FROM dvds WHERE disponivel = 1 ORDER BY nome"
+# DVDs gravados sem passar pelo DAO; usam o índice parcial idx_dvds_trigramas_pendentes
+CONSULTA_HA_PENDENTES = "SELECT 1 FROM dvds WHERE total_trigramas IS NULL LIMIT 1"
+CONSULTA_PENDENTES = "SELECT id, nome FROM dvds WHERE total_trigramas IS NULL"
+CONSULTA_PALAVRAS_SEM_TRIGRAMAS = "SELECT palavra FROM palavras WHERE total_trigramas IS NULL"
+# DVDs com uma palavra do acervo e um total de trigramas dentro da faixa
+CONSULTA_DVDS_DA_PALAVRA = """
+SELECT d.id, d.nome
+FROM dvds_palavras p
+JOIN dvds d ON d.id = p.dvd_id
+WHERE p.palavra = ? AND d.total_trigramas BETWEEN ? AND ?
+LIMIT ?
+"""
+
 class DVDDAO:
     """Data Access Object para a entidade DVD."""
     
+    # DVDs por ID; invalidado pelas gravações deste DAO e do AluguelDAO
+    cache = CacheLRU(DatabaseConfig.CACHE_CAPACIDADE, DatabaseConfig.CACHE_VALIDADE)
+    
+    # Disponibilidade de todos os DVDs em memória; atualizada pelas mesmas
+    # gravações que invalidam o cache
+    disponibilidade = MapaDisponibilidade()
+    
     @staticmethod
     def inserir(dvd):
         """Insere um novo DVD no banco de dados.
@@ -14,19 +58,18 @@ class DVDDAO:
         Returns:
             int: ID do DVD inserido.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel)
-        VALUES (?, ?, ?, ?, ?)
-        """, (dvd.nome, dvd.sinopse, dvd.ano_lancamento, dvd.ano_aquisicao, 1 if dvd.disponivel else 0))
-        
-        dvd.id = cursor.lastrowid
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel)
+            VALUES (?, ?, ?, ?, ?)
+            """, (dvd.nome, dvd.sinopse, dvd.ano_lancamento, dvd.ano_aquisicao, 1 if dvd.disponivel else 0))
+            
+            dvd.id = cursor.lastrowid
+            DVDDAO._gravar_palavras(conn, [(dvd.id, dvd.nome)])
         
+        DVDDAO.disponibilidade.marcar([dvd.id], dvd.disponivel)
         return dvd.id
     
     @staticmethod
@@ -39,21 +82,80 @@ class DVDDAO:
         Returns:
             bool: True se a atualização foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            UPDATE dvds
+            SET nome = ?, sinopse = ?, ano_lancamento = ?, ano_aquisicao = ?, disponivel = ?
+            WHERE id = ?
+            """, (dvd.nome, dvd.sinopse, dvd.ano_lancamento, dvd.ano_aquisicao, 1 if dvd.disponivel else 0, dvd.id))
+            
+            success = cursor.rowcount > 0
+            if success:
+                DVDDAO._gravar_palavras(conn, [(dvd.id, dvd.nome)])
         
-        cursor.execute("""
-        UPDATE dvds
-        SET nome = ?, sinopse = ?, ano_lancamento = ?, ano_aquisicao = ?, disponivel = ?
-        WHERE id = ?
-        """, (dvd.nome, dvd.sinopse, dvd.ano_lancamento, dvd.ano_aquisicao, 1 if dvd.disponivel else 0, dvd.id))
+        DVDDAO.cache.invalidar(dvd.id)
+        if success:
+            DVDDAO.disponibilidade.marcar([dvd.id], dvd.disponivel)
+        return success
+    
+    @staticmethod
+    def _gravar_palavras(conn, dvds):
+        """Regrava as palavras e o total de trigramas dos títulos e os trigramas das palavras novas.
         
-        success = cursor.rowcount > 0
+        Deve rodar na mesma transação que gravou os títulos. O vocabulário em
+        palavras é ajustado pelos gatilhos de dvds_palavras; aqui só são
+        gravados os trigramas das palavras que ainda não os têm.
         
-        conn.commit()
-        conn.close()
+        Args:
+            conn (sqlite3.Connection): Conexão com a transação aberta.
+            dvds (list): Tuplas (dvd_id, nome).
+        """
+        conn.executemany("DELETE FROM dvds_palavras WHERE dvd_id = ?", ((dvd_id,) for dvd_id, _ in dvds))
+        conn.executemany(
+            "INSERT INTO dvds_palavras (dvd_id, palavra) VALUES (?, ?)",
+            ((dvd_id, palavra) for dvd_id, nome in dvds for palavra in set(termos(nome or "")))
+        )
+        conn.executemany(
+            "UPDATE dvds SET total_trigramas = ? WHERE id = ?",
+            ((len(trigramas(nome or "")), dvd_id) for dvd_id, nome in dvds)
+        )
+        
+        novas = [
+            (row[0], trigramas(row[0]))
+            for row in conn.execute(CONSULTA_PALAVRAS_SEM_TRIGRAMAS)
+        ]
+        conn.executemany(
+            "INSERT OR IGNORE INTO palavras_trigramas (palavra, trigrama) VALUES (?, ?)",
+            ((palavra, trigrama) for palavra, conjunto in novas for trigrama in conjunto)
+        )
+        conn.executemany(
+            "UPDATE palavras SET total_trigramas = ? WHERE palavra = ?",
+            ((len(conjunto), palavra) for palavra, conjunto in novas)
+        )
+    
+    @staticmethod
+    def indexar_palavras_pendentes():
+        """Indexa os DVDs gravados sem passar pelo DAO (total_trigramas nulo).
         
-        return success
+        A consulta por pendentes usa o índice parcial idx_dvds_trigramas_pendentes,
+        então custa quase nada quando não há nenhum.
+        
+        Returns:
+            int: Quantidade de DVDs indexados.
+        """
+        with DatabaseConfig.connection() as conn:
+            pendente = conn.execute(CONSULTA_HA_PENDENTES).fetchone()
+        
+        if pendente is None:
+            return 0
+        
+        with DatabaseConfig.transacao() as conn:
+            dvds = [tuple(row) for row in conn.execute(CONSULTA_PENDENTES)]
+            DVDDAO._gravar_palavras(conn, dvds)
+        
+        return len(dvds)
     
     @staticmethod
     def excluir(dvd_id):
@@ -65,21 +167,20 @@ class DVDDAO:
         Returns:
             bool: True se a exclusão foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM dvds WHERE id = ?", (dvd_id,))
-        
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM dvds WHERE id = ?", (dvd_id,))
+            
+            success = cursor.rowcount > 0
         
+        DVDDAO.cache.invalidar(dvd_id)
+        DVDDAO.disponibilidade.marcar([dvd_id], False)
         return success
     
     @staticmethod
     def buscar_por_id(dvd_id):
-        """Busca um DVD pelo ID.
+        """Busca um DVD pelo ID, passando antes pelo cache.
         
         Args:
             dvd_id (int): ID do DVD a ser buscado.
@@ -87,16 +188,20 @@ class DVDDAO:
         Returns:
             DVD: Objeto DVD encontrado ou None se não encontrado.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        dvd = DVDDAO.cache.obter(dvd_id)
+        if dvd is not None:
+            return dvd
         
-        cursor.execute("SELECT * FROM dvds WHERE id = ?", (dvd_id,))
-        row = cursor.fetchone()
+        versao = DVDDAO.cache.versao()
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_POR_ID, (dvd_id,))
+            row = cursor.fetchone()
         
         if row:
-            return DVD(
+            dvd = DVD(
                 id=row["id"],
                 nome=row["nome"],
                 sinopse=row["sinopse"],
@@ -104,6 +209,8 @@ class DVDDAO:
                 ano_aquisicao=row["ano_aquisicao"],
                 disponivel=bool(row["disponivel"])
             )
+            DVDDAO.cache.guardar(dvd_id, dvd, versao)
+            return dvd
         
         return None
     
@@ -114,13 +221,78 @@ class DVDDAO:
         Returns:
             list: Lista de objetos DVD.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_TODOS)
+            rows = cursor.fetchall()
         
-        cursor.execute("SELECT * FROM dvds ORDER BY nome")
-        rows = cursor.fetchall()
+        dvds = []
+        for row in rows:
+            dvd = DVD(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                ano_aquisicao=row["ano_aquisicao"],
+                disponivel=bool(row["disponivel"])
+            )
+            dvds.append(dvd)
+        
+        return dvds
+    
+    @staticmethod
+    def iter_todos(tamanho_lote=1000):
+        """Percorre todos os DVDs sem montar a lista inteira na memória.
+        
+        As linhas são lidas com fetchmany; a conexão fica emprestada do pool
+        só enquanto a iteração durar (veja AluguelDAO.iter_todos).
+        
+        Args:
+            tamanho_lote (int, optional): Linhas lidas do banco por vez. Defaults to 1000.
+            
+        Yields:
+            DVD: Um DVD por vez, na ordem de listar_todos.
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_TODOS)
+            for lote in iter(lambda: cursor.fetchmany(tamanho_lote), []):
+                for row in lote:
+                    yield DVD(
+                        id=row["id"],
+                        nome=row["nome"],
+                        sinopse=row["sinopse"],
+                        ano_lancamento=row["ano_lancamento"],
+                        ano_aquisicao=row["ano_aquisicao"],
+                        disponivel=bool(row["disponivel"])
+                    )
+    
+    @staticmethod
+    def listar_pagina(apos=None, limite=200):
+        """Lista uma página de DVDs, na mesma ordem de listar_todos.
+        
+        A paginação é por chave: em vez de OFFSET (que percorre e descarta
+        todas as linhas anteriores), a consulta continua pelo índice de nome
+        a partir do último DVD da página anterior, então qualquer página
+        custa o mesmo que a primeira.
+        
+        Args:
+            apos (tuple, optional): (nome, id) do último DVD da página anterior;
+                None para a primeira página. Defaults to None.
+            limite (int, optional): Número máximo de DVDs. Defaults to 200.
+            
+        Returns:
+            list: Lista de objetos DVD; menos de limite indica a última página.
+        """
+        consulta, parametros = DVDDAO._consulta_pagina(apos, limite)
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(consulta, parametros)
+            rows = cursor.fetchall()
         
         dvds = []
         for row in rows:
@@ -136,6 +308,25 @@ class DVDDAO:
         
         return dvds
     
+    @staticmethod
+    def _consulta_pagina(apos, limite):
+        """Monta a consulta de uma página de listar_pagina.
+        
+        Args:
+            apos (tuple): (nome, id) do último DVD da página anterior, ou None.
+            limite (int): Número máximo de DVDs.
+            
+        Returns:
+            tuple: (consulta SQL, parâmetros).
+        """
+        filtro = ""
+        parametros = ()
+        if apos is not None:
+            filtro = "WHERE (nome, id) > (?, ?)"
+            parametros = tuple(apos)
+        
+        return f"SELECT * FROM dvds {filtro} ORDER BY nome, id LIMIT ?", parametros + (limite,)
+    
     @staticmethod
     def buscar_por_nome(nome):
         """Busca DVDs pelo nome (busca parcial).
@@ -146,13 +337,78 @@ class DVDDAO:
         Returns:
             list: Lista de objetos DVD que correspondem à busca.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT * FROM dvds WHERE nome LIKE ? ORDER BY nome", (f"%{nome}%",))
+            rows = cursor.fetchall()
+        
+        dvds = []
+        for row in rows:
+            dvd = DVD(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                ano_aquisicao=row["ano_aquisicao"],
+                disponivel=bool(row["disponivel"])
+            )
+            dvds.append(dvd)
+        
+        return dvds
+    
+    @staticmethod
+    def _expressao_busca(texto):
+        """Converte o texto digitado em uma expressão MATCH do FTS5.
+        
+        Cada palavra vira um termo de prefixo entre aspas, o que neutraliza
+        a sintaxe do FTS5 (aspas, operadores, parênteses) no texto do usuário.
+        
+        Args:
+            texto (str): Texto digitado na busca.
+            
+        Returns:
+            str: Expressão MATCH, ou string vazia se não houver palavras.
+        """
+        palavras = re.findall(r"\w+", texto)
+        return " ".join(f'"{palavra}"*' for palavra in palavras)
+    
+    @staticmethod
+    def pesquisar(texto, limite=100):
+        """Busca DVDs por palavras do título ou da sinopse, ordenados por relevância.
+        
+        Todas as palavras precisam aparecer (como palavra inteira ou início de
+        palavra), sem diferenciar acentos nem maiúsculas.
         
-        cursor.execute("SELECT * FROM dvds WHERE nome LIKE ? ORDER BY nome", (f"%{nome}%",))
-        rows = cursor.fetchall()
+        Args:
+            texto (str): Texto da busca.
+            limite (int, optional): Número máximo de resultados. Defaults to 100.
+            
+        Returns:
+            list: Lista de objetos DVD, do mais relevante para o menos relevante.
+        """
+        expressao = DVDDAO._expressao_busca(texto)
+        if not expressao:
+            return []
         
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            # O ranking e o LIMIT ficam dentro do FTS5; só os melhores
+            # resultados são buscados em dvds
+            cursor.execute("""
+            SELECT d.*
+            FROM (
+                SELECT rowid, bm25(dvds_fts, ?, ?) AS relevancia
+                FROM dvds_fts
+                WHERE dvds_fts MATCH ?
+                ORDER BY relevancia
+                LIMIT ?
+            ) AS busca
+            JOIN dvds d ON d.id = busca.rowid
+            ORDER BY busca.relevancia
+            """, (PESO_NOME, PESO_SINOPSE, expressao, limite))
+            rows = cursor.fetchall()
         
         dvds = []
         for row in rows:
@@ -168,6 +424,131 @@ class DVDDAO:
         
         return dvds
     
+    @staticmethod
+    def _consulta_palavras_parecidas(palavra, similaridade_minima):
+        """Monta a consulta de _palavras_parecidas.
+        
+        Args:
+            palavra (str): Palavra normalizada.
+            similaridade_minima (float): Similaridade mínima entre as palavras.
+            
+        Returns:
+            tuple: (consulta SQL, parâmetros).
+        """
+        consulta = trigramas(palavra)
+        total = len(consulta)
+        
+        # Pelo tamanho, uma palavra com menos de similaridade_minima * total ou
+        # mais de total / similaridade_minima trigramas já fica de fora
+        return f"""
+        SELECT t.palavra, COUNT(*) * 1.0 / (? + p.total_trigramas - COUNT(*)) AS similaridade
+        FROM palavras_trigramas t
+        JOIN palavras p ON p.palavra = t.palavra
+        WHERE t.trigrama IN ({", ".join("?" * total)})
+          AND p.total_trigramas BETWEEN ? AND ?
+        GROUP BY t.palavra
+        HAVING similaridade >= ?
+        ORDER BY similaridade DESC, p.total_dvds DESC
+        LIMIT ?
+        """, [total] + list(consulta) + [
+            similaridade_minima * total, total / similaridade_minima, similaridade_minima, PALAVRAS_POR_TERMO
+        ]
+    
+    @staticmethod
+    def _palavras_parecidas(cursor, palavra, similaridade_minima):
+        """Lista as palavras do acervo parecidas com uma palavra digitada.
+        
+        Args:
+            cursor (sqlite3.Cursor): Cursor para a consulta.
+            palavra (str): Palavra normalizada.
+            similaridade_minima (float): Similaridade mínima entre as palavras.
+            
+        Returns:
+            list: Até PALAVRAS_POR_TERMO palavras, da mais parecida para a menos parecida.
+        """
+        consulta, parametros = DVDDAO._consulta_palavras_parecidas(palavra, similaridade_minima)
+        cursor.execute(consulta, parametros)
+        return [row["palavra"] for row in cursor.fetchall()]
+    
+    @staticmethod
+    def buscar_aproximado(texto, limite=20, similaridade_minima=SIMILARIDADE_MINIMA):
+        """Busca DVDs por título parecido com o texto, tolerando erros de digitação.
+        
+        A similaridade é a dos trigramas, como no pg_trgm: trigramas em comum
+        divididos pelos trigramas distintos dos dois títulos juntos, de 0 a 1.
+        
+        Comparar o texto com todos os títulos não é viável em acervos grandes,
+        então a busca passa pelo vocabulário: cada palavra digitada é trocada
+        pelas palavras parecidas do acervo (pelo índice de trigramas das
+        palavras), e só os títulos que têm alguma delas são comparados. Um
+        título em que nenhuma palavra chega perto de alguma digitada não é
+        encontrado, mesmo que o título inteiro alcance a similaridade mínima.
+        
+        Args:
+            texto (str): Título digitado (por exemplo, "Pulp Fictin").
+            limite (int, optional): Número máximo de resultados. Defaults to 20.
+            similaridade_minima (float, optional): Similaridade mínima, maior que 0
+                e até 1. Defaults to SIMILARIDADE_MINIMA.
+                
+        Returns:
+            list: Tuplas (DVD, similaridade), da mais parecida para a menos parecida.
+        """
+        consulta = trigramas(texto)
+        if not consulta:
+            return []
+        
+        DVDDAO.indexar_palavras_pendentes()
+        
+        candidatos = {}
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            parecidas = set()
+            for palavra in set(termos(texto)):
+                parecidas.update(DVDDAO._palavras_parecidas(cursor, palavra, similaridade_minima))
+            
+            for palavra in parecidas:
+                # Pelo tamanho, um título com menos de similaridade_minima * n ou
+                # mais de n / similaridade_minima trigramas (n: os do texto) já fica de fora
+                cursor.execute(CONSULTA_DVDS_DA_PALAVRA, (
+                    palavra, similaridade_minima * len(consulta), len(consulta) / similaridade_minima,
+                    DVDS_POR_PALAVRA
+                ))
+                candidatos.update(cursor.fetchall())
+            
+            resultados = []
+            for dvd_id, nome in candidatos.items():
+                titulo = trigramas(nome or "")
+                em_comum = len(consulta & titulo)
+                similaridade = em_comum / (len(consulta) + len(titulo) - em_comum)
+                if similaridade >= similaridade_minima:
+                    resultados.append((-similaridade, nome, dvd_id))
+            
+            # Só os mais parecidos são lidos por inteiro
+            melhores = sorted(resultados)[:limite]
+            if not melhores:
+                return []
+            
+            marcadores = ", ".join("?" * len(melhores))
+            cursor.execute(f"SELECT * FROM dvds WHERE id IN ({marcadores})", [dvd_id for _, _, dvd_id in melhores])
+            rows = {row["id"]: row for row in cursor.fetchall()}
+        
+        dvds = []
+        for negativo, _, dvd_id in melhores:
+            row = rows[dvd_id]
+            similaridade = -negativo
+            dvd = DVD(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                ano_aquisicao=row["ano_aquisicao"],
+                disponivel=bool(row["disponivel"])
+            )
+            dvds.append((dvd, similaridade))
+        
+        return dvds
+    
     @staticmethod
     def listar_disponiveis():
         """Lista todos os DVDs disponíveis para aluguel.
@@ -175,13 +556,11 @@ class DVDDAO:
         Returns:
             list: Lista de objetos DVD disponíveis.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM dvds WHERE disponivel = 1 ORDER BY nome")
-        rows = cursor.fetchall()
-        
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_DISPONIVEIS)
+            rows = cursor.fetchall()
         
         dvds = []
         for row in rows:
@@ -208,18 +587,18 @@ class DVDDAO:
         Returns:
             bool: True se a atualização foi bem-sucedida, False caso contrário.
         """
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        UPDATE dvds
-        SET disponivel = ?
-        WHERE id = ?
-        """, (1 if disponivel else 0, dvd_id))
-        
-        success = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+            UPDATE dvds
+            SET disponivel = ?
+            WHERE id = ?
+            """, (1 if disponivel else 0, dvd_id))
+            
+            success = cursor.rowcount > 0
         
+        DVDDAO.cache.invalidar(dvd_id)
+        if success:
+            DVDDAO.disponibilidade.marcar([dvd_id], disponivel)
         return success
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""Migrações de esquema do banco de dados.
+
+Cada migração é um módulo deste pacote com:
+
+- VERSAO (int): número sequencial da migração;
+- DESCRICAO (str): texto curto registrado em schema_version;
+- aplicar(conn): função que executa as alterações;
+- TRANSACIONAL (bool, opcional): se False, a migração controla os próprios
+  commits (útil para processar tabelas grandes em lotes). Padrão: True.
+
+A versão aplicada fica em PRAGMA user_version, de modo que a inicialização
+da aplicação faz apenas uma leitura quando o esquema já está atualizado.
+Migrações não devem usar executescript(), que faz commit implícito.
+"""
+import time
+
+from database.migracoes import (
+    m0001_esquema_inicial,
+    m0002_cpf_clientes,
+    m0003_indices,
+    m0004_busca_dvds,
+    m0005_resumos_dashboard,
+    m0006_receita_diaria,
+    m0007_busca_incremental,
+    m0008_nomes_normalizados,
+    m0009_trigramas_dvds,
+    m0010_titulos,
+    m0011_resumo_titulos,
+)
+
+# Migrações em ordem de aplicação
+MIGRACOES = [
+    m0001_esquema_inicial,
+    m0002_cpf_clientes,
+    m0003_indices,
+    m0004_busca_dvds,
+    m0005_resumos_dashboard,
+    m0006_receita_diaria,
+    m0007_busca_incremental,
+    m0008_nomes_normalizados,
+    m0009_trigramas_dvds,
+    m0010_titulos,
+    m0011_resumo_titulos,
+]
+
+VERSAO_MAIS_RECENTE = MIGRACOES[-1].VERSAO
+
+
+def versao_atual(conn):
+    """Obtém a versão de esquema do banco.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        
+    Returns:
+        int: Valor de PRAGMA user_version.
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migracoes_pendentes(conn):
+    """Lista as migrações ainda não aplicadas ao banco.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        
+    Returns:
+        list: Módulos de migração pendentes, em ordem de aplicação.
+    """
+    versao = versao_atual(conn)
+    return [migracao for migracao in MIGRACOES if migracao.VERSAO > versao]
+
+
+def adicionar_coluna(conn, tabela, coluna, definicao):
+    """Acrescenta uma coluna à tabela, se ela ainda não existir.
+    
+    ALTER TABLE ... ADD COLUMN falha se a coluna já existe. Migrações não
+    transacionais rodam fora do bloqueio de escrita e podem ser executadas
+    ao mesmo tempo por dois terminais, então precisam poder repetir o passo.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        tabela (str): Nome da tabela.
+        coluna (str): Nome da coluna.
+        definicao (str): Tipo e restrições da coluna, por exemplo "INTEGER".
+        
+    Returns:
+        bool: True se a coluna foi criada, False se já existia.
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM pragma_table_info(?) WHERE name = ?", (tabela, coluna)
+    ).fetchone()
+    if existe:
+        return False
+    
+    conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+    return True
+
+
+def _registrar(conn, migracao):
+    """Registra a migração em schema_version e atualiza PRAGMA user_version.
+    
+    Deve ser chamada dentro da transação da migração (ou de uma nova, para
+    migrações não transacionais).
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        migracao (module): Módulo da migração aplicada.
+    """
+    conn.execute(
+        "INSERT OR REPLACE INTO schema_version (versao, descricao) VALUES (?, ?)",
+        (migracao.VERSAO, migracao.DESCRICAO)
+    )
+    # PRAGMA não aceita parâmetros; VERSAO é sempre um inteiro do próprio módulo
+    conn.execute(f"PRAGMA user_version = {int(migracao.VERSAO)}")
+
+
+def migrar(conn, dry_run=False):
+    """Aplica as migrações pendentes.
+    
+    Migrações transacionais rodam inteiras dentro de um BEGIN IMMEDIATE,
+    junto com a atualização da versão: ou tudo é aplicado, ou nada. Com o
+    bloqueio já obtido, a versão é conferida de novo, então dois terminais
+    iniciados ao mesmo tempo não aplicam a mesma migração duas vezes.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        dry_run (bool, optional): Se True, apenas informa o que seria aplicado. Defaults to False.
+        
+    Returns:
+        list: Tuplas (versao, descricao) das migrações aplicadas (ou pendentes, em dry_run).
+    """
+    # Caminho rápido: esquema já atualizado
+    if versao_atual(conn) >= VERSAO_MAIS_RECENTE:
+        return []
+    
+    pendentes = migracoes_pendentes(conn)
+    if dry_run:
+        return [(migracao.VERSAO, migracao.DESCRICAO) for migracao in pendentes]
+    
+    aplicadas = []
+    for migracao in pendentes:
+        # A versão é relida a cada migração: outro terminal iniciado ao mesmo
+        # tempo pode já tê-la aplicado depois da leitura acima
+        if getattr(migracao, "TRANSACIONAL", True):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if versao_atual(conn) >= migracao.VERSAO:
+                    conn.rollback()
+                    continue
+                migracao.aplicar(conn)
+                _registrar(conn, migracao)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        else:
+            # A migração faz seus próprios commits, fora do bloqueio de
+            # escrita, e por isso precisa poder ser repetida; só o registro
+            # é atômico
+            if versao_atual(conn) >= migracao.VERSAO:
+                continue
+            migracao.aplicar(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Não volta a versão se o outro terminal já foi além
+                if versao_atual(conn) < migracao.VERSAO:
+                    _registrar(conn, migracao)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        
+        aplicadas.append((migracao.VERSAO, migracao.DESCRICAO))
+    
+    return aplicadas
+
+
+def executar_em_lotes(conn, consulta_ids, processar_lote, tamanho_lote=1000, pausa=0.0):
+    """Processa uma tabela grande em lotes, um commit por lote.
+    
+    Os IDs são percorridos em ordem crescente (paginação por chave), então o
+    processamento pode ser interrompido e retomado, e cada transação segura o
+    bloqueio de escrita apenas pelo tempo de um lote.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        consulta_ids (str): SELECT que recebe (ultimo_id, limite) e retorna os próximos IDs,
+            por exemplo "SELECT id FROM t WHERE id > ? AND coluna IS NULL ORDER BY id LIMIT ?".
+        processar_lote (callable): Função (conn, ids) que processa um lote.
+        tamanho_lote (int, optional): Quantidade de IDs por lote. Defaults to 1000.
+        pausa (float, optional): Segundos de espera entre lotes, para dar vez a outros escritores. Defaults to 0.0.
+        
+    Returns:
+        int: Total de IDs processados.
+    """
+    total = 0
+    ultimo_id = 0
+    
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = [row[0] for row in conn.execute(consulta_ids, (ultimo_id, tamanho_lote))]
+            if ids:
+                processar_lote(conn, ids)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        
+        if not ids:
+            return total
+        
+        total += len(ids)
+        ultimo_id = ids[-1]
+        
+        if pausa:
+            time.sleep(pausa)
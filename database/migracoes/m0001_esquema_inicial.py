@@ -0,0 +1,66 @@
+"""Tabelas principais da locadora e controle de versões de esquema."""
+
+VERSAO = 1
+DESCRICAO = "Esquema inicial"
+
+
+def aplicar(conn):
+    """Cria as tabelas principais (idempotente para bancos já existentes).
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # Tabela de Clientes
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS clientes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        cpf TEXT UNIQUE NOT NULL,
+        nome TEXT NOT NULL,
+        telefone TEXT,
+        endereco TEXT
+    )
+    """)
+    
+    # Tabela de DVDs
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS dvds (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        sinopse TEXT,
+        ano_lancamento INTEGER,
+        ano_aquisicao INTEGER,
+        disponivel INTEGER DEFAULT 1
+    )
+    """)
+    
+    # Tabela de Aluguéis
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS alugueis (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data_aluguel TEXT NOT NULL,
+        cliente_id INTEGER NOT NULL,
+        data_devolucao TEXT,
+        devolvido INTEGER DEFAULT 0,
+        FOREIGN KEY (cliente_id) REFERENCES clientes (id)
+    )
+    """)
+    
+    # Tabela de relação entre Aluguéis e DVDs
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS aluguel_dvd (
+        aluguel_id INTEGER,
+        dvd_id INTEGER,
+        PRIMARY KEY (aluguel_id, dvd_id),
+        FOREIGN KEY (aluguel_id) REFERENCES alugueis (id),
+        FOREIGN KEY (dvd_id) REFERENCES dvds (id)
+    )
+    """)
+    
+    # Histórico das migrações aplicadas
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        versao INTEGER PRIMARY KEY,
+        descricao TEXT NOT NULL,
+        aplicada_em TEXT NOT NULL DEFAULT (datetime('now', 'localtime'))
+    )
+    """)
@@ -0,0 +1,19 @@
+"""Coluna CPF em bancos criados antes da sua introdução."""
+
+VERSAO = 2
+DESCRICAO = "CPF dos clientes"
+
+
+def aplicar(conn):
+    """Adiciona a coluna cpf (com índice único) se ela ainda não existir.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    colunas = [row[1] for row in conn.execute("PRAGMA table_info(clientes)")]
+    if "cpf" in colunas:
+        return
+    
+    # SQLite não aceita ADD COLUMN com UNIQUE; a unicidade vem do índice
+    conn.execute("ALTER TABLE clientes ADD COLUMN cpf TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_clientes_cpf ON clientes (cpf)")
@@ -0,0 +1,45 @@
+"""Índices secundários usados pelos DAOs e pelo dashboard."""
+
+VERSAO = 3
+DESCRICAO = "Índices secundários"
+
+# Cada índice é criado em sua própria transação, para não segurar o
+# bloqueio de escrita durante a criação de todos eles em tabelas grandes
+TRANSACIONAL = False
+
+# Índices que cobrem os WHERE/ORDER BY/JOIN usados pelos DAOs e pelo dashboard
+INDICES = (
+    # Ranking de filmes e busca de aluguéis por DVD
+    ("idx_aluguel_dvd_dvd", "aluguel_dvd (dvd_id)"),
+    # Aluguéis por cliente, já na ordem de data
+    ("idx_alugueis_cliente_data", "alugueis (cliente_id, data_aluguel)"),
+    # Listagem por data e faturamento por período
+    ("idx_alugueis_data_aluguel", "alugueis (data_aluguel)"),
+    # Aluguéis em atraso
+    ("idx_alugueis_devolvido_devolucao", "alugueis (devolvido, data_devolucao)"),
+    # Listagem de DVDs por nome
+    ("idx_dvds_nome", "dvds (nome)"),
+    # DVDs disponíveis por nome
+    ("idx_dvds_disponivel_nome", "dvds (disponivel, nome)"),
+    # Listagem de clientes por nome
+    ("idx_clientes_nome", "clientes (nome)"),
+)
+
+
+def aplicar(conn):
+    """Cria os índices que ainda não existem, um por transação.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    for nome, definicao in INDICES:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {definicao}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    
+    # Atualiza as estatísticas usadas pelo planejador de consultas
+    conn.execute("ANALYZE")
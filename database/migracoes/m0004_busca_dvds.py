@@ -0,0 +1,47 @@
+"""Índice de texto completo (FTS5) sobre o título e a sinopse dos DVDs."""
+
+VERSAO = 4
+DESCRICAO = "Busca de DVDs por texto completo"
+
+
+def aplicar(conn):
+    """Cria a tabela FTS5 dvds_fts, os gatilhos que a sincronizam e a popula.
+    
+    A tabela é de conteúdo externo (content='dvds'): guarda apenas o índice,
+    e o texto continua sendo lido de dvds. O tokenizador unicode61 com
+    remove_diacritics 2 torna a busca insensível a acentos e maiúsculas.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS dvds_fts USING fts5(
+        nome,
+        sinopse,
+        content = 'dvds',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """)
+    
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_fts_ai AFTER INSERT ON dvds BEGIN
+        INSERT INTO dvds_fts (rowid, nome, sinopse) VALUES (new.id, new.nome, new.sinopse);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_fts_ad AFTER DELETE ON dvds BEGIN
+        INSERT INTO dvds_fts (dvds_fts, rowid, nome, sinopse) VALUES ('delete', old.id, old.nome, old.sinopse);
+    END
+    """)
+    # Só dispara quando o texto muda: aluguéis e devoluções alteram apenas disponivel
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_fts_au AFTER UPDATE OF nome, sinopse ON dvds BEGIN
+        INSERT INTO dvds_fts (dvds_fts, rowid, nome, sinopse) VALUES ('delete', old.id, old.nome, old.sinopse);
+        INSERT INTO dvds_fts (rowid, nome, sinopse) VALUES (new.id, new.nome, new.sinopse);
+    END
+    """)
+    
+    # Indexa os DVDs já cadastrados
+    conn.execute("INSERT INTO dvds_fts (dvds_fts) VALUES ('rebuild')")
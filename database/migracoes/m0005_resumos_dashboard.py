@@ -0,0 +1,159 @@
+"""Tabelas de resumo do dashboard, mantidas por gatilhos."""
+
+VERSAO = 5
+DESCRICAO = "Tabelas de resumo do dashboard"
+
+# Dia (AAAA-MM-DD) de um data_aluguel gravado por datetime.isoformat()
+_DIA = "substr({}, 1, 10)"
+
+
+def _criar_tabelas(conn):
+    """Cria as tabelas de resumo e os índices usados pelos rankings.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resumo_dvd (
+        dvd_id INTEGER PRIMARY KEY,
+        total_alugueis INTEGER NOT NULL
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumo_dvd_total ON resumo_dvd (total_alugueis)")
+    
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resumo_cliente (
+        cliente_id INTEGER PRIMARY KEY,
+        total_alugueis INTEGER NOT NULL
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumo_cliente_total ON resumo_cliente (total_alugueis)")
+    
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resumo_diario (
+        dia TEXT PRIMARY KEY,
+        total_alugueis INTEGER NOT NULL,
+        total_dvds INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """)
+
+
+def _criar_gatilhos(conn):
+    """Cria os gatilhos que mantêm as tabelas de resumo.
+    
+    Contadores que chegam a zero têm a linha removida, para que o resumo
+    fique idêntico ao que a reconstrução completa produziria.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    dia_novo = _DIA.format("new.data_aluguel")
+    dia_antigo = _DIA.format("old.data_aluguel")
+    
+    # Aluguel gravado ou excluído: contagem por cliente e por dia
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_alugueis_ai AFTER INSERT ON alugueis BEGIN
+        INSERT INTO resumo_cliente (cliente_id, total_alugueis) VALUES (new.cliente_id, 1)
+            ON CONFLICT (cliente_id) DO UPDATE SET total_alugueis = total_alugueis + 1;
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds) VALUES ({dia_novo}, 1, 0)
+            ON CONFLICT (dia) DO UPDATE SET total_alugueis = total_alugueis + 1;
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_alugueis_ad AFTER DELETE ON alugueis BEGIN
+        UPDATE resumo_cliente SET total_alugueis = total_alugueis - 1 WHERE cliente_id = old.cliente_id;
+        DELETE FROM resumo_cliente WHERE cliente_id = old.cliente_id AND total_alugueis <= 0;
+        UPDATE resumo_diario SET total_alugueis = total_alugueis - 1 WHERE dia = {dia_antigo};
+        DELETE FROM resumo_diario WHERE dia = {dia_antigo} AND total_alugueis <= 0 AND total_dvds <= 0;
+    END
+    """)
+    
+    # Edição de um aluguel que troca o cliente ou a data
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumo_alugueis_au_cliente AFTER UPDATE OF cliente_id ON alugueis
+    WHEN old.cliente_id IS NOT new.cliente_id BEGIN
+        UPDATE resumo_cliente SET total_alugueis = total_alugueis - 1 WHERE cliente_id = old.cliente_id;
+        DELETE FROM resumo_cliente WHERE cliente_id = old.cliente_id AND total_alugueis <= 0;
+        INSERT INTO resumo_cliente (cliente_id, total_alugueis) VALUES (new.cliente_id, 1)
+            ON CONFLICT (cliente_id) DO UPDATE SET total_alugueis = total_alugueis + 1;
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_alugueis_au_dia AFTER UPDATE OF data_aluguel ON alugueis
+    WHEN {dia_antigo} IS NOT {dia_novo} BEGIN
+        UPDATE resumo_diario
+        SET total_alugueis = total_alugueis - 1,
+            total_dvds = total_dvds - (SELECT COUNT(*) FROM aluguel_dvd WHERE aluguel_id = old.id)
+        WHERE dia = {dia_antigo};
+        DELETE FROM resumo_diario WHERE dia = {dia_antigo} AND total_alugueis <= 0 AND total_dvds <= 0;
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds)
+            VALUES ({dia_novo}, 1, (SELECT COUNT(*) FROM aluguel_dvd WHERE aluguel_id = new.id))
+            ON CONFLICT (dia) DO UPDATE SET
+                total_alugueis = total_alugueis + 1,
+                total_dvds = total_dvds + excluded.total_dvds;
+    END
+    """)
+    
+    # DVD incluído ou retirado de um aluguel. Os DAOs gravam o aluguel antes
+    # de seus DVDs e excluem os DVDs antes do aluguel, então a data do
+    # aluguel está sempre disponível aqui.
+    dia_aluguel_antigo = "(SELECT substr(data_aluguel, 1, 10) FROM alugueis WHERE id = old.aluguel_id)"
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumo_aluguel_dvd_ai AFTER INSERT ON aluguel_dvd BEGIN
+        INSERT INTO resumo_dvd (dvd_id, total_alugueis) VALUES (new.dvd_id, 1)
+            ON CONFLICT (dvd_id) DO UPDATE SET total_alugueis = total_alugueis + 1;
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds)
+            SELECT substr(data_aluguel, 1, 10), 0, 1 FROM alugueis WHERE id = new.aluguel_id
+            ON CONFLICT (dia) DO UPDATE SET total_dvds = total_dvds + 1;
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_aluguel_dvd_ad AFTER DELETE ON aluguel_dvd BEGIN
+        UPDATE resumo_dvd SET total_alugueis = total_alugueis - 1 WHERE dvd_id = old.dvd_id;
+        DELETE FROM resumo_dvd WHERE dvd_id = old.dvd_id AND total_alugueis <= 0;
+        UPDATE resumo_diario SET total_dvds = total_dvds - 1 WHERE dia = {dia_aluguel_antigo};
+        DELETE FROM resumo_diario
+        WHERE dia = {dia_aluguel_antigo} AND total_alugueis <= 0 AND total_dvds <= 0;
+    END
+    """)
+
+
+def _popular(conn):
+    """Calcula os resumos a partir dos aluguéis já gravados.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("""
+    INSERT INTO resumo_dvd (dvd_id, total_alugueis)
+    SELECT dvd_id, COUNT(*) FROM aluguel_dvd GROUP BY dvd_id
+    """)
+    conn.execute("""
+    INSERT INTO resumo_cliente (cliente_id, total_alugueis)
+    SELECT cliente_id, COUNT(*) FROM alugueis GROUP BY cliente_id
+    """)
+    # O resumo diário ainda não tem receita e multas (m0006); nesta versão,
+    # só as contagens
+    conn.execute("""
+    INSERT INTO resumo_diario (dia, total_alugueis, total_dvds)
+    SELECT substr(a.data_aluguel, 1, 10),
+           COUNT(*),
+           SUM((SELECT COUNT(*) FROM aluguel_dvd ad WHERE ad.aluguel_id = a.id))
+    FROM alugueis a
+    GROUP BY substr(a.data_aluguel, 1, 10)
+    """)
+
+
+def aplicar(conn):
+    """Cria as tabelas de resumo, seus gatilhos e as popula.
+    
+    O dashboard passa a ler contagens já agregadas (por DVD, por cliente e
+    por dia) em vez de agrupar aluguel_dvd e alugueis inteiras a cada vez
+    que a aba é aberta.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    _criar_tabelas(conn)
+    _criar_gatilhos(conn)
+    _popular(conn)
@@ -0,0 +1,168 @@
+"""Valor e multa gravados em cada aluguel e somados no resumo diário."""
+
+VERSAO = 6
+DESCRICAO = "Receita e multas no resumo diário"
+
+# Diária por DVD usada pelo dashboard até esta versão; vale para os aluguéis
+# já gravados, que não guardavam o valor cobrado
+VALOR_DIARIA_ANTERIOR = 5.0
+
+# Condição de linha vazia do resumo diário (valores em reais são REAL, então
+# as somas e subtrações podem deixar resíduos de arredondamento)
+_VAZIO = "total_alugueis <= 0 AND total_dvds <= 0 AND abs(receita) < 0.005 AND abs(multas) < 0.005"
+
+_GATILHOS_SUBSTITUIDOS = (
+    "resumo_alugueis_ai",
+    "resumo_alugueis_ad",
+    "resumo_alugueis_au_dia",
+    "resumo_aluguel_dvd_ad",
+)
+
+
+def _alterar_tabelas(conn):
+    """Acrescenta as colunas de valores a alugueis e resumo_diario.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # valor: cobrado na locação; multa e data_entrega: registrados na devolução
+    conn.execute("ALTER TABLE alugueis ADD COLUMN valor REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE alugueis ADD COLUMN multa REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE alugueis ADD COLUMN data_entrega TEXT")
+    
+    conn.execute("ALTER TABLE resumo_diario ADD COLUMN receita REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE resumo_diario ADD COLUMN multas REAL NOT NULL DEFAULT 0")
+    
+    conn.execute("""
+    UPDATE alugueis
+    SET valor = ? * (SELECT COUNT(*) FROM aluguel_dvd ad WHERE ad.aluguel_id = alugueis.id)
+    """, (VALOR_DIARIA_ANTERIOR,))
+
+
+def _criar_gatilhos(conn):
+    """Recria os gatilhos do resumo diário incluindo receita e multas.
+    
+    A receita entra no dia do aluguel; a multa, no dia da entrega.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    for nome in _GATILHOS_SUBSTITUIDOS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {nome}")
+    
+    conn.execute("""
+    CREATE TRIGGER resumo_alugueis_ai AFTER INSERT ON alugueis BEGIN
+        INSERT INTO resumo_cliente (cliente_id, total_alugueis) VALUES (new.cliente_id, 1)
+            ON CONFLICT (cliente_id) DO UPDATE SET total_alugueis = total_alugueis + 1;
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds, receita, multas)
+            VALUES (substr(new.data_aluguel, 1, 10), 1, 0, new.valor, 0)
+            ON CONFLICT (dia) DO UPDATE SET
+                total_alugueis = total_alugueis + 1,
+                receita = receita + excluded.receita;
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds, receita, multas)
+            SELECT substr(new.data_entrega, 1, 10), 0, 0, 0, new.multa
+            WHERE new.data_entrega IS NOT NULL AND new.multa <> 0
+            ON CONFLICT (dia) DO UPDATE SET multas = multas + excluded.multas;
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER resumo_alugueis_ad AFTER DELETE ON alugueis BEGIN
+        UPDATE resumo_cliente SET total_alugueis = total_alugueis - 1 WHERE cliente_id = old.cliente_id;
+        DELETE FROM resumo_cliente WHERE cliente_id = old.cliente_id AND total_alugueis <= 0;
+        UPDATE resumo_diario
+        SET total_alugueis = total_alugueis - 1, receita = receita - old.valor
+        WHERE dia = substr(old.data_aluguel, 1, 10);
+        UPDATE resumo_diario SET multas = multas - old.multa
+        WHERE dia = substr(old.data_entrega, 1, 10) AND old.multa <> 0;
+        DELETE FROM resumo_diario
+        WHERE dia IN (substr(old.data_aluguel, 1, 10), substr(old.data_entrega, 1, 10)) AND {_VAZIO};
+    END
+    """)
+    
+    # Troca de data ou de valor: a linha sai do dia antigo e entra no novo
+    conn.execute(f"""
+    CREATE TRIGGER resumo_alugueis_au_dia AFTER UPDATE OF data_aluguel, valor ON alugueis
+    WHEN substr(old.data_aluguel, 1, 10) IS NOT substr(new.data_aluguel, 1, 10)
+        OR old.valor IS NOT new.valor BEGIN
+        UPDATE resumo_diario
+        SET total_alugueis = total_alugueis - 1,
+            total_dvds = total_dvds - (SELECT COUNT(*) FROM aluguel_dvd WHERE aluguel_id = old.id),
+            receita = receita - old.valor
+        WHERE dia = substr(old.data_aluguel, 1, 10);
+        DELETE FROM resumo_diario WHERE dia = substr(old.data_aluguel, 1, 10) AND {_VAZIO};
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds, receita, multas)
+            VALUES (
+                substr(new.data_aluguel, 1, 10), 1,
+                (SELECT COUNT(*) FROM aluguel_dvd WHERE aluguel_id = new.id), new.valor, 0
+            )
+            ON CONFLICT (dia) DO UPDATE SET
+                total_alugueis = total_alugueis + 1,
+                total_dvds = total_dvds + excluded.total_dvds,
+                receita = receita + excluded.receita;
+    END
+    """)
+    
+    # Devolução registrada (ou corrigida): a multa entra no dia da entrega
+    conn.execute(f"""
+    CREATE TRIGGER resumo_alugueis_au_multa AFTER UPDATE OF multa, data_entrega ON alugueis
+    WHEN old.multa IS NOT new.multa OR old.data_entrega IS NOT new.data_entrega BEGIN
+        UPDATE resumo_diario SET multas = multas - old.multa
+        WHERE dia = substr(old.data_entrega, 1, 10) AND old.multa <> 0;
+        DELETE FROM resumo_diario WHERE dia = substr(old.data_entrega, 1, 10) AND {_VAZIO};
+        INSERT INTO resumo_diario (dia, total_alugueis, total_dvds, receita, multas)
+            SELECT substr(new.data_entrega, 1, 10), 0, 0, 0, new.multa
+            WHERE new.data_entrega IS NOT NULL AND new.multa <> 0
+            ON CONFLICT (dia) DO UPDATE SET multas = multas + excluded.multas;
+    END
+    """)
+    
+    dia_aluguel_antigo = "(SELECT substr(data_aluguel, 1, 10) FROM alugueis WHERE id = old.aluguel_id)"
+    conn.execute(f"""
+    CREATE TRIGGER resumo_aluguel_dvd_ad AFTER DELETE ON aluguel_dvd BEGIN
+        UPDATE resumo_dvd SET total_alugueis = total_alugueis - 1 WHERE dvd_id = old.dvd_id;
+        DELETE FROM resumo_dvd WHERE dvd_id = old.dvd_id AND total_alugueis <= 0;
+        UPDATE resumo_diario SET total_dvds = total_dvds - 1 WHERE dia = {dia_aluguel_antigo};
+        DELETE FROM resumo_diario WHERE dia = {dia_aluguel_antigo} AND {_VAZIO};
+    END
+    """)
+
+
+def _popular(conn):
+    """Recalcula o resumo diário com a receita dos aluguéis já gravados.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("DELETE FROM resumo_diario")
+    conn.execute("""
+    INSERT INTO resumo_diario (dia, total_alugueis, total_dvds, receita, multas)
+    SELECT dia, SUM(alugueis), SUM(dvds), SUM(receita), SUM(multas)
+    FROM (
+        SELECT substr(a.data_aluguel, 1, 10) AS dia,
+               1 AS alugueis,
+               (SELECT COUNT(*) FROM aluguel_dvd ad WHERE ad.aluguel_id = a.id) AS dvds,
+               a.valor AS receita,
+               0 AS multas
+        FROM alugueis a
+        UNION ALL
+        SELECT substr(data_entrega, 1, 10), 0, 0, 0, multa
+        FROM alugueis
+        WHERE data_entrega IS NOT NULL AND multa <> 0
+    )
+    GROUP BY dia
+    """)
+
+
+def aplicar(conn):
+    """Grava valor e multa nos aluguéis e os soma em resumo_diario.
+    
+    Os aluguéis já gravados recebem o valor calculado pela diária antiga;
+    como a data real das devoluções passadas não era registrada, elas
+    ficam sem multa.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    _alterar_tabelas(conn)
+    _popular(conn)
+    _criar_gatilhos(conn)
@@ -0,0 +1,30 @@
+"""Índice para a busca de clientes pelo início do nome enquanto se digita."""
+
+VERSAO = 7
+DESCRICAO = "Busca incremental de clientes"
+
+# Como em m0003, o índice é criado fora da transação da migração, para não
+# segurar o bloqueio de escrita junto com o registro da versão
+TRANSACIONAL = False
+
+
+def aplicar(conn):
+    """Cria o índice de clientes por nome sem diferenciar maiúsculas.
+    
+    O índice idx_clientes_nome (m0003) usa a comparação binária e não atende
+    uma faixa com COLLATE NOCASE; a busca por prefixo de CPF já é atendida
+    pelo índice único da coluna cpf.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # id no índice: o desempate do ORDER BY sai pronto, sem ordenar depois
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_nome_nocase ON clientes (nome COLLATE NOCASE, id)")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    conn.execute("ANALYZE clientes")
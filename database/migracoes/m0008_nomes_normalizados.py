@@ -0,0 +1,104 @@
+"""Chave de busca normalizada e termos dos nomes dos clientes."""
+
+from database.normalizacao import chave_busca, termos
+
+VERSAO = 8
+DESCRICAO = "Nomes de clientes normalizados para busca"
+
+# A tabela de clientes pode ser grande: os nomes são processados em lotes,
+# um commit por lote, como em m0003
+TRANSACIONAL = False
+
+
+def _criar_esquema(conn):
+    """Cria a coluna nome_busca, a tabela clientes_termos, os índices e os gatilhos.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # Importado aqui: o pacote de migrações importa este módulo ao ser carregado
+    from database.migracoes import adicionar_coluna
+    
+    # Termos do nome sem acentos, em minúsculas e em ordem; NULL enquanto o
+    # nome não foi indexado
+    adicionar_coluna(conn, "clientes", "nome_busca", "TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_nome_busca ON clientes (nome_busca)")
+    
+    # Um termo normalizado por linha; a chave primária serve para trocar os
+    # termos de um cliente e o índice por termo, para a busca por prefixo
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS clientes_termos (
+        cliente_id INTEGER NOT NULL,
+        termo TEXT NOT NULL,
+        PRIMARY KEY (cliente_id, termo)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_clientes_termos_termo ON clientes_termos (termo, cliente_id)")
+    
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS clientes_termos_ad AFTER DELETE ON clientes BEGIN
+        DELETE FROM clientes_termos WHERE cliente_id = old.id;
+    END
+    """)
+    # Troca de nome feita fora do ClienteDAO (que regrava a chave logo depois):
+    # o cliente volta a ficar pendente e é reindexado na próxima busca
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS clientes_nome_busca_au AFTER UPDATE OF nome ON clientes
+    WHEN old.nome IS NOT new.nome BEGIN
+        UPDATE clientes SET nome_busca = NULL WHERE id = new.id;
+    END
+    """)
+    
+    # Substituído pela busca por termos, que também ignora acentos
+    conn.execute("DROP INDEX IF EXISTS idx_clientes_nome_nocase")
+
+
+def _indexar_lote(conn, ids):
+    """Grava a chave de busca e os termos de um lote de clientes.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        ids (list): IDs dos clientes do lote.
+    """
+    marcadores = ", ".join("?" * len(ids))
+    clientes = conn.execute(f"SELECT id, nome FROM clientes WHERE id IN ({marcadores})", ids).fetchall()
+    
+    conn.executemany(
+        "INSERT OR IGNORE INTO clientes_termos (cliente_id, termo) VALUES (?, ?)",
+        ((cliente_id, termo) for cliente_id, nome in clientes for termo in termos(nome or ""))
+    )
+    conn.executemany(
+        "UPDATE clientes SET nome_busca = ? WHERE id = ?",
+        ((chave_busca(nome or ""), cliente_id) for cliente_id, nome in clientes)
+    )
+
+
+def aplicar(conn):
+    """Cria a estrutura de busca e indexa os nomes dos clientes já cadastrados.
+    
+    A normalização vem de database.normalizacao, a mesma usada pelo
+    ClienteDAO nas gravações e nas buscas: a chave gravada aqui precisa ser
+    igual à calculada para o texto digitado.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _criar_esquema(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    # Importado aqui: o pacote de migrações importa este módulo ao ser carregado
+    from database.migracoes import executar_em_lotes
+    
+    executar_em_lotes(
+        conn,
+        "SELECT id FROM clientes WHERE id > ? AND nome_busca IS NULL ORDER BY id LIMIT ?",
+        _indexar_lote
+    )
+    
+    conn.execute("ANALYZE clientes")
+    conn.execute("ANALYZE clientes_termos")
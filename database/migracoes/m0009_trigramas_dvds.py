@@ -0,0 +1,157 @@
+"""Índice de trigramas das palavras dos títulos, para a busca tolerante a erros."""
+
+from database.normalizacao import termos, trigramas
+
+VERSAO = 9
+DESCRICAO = "Trigramas das palavras dos títulos dos DVDs"
+
+# O acervo pode ser grande: os títulos são processados em lotes, um commit por
+# lote, como em m0008
+TRANSACIONAL = False
+
+
+def _criar_esquema(conn):
+    """Cria as tabelas de palavras e trigramas, a coluna dvds.total_trigramas, os índices e os gatilhos.
+    
+    Os trigramas são das palavras distintas do acervo, e não de cada título:
+    o vocabulário é bem menor que o acervo, então as listas de cada trigrama
+    continuam curtas mesmo com centenas de milhares de títulos.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # Importado aqui: o pacote de migrações importa este módulo ao ser carregado
+    from database.migracoes import adicionar_coluna
+    
+    # Trigramas distintos do título inteiro: descarta pelo tamanho os títulos
+    # que não alcançariam a similaridade mínima. NULL enquanto o título não foi
+    # indexado
+    adicionar_coluna(conn, "dvds", "total_trigramas", "INTEGER")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dvds_trigramas_pendentes ON dvds (id) WHERE total_trigramas IS NULL")
+    
+    # Uma palavra do título por linha; a chave primária serve para trocar as
+    # palavras de um DVD e o índice, para achar os DVDs que têm uma palavra
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS dvds_palavras (
+        dvd_id INTEGER NOT NULL,
+        palavra TEXT NOT NULL,
+        PRIMARY KEY (dvd_id, palavra)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dvds_palavras_palavra ON dvds_palavras (palavra, dvd_id)")
+    
+    # Vocabulário do acervo, mantido por gatilhos como os resumos do dashboard;
+    # total_trigramas fica NULL até os trigramas da palavra serem gravados
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS palavras (
+        palavra TEXT PRIMARY KEY,
+        total_dvds INTEGER NOT NULL,
+        total_trigramas INTEGER
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_palavras_pendentes ON palavras (palavra) WHERE total_trigramas IS NULL")
+    
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS palavras_trigramas (
+        palavra TEXT NOT NULL,
+        trigrama TEXT NOT NULL,
+        PRIMARY KEY (palavra, trigrama)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_palavras_trigramas_trigrama ON palavras_trigramas (trigrama, palavra)")
+    
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_palavras_ai AFTER INSERT ON dvds_palavras BEGIN
+        INSERT INTO palavras (palavra, total_dvds) VALUES (new.palavra, 1)
+            ON CONFLICT (palavra) DO UPDATE SET total_dvds = total_dvds + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_palavras_ad AFTER DELETE ON dvds_palavras BEGIN
+        UPDATE palavras SET total_dvds = total_dvds - 1 WHERE palavra = old.palavra;
+        DELETE FROM palavras WHERE palavra = old.palavra AND total_dvds <= 0;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS palavras_ad AFTER DELETE ON palavras BEGIN
+        DELETE FROM palavras_trigramas WHERE palavra = old.palavra;
+    END
+    """)
+    
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_palavras_dvd_ad AFTER DELETE ON dvds BEGIN
+        DELETE FROM dvds_palavras WHERE dvd_id = old.id;
+    END
+    """)
+    # Troca de título feita fora do DVDDAO (que regrava as palavras logo
+    # depois): o DVD volta a ficar pendente e é reindexado na próxima busca
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS dvds_palavras_au AFTER UPDATE OF nome ON dvds
+    WHEN old.nome IS NOT new.nome BEGIN
+        UPDATE dvds SET total_trigramas = NULL WHERE id = new.id;
+    END
+    """)
+
+
+def _indexar_lote(conn, ids):
+    """Grava as palavras de um lote de DVDs e os trigramas das palavras novas.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        ids (list): IDs dos DVDs do lote.
+    """
+    marcadores = ", ".join("?" * len(ids))
+    dvds = conn.execute(f"SELECT id, nome FROM dvds WHERE id IN ({marcadores})", ids).fetchall()
+    
+    conn.executemany(
+        "INSERT OR IGNORE INTO dvds_palavras (dvd_id, palavra) VALUES (?, ?)",
+        ((dvd_id, palavra) for dvd_id, nome in dvds for palavra in set(termos(nome or "")))
+    )
+    conn.executemany(
+        "UPDATE dvds SET total_trigramas = ? WHERE id = ?",
+        ((len(trigramas(nome or "")), dvd_id) for dvd_id, nome in dvds)
+    )
+    
+    novas = [(palavra, trigramas(palavra)) for palavra, in conn.execute(
+        "SELECT palavra FROM palavras WHERE total_trigramas IS NULL"
+    )]
+    conn.executemany(
+        "INSERT OR IGNORE INTO palavras_trigramas (palavra, trigrama) VALUES (?, ?)",
+        ((palavra, trigrama) for palavra, conjunto in novas for trigrama in conjunto)
+    )
+    conn.executemany(
+        "UPDATE palavras SET total_trigramas = ? WHERE palavra = ?",
+        ((len(conjunto), palavra) for palavra, conjunto in novas)
+    )
+
+
+def aplicar(conn):
+    """Cria o índice de palavras e trigramas e indexa os títulos já cadastrados.
+    
+    As palavras e os trigramas vêm de database.normalizacao, a mesma usada
+    pelo DVDDAO: os gravados aqui precisam ser iguais aos calculados para o
+    texto digitado.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _criar_esquema(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    
+    # Importado aqui: o pacote de migrações importa este módulo ao ser carregado
+    from database.migracoes import executar_em_lotes
+    
+    executar_em_lotes(
+        conn,
+        "SELECT id FROM dvds WHERE id > ? AND total_trigramas IS NULL ORDER BY id LIMIT ?",
+        _indexar_lote
+    )
+    
+    conn.execute("ANALYZE dvds")
+    conn.execute("ANALYZE dvds_palavras")
+    conn.execute("ANALYZE palavras_trigramas")
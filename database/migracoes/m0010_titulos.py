@@ -0,0 +1,154 @@
+"""Títulos do acervo, com a contagem de cópias, separados das cópias físicas (dvds)."""
+
+VERSAO = 10
+DESCRICAO = "Títulos com contagem de cópias disponíveis"
+
+# Título de um DVD: mesmo nome e mesmo ano de lançamento. Os gatilhos passam
+# new.nome e new.ano_lancamento; scripts/verificar_planos.py confere o plano
+# com parâmetros no lugar deles
+TITULO_DO_DVD = "SELECT id FROM titulos WHERE nome = {nome} AND ano_lancamento IS {ano}"
+
+
+def _criar_esquema(conn):
+    """Cria a tabela titulos, a coluna dvds.titulo_id e os índices.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # Dados do filme uma só vez, com contadores mantidos pelos gatilhos de
+    # dvds, como os resumos do dashboard
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS titulos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        sinopse TEXT,
+        ano_lancamento INTEGER,
+        total_copias INTEGER NOT NULL DEFAULT 0,
+        copias_disponiveis INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_titulos_nome ON titulos (nome, ano_lancamento)")
+    # Só os títulos com alguma cópia livre, já na ordem do combo de aluguel
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_titulos_disponiveis ON titulos (nome, id)
+    WHERE copias_disponiveis > 0
+    """)
+    
+    # Cada linha de dvds passa a ser uma cópia física de um título
+    conn.execute("ALTER TABLE dvds ADD COLUMN titulo_id INTEGER REFERENCES titulos(id)")
+    # Cópias livres de um título: o aluguel por título pega a primeira
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_dvds_copias_livres ON dvds (titulo_id, id) WHERE disponivel = 1")
+
+
+def _criar_gatilhos(conn):
+    """Cria os gatilhos que ligam as cópias aos títulos e mantêm os contadores.
+    
+    Os gatilhos valem também para gravações feitas fora dos DAOs (como as
+    de populate_database.py): uma cópia inserida sem titulo_id é ligada ao
+    título de mesmo nome e ano, que é criado se ainda não existir. Títulos
+    cuja última cópia é excluída (ou passa para outro título) são removidos.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # Contadores: cópia inserida com título, excluída, trocada de título ou
+    # alugada/devolvida
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS titulos_dvds_ai AFTER INSERT ON dvds
+    WHEN new.titulo_id IS NOT NULL BEGIN
+        UPDATE titulos
+        SET total_copias = total_copias + 1, copias_disponiveis = copias_disponiveis + (new.disponivel IS 1)
+        WHERE id = new.titulo_id;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS titulos_dvds_ad AFTER DELETE ON dvds
+    WHEN old.titulo_id IS NOT NULL BEGIN
+        UPDATE titulos
+        SET total_copias = total_copias - 1, copias_disponiveis = copias_disponiveis - (old.disponivel IS 1)
+        WHERE id = old.titulo_id;
+        DELETE FROM titulos WHERE id = old.titulo_id AND total_copias <= 0;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS titulos_dvds_au_titulo AFTER UPDATE OF titulo_id ON dvds
+    WHEN old.titulo_id IS NOT new.titulo_id BEGIN
+        UPDATE titulos
+        SET total_copias = total_copias - 1, copias_disponiveis = copias_disponiveis - (old.disponivel IS 1)
+        WHERE id = old.titulo_id;
+        DELETE FROM titulos WHERE id = old.titulo_id AND total_copias <= 0;
+        UPDATE titulos
+        SET total_copias = total_copias + 1, copias_disponiveis = copias_disponiveis + (new.disponivel IS 1)
+        WHERE id = new.titulo_id;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS titulos_dvds_au_disponivel AFTER UPDATE OF disponivel ON dvds
+    WHEN old.titulo_id IS new.titulo_id AND old.disponivel IS NOT new.disponivel BEGIN
+        UPDATE titulos
+        SET copias_disponiveis = copias_disponiveis + (new.disponivel IS 1) - (old.disponivel IS 1)
+        WHERE id = new.titulo_id;
+    END
+    """)
+    
+    # Ligação da cópia ao título: na inserção sem titulo_id e quando o nome
+    # ou o ano mudam (a troca de titulo_id ajusta os contadores acima)
+    titulo_do_dvd = f"({TITULO_DO_DVD.format(nome='new.nome', ano='new.ano_lancamento')})"
+    for gatilho, evento, condicao in (
+        ("titulos_dvds_ai_ligar", "INSERT", "new.titulo_id IS NULL"),
+        ("titulos_dvds_au_ligar", "UPDATE OF nome, ano_lancamento",
+         "old.nome IS NOT new.nome OR old.ano_lancamento IS NOT new.ano_lancamento"),
+    ):
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {gatilho} AFTER {evento} ON dvds
+        WHEN {condicao} BEGIN
+            INSERT INTO titulos (nome, sinopse, ano_lancamento)
+            SELECT new.nome, new.sinopse, new.ano_lancamento
+            WHERE NOT EXISTS {titulo_do_dvd};
+            UPDATE dvds SET titulo_id = {titulo_do_dvd} WHERE id = new.id;
+        END
+        """)
+    
+    # A sinopse editada em uma cópia passa a ser a do título. O título é
+    # procurado pelo nome e ano novos, e não por new.titulo_id, que ainda é o
+    # antigo quando a mesma edição também troca a cópia de título
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS titulos_dvds_au_sinopse AFTER UPDATE OF sinopse ON dvds
+    WHEN old.sinopse IS NOT new.sinopse BEGIN
+        UPDATE titulos SET sinopse = new.sinopse
+        WHERE nome = new.nome AND ano_lancamento IS new.ano_lancamento;
+    END
+    """)
+
+
+def aplicar(conn):
+    """Cria os títulos a partir das cópias já cadastradas e liga cada cópia ao seu título.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    _criar_esquema(conn)
+    
+    # Um título por nome e ano; a sinopse é a da cópia mais antiga
+    conn.execute("""
+    INSERT INTO titulos (nome, sinopse, ano_lancamento, total_copias, copias_disponiveis)
+    SELECT d.nome, d.sinopse, d.ano_lancamento, g.total_copias, g.copias_disponiveis
+    FROM (
+        SELECT MIN(id) AS primeira, COUNT(*) AS total_copias, SUM(disponivel IS 1) AS copias_disponiveis
+        FROM dvds
+        GROUP BY nome, ano_lancamento
+    ) AS g
+    JOIN dvds d ON d.id = g.primeira
+    ORDER BY g.primeira
+    """)
+    conn.execute("""
+    UPDATE dvds
+    SET titulo_id = (
+        SELECT t.id FROM titulos t WHERE t.nome = dvds.nome AND t.ano_lancamento IS dvds.ano_lancamento
+    )
+    """)
+    
+    # Os gatilhos só são criados depois da carga, que já gravou os contadores
+    _criar_gatilhos(conn)
+    
+    conn.execute("ANALYZE titulos")
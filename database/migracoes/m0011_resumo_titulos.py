@@ -0,0 +1,104 @@
+"""Resumo de aluguéis por título, para o ranking de filmes do dashboard."""
+
+VERSAO = 11
+DESCRICAO = "Resumo de aluguéis por título"
+
+# Aluguéis de uma cópia, que acompanham a cópia de um título para outro
+_ALUGUEIS_DA_COPIA = "(SELECT COUNT(*) FROM aluguel_dvd WHERE dvd_id = {}.id)"
+
+
+def _criar_tabela(conn):
+    """Cria a tabela resumo_titulo e o índice usado pelo ranking.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # resumo_dvd conta cada cópia separadamente: um filme com três cópias
+    # apareceria três vezes no ranking
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS resumo_titulo (
+        titulo_id INTEGER PRIMARY KEY,
+        total_alugueis INTEGER NOT NULL
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_resumo_titulo_total ON resumo_titulo (total_alugueis)")
+
+
+def _criar_gatilhos(conn):
+    """Cria os gatilhos que mantêm resumo_titulo.
+    
+    Os aluguéis de uma cópia acompanham a cópia: quando ela passa para outro
+    título (troca de nome ou de ano) ou é excluída, sua contagem sai do
+    título antigo. Contadores que chegam a zero têm a linha removida, como
+    nos demais resumos.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    # DVD incluído ou retirado de um aluguel
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumo_titulo_aluguel_dvd_ai AFTER INSERT ON aluguel_dvd BEGIN
+        INSERT INTO resumo_titulo (titulo_id, total_alugueis)
+            SELECT titulo_id, 1 FROM dvds WHERE id = new.dvd_id AND titulo_id IS NOT NULL
+            ON CONFLICT (titulo_id) DO UPDATE SET total_alugueis = total_alugueis + 1;
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS resumo_titulo_aluguel_dvd_ad AFTER DELETE ON aluguel_dvd BEGIN
+        UPDATE resumo_titulo SET total_alugueis = total_alugueis - 1
+        WHERE titulo_id = (SELECT titulo_id FROM dvds WHERE id = old.dvd_id);
+        DELETE FROM resumo_titulo
+        WHERE titulo_id = (SELECT titulo_id FROM dvds WHERE id = old.dvd_id) AND total_alugueis <= 0;
+    END
+    """)
+    
+    # Cópia trocada de título ou excluída
+    alugueis_antigos = _ALUGUEIS_DA_COPIA.format("old")
+    alugueis_novos = _ALUGUEIS_DA_COPIA.format("new")
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_titulo_dvds_au_titulo AFTER UPDATE OF titulo_id ON dvds
+    WHEN old.titulo_id IS NOT new.titulo_id BEGIN
+        UPDATE resumo_titulo SET total_alugueis = total_alugueis - {alugueis_antigos}
+        WHERE titulo_id = old.titulo_id;
+        DELETE FROM resumo_titulo WHERE titulo_id = old.titulo_id AND total_alugueis <= 0;
+        INSERT INTO resumo_titulo (titulo_id, total_alugueis)
+            SELECT new.titulo_id, {alugueis_novos}
+            WHERE new.titulo_id IS NOT NULL AND {alugueis_novos} > 0
+            ON CONFLICT (titulo_id) DO UPDATE SET total_alugueis = total_alugueis + excluded.total_alugueis;
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS resumo_titulo_dvds_ad AFTER DELETE ON dvds
+    WHEN old.titulo_id IS NOT NULL BEGIN
+        UPDATE resumo_titulo SET total_alugueis = total_alugueis - {alugueis_antigos}
+        WHERE titulo_id = old.titulo_id;
+        DELETE FROM resumo_titulo WHERE titulo_id = old.titulo_id AND total_alugueis <= 0;
+    END
+    """)
+
+
+def _popular(conn):
+    """Calcula o resumo a partir dos aluguéis já gravados.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    conn.execute("""
+    INSERT INTO resumo_titulo (titulo_id, total_alugueis)
+    SELECT d.titulo_id, COUNT(*)
+    FROM aluguel_dvd ad
+    JOIN dvds d ON d.id = ad.dvd_id
+    WHERE d.titulo_id IS NOT NULL
+    GROUP BY d.titulo_id
+    """)
+
+
+def aplicar(conn):
+    """Cria o resumo por título, seus gatilhos e o popula.
+    
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+    """
+    _criar_tabela(conn)
+    _criar_gatilhos(conn)
+    _popular(conn)
@@ -0,0 +1,69 @@
+import re
+import unicodedata
+
+# Sequências de letras e dígitos; pontuação e espaços separam os termos
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto):
+    """Converte um texto para a forma usada nas buscas: minúsculas e sem acentos.
+    
+    Args:
+        texto (str): Texto original (por exemplo, "João").
+        
+    Returns:
+        str: Texto normalizado (por exemplo, "joao").
+    """
+    # Caminho rápido: texto sem acentos só precisa ir para minúsculas
+    if texto.isascii():
+        return texto.lower()
+    
+    # NFKD separa a letra do acento ("ã" vira "a" + til), que então é descartado
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+def termos(texto):
+    """Separa um texto em termos normalizados, na ordem em que aparecem.
+    
+    Args:
+        texto (str): Texto original.
+        
+    Returns:
+        list: Termos normalizados (pode ter repetidos).
+    """
+    return _PALAVRA.findall(normalizar(texto))
+
+
+def chave_busca(texto):
+    """Monta a chave de busca de um nome: termos normalizados, sem repetição e em ordem.
+    
+    Com os termos ordenados, "Silva, João" e "João Silva" têm a mesma chave.
+    
+    Args:
+        texto (str): Nome original.
+        
+    Returns:
+        str: Termos separados por espaço (string vazia se não houver termos).
+    """
+    return " ".join(sorted(set(termos(texto))))
+
+
+def trigramas(texto):
+    """Extrai os trigramas de um texto normalizado, para comparação aproximada.
+    
+    Como no pg_trgm do PostgreSQL, cada palavra recebe dois espaços antes e
+    um depois ("  matrix "), de modo que o início das palavras pesa mais e
+    palavras de uma ou duas letras também geram trigramas.
+    
+    Args:
+        texto (str): Texto original (por exemplo, um título).
+        
+    Returns:
+        set: Trigramas distintos do texto.
+    """
+    resultado = set()
+    for palavra in termos(texto):
+        palavra = f"  {palavra} "
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
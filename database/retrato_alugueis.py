@@ -0,0 +1,247 @@
+import math
+import operator
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime
+from itertools import accumulate, compress
+
+from database.config import DatabaseConfig
+
+# Linhas lidas do cursor por vez ao montar as colunas
+TAMANHO_LOTE = 50000
+
+# Dia gravado como texto ISO convertido em dias desde 1970-01-01 (2440587.5 é
+# o julianday dessa data)
+_DIA = "CAST(julianday(substr({0}, 1, 10)) - 2440587.5 AS INTEGER)"
+
+# Valor das colunas de dia quando a data não foi informada
+SEM_DATA = -2 ** 31
+
+_ORDINAL_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def dia_epoca(data):
+    """Converte uma data no número de dias desde 1970-01-01.
+    
+    Args:
+        data (datetime ou date): Data a converter.
+        
+    Returns:
+        int: Dias desde 1970-01-01.
+    """
+    return data.toordinal() - _ORDINAL_EPOCA
+
+
+class RetratoAlugueis:
+    """Cópia em colunas de todos os aluguéis, para análises sobre a tabela inteira.
+    
+    Cada coluna é um array do módulo array com uma posição por aluguel, na
+    ordem de data_aluguel (e id, no desempate). Os DVDs ficam no formato CSR:
+    os do aluguel da posição i são dvds[inicio_dvds[i]:inicio_dvds[i + 1]].
+    Datas são guardadas como dias desde 1970-01-01 (SEM_DATA quando nulas).
+    
+    Como as linhas estão em ordem de data, um intervalo de datas é uma faixa
+    contínua de posições, encontrada por busca binária, e as consultas são
+    feitas sobre fatias dos arrays por funções em C (sum, Counter, sorted)
+    em vez de um laço Python por aluguel.
+    
+    O retrato não acompanha gravações feitas depois de carregado; para o
+    dashboard do dia a dia, as tabelas de resumo continuam sendo o caminho.
+    """
+    
+    def __init__(self):
+        """Inicializa um retrato vazio; use carregar() para lê-lo do banco."""
+        self.ids = array("q")
+        self.clientes = array("q")
+        self.dias = array("i")
+        self.dias_devolucao = array("i")
+        self.devolvidos = array("b")
+        self.valores = array("d")
+        self.multas = array("d")
+        self.dias_entrega = array("i")
+        self.inicio_dvds = array("q", [0])
+        self.dvds = array("q")
+        
+        # Índices auxiliares montados a partir das colunas
+        self.devolucoes_pendentes = array("i")
+        self.dias_multa = array("i")
+        self.multas_por_dia = array("d")
+        
+        self.carregado_em = None
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    @classmethod
+    def carregar(cls):
+        """Lê alugueis e aluguel_dvd inteiras para as colunas do retrato.
+        
+        As duas consultas rodam na mesma transação de leitura, então as
+        quantidades de DVDs da primeira batem com as linhas da segunda
+        mesmo que outro terminal grave no meio.
+        
+        Returns:
+            RetratoAlugueis: Retrato com todos os aluguéis gravados.
+        """
+        retrato = cls()
+        colunas = (
+            retrato.ids, retrato.clientes, retrato.dias, retrato.dias_devolucao,
+            retrato.devolvidos, retrato.valores, retrato.multas, retrato.dias_entrega
+        )
+        quantidades_dvds = array("q")
+        
+        with DatabaseConfig.connection() as conn:
+            conn.execute("BEGIN")
+            cursor = conn.cursor()
+            cursor.row_factory = None  # tuplas simples: as colunas são lidas por posição
+            
+            cursor.execute(f"""
+            SELECT a.id,
+                   a.cliente_id,
+                   {_DIA.format("a.data_aluguel")},
+                   COALESCE({_DIA.format("a.data_devolucao")}, {SEM_DATA}),
+                   a.devolvido,
+                   a.valor,
+                   a.multa,
+                   COALESCE({_DIA.format("a.data_entrega")}, {SEM_DATA}),
+                   (SELECT COUNT(*) FROM aluguel_dvd ad WHERE ad.aluguel_id = a.id)
+            FROM alugueis a
+            ORDER BY a.data_aluguel, a.id
+            """)
+            for lote in iter(lambda: cursor.fetchmany(TAMANHO_LOTE), []):
+                valores = tuple(zip(*lote))
+                for coluna, valores_coluna in zip(colunas, valores):
+                    coluna.extend(valores_coluna)
+                quantidades_dvds.extend(valores[-1])
+            
+            cursor.execute("""
+            SELECT ad.dvd_id
+            FROM alugueis a
+            JOIN aluguel_dvd ad ON ad.aluguel_id = a.id
+            ORDER BY a.data_aluguel, a.id
+            """)
+            for lote in iter(lambda: cursor.fetchmany(TAMANHO_LOTE), []):
+                retrato.dvds.extend(dvd_id for dvd_id, in lote)
+        
+        retrato.inicio_dvds.extend(accumulate(quantidades_dvds))
+        retrato._montar_indices()
+        retrato.carregado_em = datetime.now()
+        return retrato
+    
+    def _montar_indices(self):
+        """Monta os arrays ordenados usados por alugueis_em_atraso e pelas multas."""
+        # Previsões de devolução dos aluguéis em aberto, sem os que não têm data
+        pendentes = sorted(compress(self.dias_devolucao, map(operator.not_, self.devolvidos)))
+        self.devolucoes_pendentes = array("i", pendentes[bisect_left(pendentes, SEM_DATA + 1):])
+        
+        # Multas por dia de entrega (a multa entra no faturamento do dia em que foi paga)
+        multas = sorted(compress(zip(self.dias_entrega, self.multas), self.multas))
+        self.dias_multa = array("i", (dia for dia, _ in multas))
+        self.multas_por_dia = array("d", (multa for _, multa in multas))
+    
+    def _faixa(self, inicio=None, fim=None):
+        """Obtém as posições dos aluguéis feitos em um intervalo de datas.
+        
+        Args:
+            inicio (datetime, optional): Início do intervalo (inclusivo). Defaults to None (sem limite).
+            fim (datetime, optional): Fim do intervalo (exclusivo). Defaults to None (sem limite).
+            
+        Returns:
+            tuple: (primeira posição, posição seguinte à última).
+        """
+        primeira = bisect_left(self.dias, dia_epoca(inicio)) if inicio else 0
+        seguinte = bisect_left(self.dias, dia_epoca(fim)) if fim else len(self.dias)
+        return primeira, max(primeira, seguinte)
+    
+    def filmes_mais_alugados(self, limite=10, inicio=None, fim=None):
+        """Lista os DVDs com mais aluguéis, opcionalmente em um intervalo de datas.
+        
+        Args:
+            limite (int, optional): Quantidade de DVDs. Defaults to 10.
+            inicio (datetime, optional): Início do intervalo (inclusivo). Defaults to None.
+            fim (datetime, optional): Fim do intervalo (exclusivo). Defaults to None.
+            
+        Returns:
+            list: Tuplas (dvd_id, total_alugueis), da maior contagem para a menor.
+        """
+        primeira, seguinte = self._faixa(inicio, fim)
+        dvds = self.dvds[self.inicio_dvds[primeira]:self.inicio_dvds[seguinte]]
+        return Counter(dvds).most_common(limite)
+    
+    def clientes_mais_alugam(self, limite=10, inicio=None, fim=None):
+        """Lista os clientes com mais aluguéis, opcionalmente em um intervalo de datas.
+        
+        Args:
+            limite (int, optional): Quantidade de clientes. Defaults to 10.
+            inicio (datetime, optional): Início do intervalo (inclusivo). Defaults to None.
+            fim (datetime, optional): Fim do intervalo (exclusivo). Defaults to None.
+            
+        Returns:
+            list: Tuplas (cliente_id, total_alugueis), da maior contagem para a menor.
+        """
+        primeira, seguinte = self._faixa(inicio, fim)
+        return Counter(self.clientes[primeira:seguinte]).most_common(limite)
+    
+    def faturamento_mensal(self, inicio, fim):
+        """Soma os aluguéis, a receita e as multas de cada mês de um período.
+        
+        Segue as regras do resumo diário: a receita entra no dia do aluguel e
+        a multa, no dia da entrega.
+        
+        Args:
+            inicio (datetime): Início do período (inclusivo).
+            fim (datetime): Fim do período (exclusivo).
+            
+        Returns:
+            list: Tuplas (AAAA-MM, total_alugueis, total_dvds_alugados, receita, multas),
+            no mesmo formato de DashboardDAO.faturamento_agrupado(inicio, fim, "mes").
+        """
+        linhas = []
+        mes = date(inicio.year, inicio.month, 1)
+        
+        while mes < fim.date():
+            ano, indice = divmod(mes.year * 12 + mes.month, 12)
+            proximo = date(ano, indice + 1, 1)
+            
+            de = dia_epoca(max(mes, inicio.date()))
+            ate = dia_epoca(min(proximo, fim.date()))
+            
+            primeira, seguinte = bisect_left(self.dias, de), bisect_left(self.dias, ate)
+            primeira_multa, seguinte_multa = bisect_left(self.dias_multa, de), bisect_left(self.dias_multa, ate)
+            
+            total_alugueis = seguinte - primeira
+            multas = math.fsum(self.multas_por_dia[primeira_multa:seguinte_multa])
+            
+            if total_alugueis or seguinte_multa > primeira_multa:
+                linhas.append((
+                    mes.strftime("%Y-%m"),
+                    total_alugueis,
+                    self.inicio_dvds[seguinte] - self.inicio_dvds[primeira],
+                    math.fsum(self.valores[primeira:seguinte]),
+                    multas
+                ))
+            
+            mes = proximo
+        
+        return linhas
+    
+    def alugueis_em_atraso(self, hoje=None):
+        """Conta os aluguéis em aberto com a devolução prevista antes de hoje.
+        
+        Args:
+            hoje (datetime, optional): Data de referência. Defaults to None (data atual).
+            
+        Returns:
+            int: Quantidade de aluguéis em atraso.
+        """
+        hoje = hoje or datetime.now()
+        return bisect_left(self.devolucoes_pendentes, dia_epoca(hoje))
+    
+    def tamanho_em_bytes(self):
+        """Calcula a memória ocupada pelos arrays do retrato.
+        
+        Returns:
+            int: Soma dos bytes de todas as colunas e índices.
+        """
+        return sum(coluna.itemsize * len(coluna) for coluna in vars(self).values() if isinstance(coluna, array))
@@ -0,0 +1,122 @@
+from database.config import DatabaseConfig
+from models.titulo import Titulo
+
+# Consultas do DAO, também conferidas por scripts/verificar_planos.py
+CONSULTA_POR_ID = "SELECT * FROM titulos WHERE id = ?"
+CONSULTA_TODOS = "SELECT * FROM titulos ORDER BY nome"
+# Percorre só o índice parcial idx_titulos_disponiveis
+CONSULTA_DISPONIVEIS = "SELECT * FROM titulos WHERE copias_disponiveis > 0 ORDER BY nome, id"
+CONSULTA_COPIAS_DISPONIVEIS = "SELECT copias_disponiveis FROM titulos WHERE id = ?"
+
+class TituloDAO:
+    """Data Access Object para a entidade Titulo.
+    
+    Os títulos são criados, ligados às cópias e contados pelos gatilhos de
+    dvds (migração m0010): cadastrar, editar ou alugar um DVD já atualiza o
+    título. Por isso este DAO só faz leituras.
+    """
+    
+    @staticmethod
+    def buscar_por_id(titulo_id):
+        """Busca um título pelo ID.
+        
+        Args:
+            titulo_id (int): ID do título.
+            
+        Returns:
+            Titulo: Objeto Titulo encontrado ou None se não encontrado.
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_POR_ID, (titulo_id,))
+            row = cursor.fetchone()
+        
+        if row:
+            return Titulo(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                total_copias=row["total_copias"],
+                copias_disponiveis=row["copias_disponiveis"]
+            )
+        
+        return None
+    
+    @staticmethod
+    def listar_todos():
+        """Lista todos os títulos do acervo.
+        
+        Returns:
+            list: Lista de objetos Titulo, em ordem de nome.
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_TODOS)
+            rows = cursor.fetchall()
+        
+        titulos = []
+        for row in rows:
+            titulo = Titulo(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                total_copias=row["total_copias"],
+                copias_disponiveis=row["copias_disponiveis"]
+            )
+            titulos.append(titulo)
+        
+        return titulos
+    
+    @staticmethod
+    def listar_disponiveis():
+        """Lista os títulos com alguma cópia livre para aluguel.
+        
+        A contagem vem do contador copias_disponiveis, e não de um COUNT
+        sobre dvds: a consulta percorre só o índice parcial dos títulos
+        disponíveis, então o custo depende do número de títulos, e não do
+        de cópias.
+        
+        Returns:
+            list: Lista de objetos Titulo, em ordem de nome.
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_DISPONIVEIS)
+            rows = cursor.fetchall()
+        
+        titulos = []
+        for row in rows:
+            titulo = Titulo(
+                id=row["id"],
+                nome=row["nome"],
+                sinopse=row["sinopse"],
+                ano_lancamento=row["ano_lancamento"],
+                total_copias=row["total_copias"],
+                copias_disponiveis=row["copias_disponiveis"]
+            )
+            titulos.append(titulo)
+        
+        return titulos
+    
+    @staticmethod
+    def copias_disponiveis(titulo_id):
+        """Obtém quantas cópias de um título estão livres para aluguel.
+        
+        Args:
+            titulo_id (int): ID do título.
+            
+        Returns:
+            int: Cópias disponíveis (0 se o título não existir).
+        """
+        with DatabaseConfig.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(CONSULTA_COPIAS_DISPONIVEIS, (titulo_id,))
+            row = cursor.fetchone()
+        
+        return row["copias_disponiveis"] if row else 0
@@ -1,26 +1,96 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Valor cobrado por DVD em cada locação
+VALOR_DIARIA = 5.0
+# Multa por DVD a cada dia de atraso na devolução
+MULTA_POR_DIA_ATRASO = 2.0
+
+# Referência das datas guardadas como microssegundos (como o AluguelDAO as carrega)
+_EPOCA = datetime(1970, 1, 1)
+
+
+def _para_datetime(valor):
+    """Converte uma data guardada no modelo para datetime.
+    
+    Args:
+        valor (datetime, str ou int): Data, texto ISO ou microssegundos desde 1970-01-01.
+        
+    Returns:
+        datetime: Data convertida (None se valor for None).
+    """
+    if isinstance(valor, str):
+        return datetime.fromisoformat(valor)
+    if isinstance(valor, int):
+        return _EPOCA + timedelta(microseconds=valor)
+    return valor
 
 class Aluguel:
-    """Classe que representa um aluguel de DVDs."""
+    """Classe que representa um aluguel de DVDs.
+    
+    As datas podem ser informadas como datetime, como texto ISO ou como
+    inteiro de microssegundos desde 1970-01-01 (como o AluguelDAO as carrega,
+    32 bytes em vez dos 48 de um datetime ou dos 75 do texto). A conversão
+    para datetime só acontece no primeiro acesso, então listagens que não
+    usam as datas não pagam por ela.
+    """
+    
+    # Sem __dict__ por instância: carregar todos os aluguéis ocupa bem menos memória
+    __slots__ = ("id", "cliente_id", "dvds_ids", "devolvido", "_data_aluguel", "_data_devolucao")
     
     def __init__(self, id=None, data_aluguel=None, cliente_id=None, dvds_ids=None, data_devolucao=None, devolvido=False):
         """Inicializa um novo aluguel.
         
         Args:
             id (int, optional): ID único do aluguel. Defaults to None.
-            data_aluguel (datetime, optional): Data em que o aluguel foi realizado. Defaults to None.
+            data_aluguel (datetime, str ou int, optional): Data em que o aluguel foi realizado. Defaults to None.
             cliente_id (int, optional): ID do cliente que realizou o aluguel. Defaults to None.
             dvds_ids (list, optional): Lista de IDs dos DVDs alugados. Defaults to None.
-            data_devolucao (datetime, optional): Data prevista para devolução. Defaults to None.
+            data_devolucao (datetime, str ou int, optional): Data prevista para devolução. Defaults to None.
             devolvido (bool, optional): Indica se o aluguel foi devolvido. Defaults to False.
         """
         self.id = id
-        self.data_aluguel = data_aluguel if data_aluguel else datetime.now()
+        self._data_aluguel = data_aluguel if data_aluguel else datetime.now()
         self.cliente_id = cliente_id
         self.dvds_ids = dvds_ids if dvds_ids else []
-        self.data_devolucao = data_devolucao
+        self._data_devolucao = data_devolucao if data_devolucao else None
         self.devolvido = devolvido
     
+    @property
+    def data_aluguel(self):
+        """datetime: Data em que o aluguel foi realizado."""
+        if not isinstance(self._data_aluguel, datetime):
+            self._data_aluguel = _para_datetime(self._data_aluguel)
+        return self._data_aluguel
+    
+    @data_aluguel.setter
+    def data_aluguel(self, valor):
+        self._data_aluguel = valor
+    
+    @property
+    def data_devolucao(self):
+        """datetime: Data prevista para devolução (None se não definida)."""
+        if not isinstance(self._data_devolucao, datetime):
+            self._data_devolucao = _para_datetime(self._data_devolucao)
+        return self._data_devolucao
+    
+    @data_devolucao.setter
+    def data_devolucao(self, valor):
+        self._data_devolucao = valor
+    
+    @property
+    def data_aluguel_iso(self):
+        """str: Data do aluguel em texto ISO, sem guardar a conversão no objeto."""
+        if isinstance(self._data_aluguel, str):
+            return self._data_aluguel
+        return _para_datetime(self._data_aluguel).isoformat()
+    
+    @property
+    def data_devolucao_iso(self):
+        """str: Data prevista para devolução em texto ISO (None se não definida)."""
+        if self._data_devolucao is None or isinstance(self._data_devolucao, str):
+            return self._data_devolucao
+        return _para_datetime(self._data_devolucao).isoformat()
+    
     def __str__(self):
         """Retorna uma representação em string do aluguel.
         
@@ -46,6 +116,28 @@ class Aluguel:
             return (hoje - data_devolucao).days
         return 0
     
+    def calcular_valor(self, valor_diaria=VALOR_DIARIA):
+        """Calcula o valor cobrado na locação.
+        
+        Args:
+            valor_diaria (float, optional): Valor por DVD. Defaults to VALOR_DIARIA.
+            
+        Returns:
+            float: Valor da locação.
+        """
+        return len(set(self.dvds_ids)) * valor_diaria
+    
+    def calcular_multa(self, multa_por_dia_atraso=MULTA_POR_DIA_ATRASO):
+        """Calcula a multa por atraso, caso o aluguel fosse devolvido hoje.
+        
+        Args:
+            multa_por_dia_atraso (float, optional): Multa por DVD e dia de atraso. Defaults to MULTA_POR_DIA_ATRASO.
+            
+        Returns:
+            float: Valor da multa (0 se não houver atraso).
+        """
+        return self.calcular_atraso() * multa_por_dia_atraso * len(set(self.dvds_ids))
+    
     def to_dict(self):
         """Converte o objeto Aluguel para um dicionário.
         
@@ -54,10 +146,10 @@ class Aluguel:
         """
         return {
             "id": self.id,
-            "data_aluguel": self.data_aluguel.isoformat() if self.data_aluguel else None,
+            "data_aluguel": self.data_aluguel_iso,
             "cliente_id": self.cliente_id,
             "dvds_ids": self.dvds_ids,
-            "data_devolucao": self.data_devolucao.isoformat() if self.data_devolucao else None,
+            "data_devolucao": self.data_devolucao_iso,
             "devolvido": self.devolvido
         }
     
@@ -71,14 +163,11 @@ class Aluguel:
         Returns:
             Aluguel: Objeto Aluguel criado.
         """
-        data_aluguel = datetime.fromisoformat(data.get("data_aluguel")) if data.get("data_aluguel") else None
-        data_devolucao = datetime.fromisoformat(data.get("data_devolucao")) if data.get("data_devolucao") else None
-        
         return Aluguel(
             id=data.get("id"),
-            data_aluguel=data_aluguel,
+            data_aluguel=data.get("data_aluguel"),
             cliente_id=data.get("cliente_id"),
             dvds_ids=data.get("dvds_ids", []),
-            data_devolucao=data_devolucao,
+            data_devolucao=data.get("data_devolucao"),
             devolvido=data.get("devolvido", False)
         )
\ No newline at end of file
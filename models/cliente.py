@@ -1,6 +1,9 @@
 class Cliente:
     """Classe que representa um cliente da locadora de DVDs."""
     
+    # Sem __dict__ por instância: listagens com muitos clientes ocupam bem menos memória
+    __slots__ = ("id", "cpf", "nome", "telefone", "endereco")
+    
     def __init__(self, id=None, cpf="", nome="", telefone="", endereco=""):
         """Inicializa um novo cliente.
         
@@ -1,6 +1,9 @@
 class DVD:
     """Classe que representa um DVD na locadora."""
     
+    # Sem __dict__ por instância: listagens com muitos DVDs ocupam bem menos memória
+    __slots__ = ("id", "nome", "sinopse", "ano_lancamento", "ano_aquisicao", "disponivel")
+    
     def __init__(self, id=None, nome="", sinopse="", ano_lancamento=None, ano_aquisicao=None, disponivel=True):
         """Inicializa um novo DVD.
         
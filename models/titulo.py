@@ -0,0 +1,65 @@
+class Titulo:
+    """Classe que representa um título (filme) do acervo, com a contagem de suas cópias."""
+    
+    # Sem __dict__ por instância, como em DVD
+    __slots__ = ("id", "nome", "sinopse", "ano_lancamento", "total_copias", "copias_disponiveis")
+    
+    def __init__(self, id=None, nome="", sinopse="", ano_lancamento=None, total_copias=0, copias_disponiveis=0):
+        """Inicializa um novo título.
+        
+        Args:
+            id (int, optional): ID único do título. Defaults to None.
+            nome (str, optional): Nome do filme. Defaults to "".
+            sinopse (str, optional): Sinopse do filme. Defaults to "".
+            ano_lancamento (int, optional): Ano de lançamento do filme. Defaults to None.
+            total_copias (int, optional): Cópias físicas (DVDs) do título. Defaults to 0.
+            copias_disponiveis (int, optional): Cópias livres para aluguel. Defaults to 0.
+        """
+        self.id = id
+        self.nome = nome
+        self.sinopse = sinopse
+        self.ano_lancamento = ano_lancamento
+        self.total_copias = total_copias
+        self.copias_disponiveis = copias_disponiveis
+    
+    def __str__(self):
+        """Retorna uma representação em string do título.
+        
+        Returns:
+            str: Representação em string do título.
+        """
+        return f"{self.nome} ({self.ano_lancamento}) - {self.copias_disponiveis} de {self.total_copias} disponíveis"
+    
+    def to_dict(self):
+        """Converte o objeto Titulo para um dicionário.
+        
+        Returns:
+            dict: Dicionário com os dados do título.
+        """
+        return {
+            "id": self.id,
+            "nome": self.nome,
+            "sinopse": self.sinopse,
+            "ano_lancamento": self.ano_lancamento,
+            "total_copias": self.total_copias,
+            "copias_disponiveis": self.copias_disponiveis
+        }
+    
+    @staticmethod
+    def from_dict(data):
+        """Cria um objeto Titulo a partir de um dicionário.
+        
+        Args:
+            data (dict): Dicionário com os dados do título.
+            
+        Returns:
+            Titulo: Objeto Titulo criado.
+        """
+        return Titulo(
+            id=data.get("id"),
+            nome=data.get("nome", ""),
+            sinopse=data.get("sinopse", ""),
+            ano_lancamento=data.get("ano_lancamento"),
+            total_copias=data.get("total_copias", 0),
+            copias_disponiveis=data.get("copias_disponiveis", 0)
+        )
@@ -0,0 +1 @@
+# Inicialização do pacote scripts
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Mede a busca de DVDs por título aproximado (DVDDAO.buscar_aproximado).
+
+Gera o mesmo catálogo sintético de benchmark_busca_dvds, indexa os
+trigramas dos títulos e busca títulos sorteados com um erro de digitação em
+cada palavra (letra trocada de lugar, faltando, sobrando ou errada),
+medindo a latência e em quantas buscas o título original veio no resultado.
+
+O catálogo é montado com poucas sílabas, então tem só algumas centenas de
+trigramas distintos, cada um presente em milhares de títulos: é um caso
+pior que o de um acervo real, em que os trigramas variam muito mais.
+
+Uso:
+    python -m scripts.benchmark_busca_aproximada [--titulos 500000] [--buscas 200]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+from database.config import DatabaseConfig
+from scripts.benchmark_busca_dvds import gerar_catalogo
+
+LETRAS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def errar(palavra, aleatorio):
+    """Aplica um erro de digitação a uma palavra.
+    
+    Args:
+        palavra (str): Palavra original.
+        aleatorio (random.Random): Gerador de números aleatórios.
+        
+    Returns:
+        str: Palavra com uma letra trocada de lugar, faltando, sobrando ou errada.
+    """
+    if len(palavra) < 4:
+        return palavra
+    
+    i = aleatorio.randrange(1, len(palavra) - 1)
+    erro = aleatorio.choice(("trocar", "omitir", "repetir", "substituir"))
+    if erro == "trocar":
+        return palavra[:i] + palavra[i + 1] + palavra[i] + palavra[i + 2:]
+    if erro == "omitir":
+        return palavra[:i] + palavra[i + 1:]
+    if erro == "repetir":
+        return palavra[:i] + palavra[i] + palavra[i:]
+    return palavra[:i] + aleatorio.choice(LETRAS) + palavra[i + 1:]
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Latência e acerto da busca aproximada de títulos.")
+    parser.add_argument("--titulos", type=int, default=500000, help="Quantidade de DVDs no catálogo.")
+    parser.add_argument("--buscas", type=int, default=200, help="Títulos buscados com erro.")
+    parser.add_argument("--limite", type=int, default=20, help="Resultados por busca.")
+    args = parser.parse_args()
+    
+    from database.dvd_dao import DVDDAO
+    
+    aleatorio = random.Random(42)
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        DatabaseConfig.DB_DIR = diretorio
+        DatabaseConfig.initialize_database()
+        
+        inicio = time.perf_counter()
+        with DatabaseConfig.connection() as conn:
+            gerar_catalogo(conn.cursor(), args.titulos, aleatorio)
+        print(f"{args.titulos} DVDs inseridos em {time.perf_counter() - inicio:.1f}s")
+        
+        # O catálogo foi inserido direto no banco: a primeira busca o indexaria
+        inicio = time.perf_counter()
+        indexados = DVDDAO.indexar_palavras_pendentes()
+        print(f"Trigramas de {indexados} títulos indexados em {time.perf_counter() - inicio:.1f}s\n")
+        
+        with DatabaseConfig.connection() as conn:
+            amostra = conn.execute(
+                "SELECT id, nome FROM dvds ORDER BY random() LIMIT ?", (args.buscas,)
+            ).fetchall()
+        
+        tempos = []
+        acertos = 0
+        for row in amostra:
+            texto = " ".join(errar(palavra, aleatorio) for palavra in row["nome"].split())
+            
+            inicio = time.perf_counter()
+            resultados = DVDDAO.buscar_aproximado(texto, args.limite)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+            
+            acertos += any(dvd.id == row["id"] for dvd, _ in resultados)
+        
+        tempos.sort()
+        print(f"{'mediana (ms)':>13s} {'p95 (ms)':>9s} {'máx (ms)':>9s} {'título original encontrado':>27s}")
+        print(f"{tempos[len(tempos) // 2]:13.1f} {tempos[len(tempos) * 95 // 100]:9.1f} {tempos[-1]:9.1f} "
+              f"{acertos / len(tempos):26.0%}")
+        
+        DatabaseConfig.fechar_pool()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
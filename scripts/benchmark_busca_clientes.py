@@ -0,0 +1,116 @@
+"""Mede a busca de clientes enquanto se digita (ClienteDAO.buscar_por_prefixo).
+
+Gera clientes sintéticos em um banco temporário e simula a digitação de
+nomes e CPFs: cada prefixo, da primeira à última letra, é uma consulta, como
+as que a ClienteView faz depois de cada pausa na digitação. Os nomes são
+digitados sem acentos e com as palavras em ordem invertida, o que a busca
+por termos normalizados (ClienteDAO.pesquisar) precisa encontrar.
+
+Uso:
+    python -m scripts.benchmark_busca_clientes [--clientes 1000000] [--digitacoes 50]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+
+from database.config import DatabaseConfig
+from database.normalizacao import normalizar
+
+PRENOMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela", "João",
+    "Karina", "Lucas", "Mariana", "Nicolas", "Olívia", "Pedro", "Rafaela", "Samuel", "Tatiana", "Vitor",
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+)
+
+
+def gerar_clientes(cursor, total, aleatorio):
+    """Insere clientes com nomes compostos e CPFs distintos.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor do banco temporário.
+        total (int): Quantidade de clientes.
+        aleatorio (random.Random): Gerador de números aleatórios.
+    """
+    cpfs = aleatorio.sample(range(10 ** 11), total)
+    cursor.executemany(
+        "INSERT INTO clientes (cpf, nome, telefone, endereco) VALUES (?, ?, '', '')",
+        (
+            (f"{cpf:011d}", f"{aleatorio.choice(PRENOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}")
+            for cpf in cpfs
+        )
+    )
+
+
+def simular_digitacao(textos, limite):
+    """Busca todos os prefixos de cada texto, como se fossem digitados letra a letra.
+    
+    Args:
+        textos (list): Nomes ou CPFs digitados.
+        limite (int): Número máximo de resultados por busca.
+        
+    Returns:
+        tuple: (mediana em ms, percentil 99 em ms, pior caso em ms).
+    """
+    from database.cliente_dao import ClienteDAO
+    
+    tempos = []
+    for texto in textos:
+        for tamanho in range(1, len(texto) + 1):
+            inicio = time.perf_counter()
+            ClienteDAO.buscar_por_prefixo(texto[:tamanho], limite)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    tempos.sort()
+    return tempos[len(tempos) // 2], tempos[len(tempos) * 99 // 100], tempos[-1]
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Latência da busca de clientes por prefixo.")
+    parser.add_argument("--clientes", type=int, default=1000000, help="Quantidade de clientes gerados.")
+    parser.add_argument("--digitacoes", type=int, default=50, help="Nomes e CPFs digitados.")
+    parser.add_argument("--limite", type=int, default=50, help="Resultados por busca.")
+    args = parser.parse_args()
+    
+    aleatorio = random.Random(42)
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        DatabaseConfig.DB_DIR = diretorio
+        DatabaseConfig.initialize_database()
+        
+        inicio = time.perf_counter()
+        with DatabaseConfig.connection() as conn:
+            gerar_clientes(conn.cursor(), args.clientes, aleatorio)
+            conn.execute("ANALYZE clientes")
+            
+            amostra = conn.execute(
+                "SELECT nome, cpf FROM clientes ORDER BY random() LIMIT ?", (args.digitacoes,)
+            ).fetchall()
+        print(f"{args.clientes} clientes gerados em {time.perf_counter() - inicio:.1f}s")
+        
+        from database.cliente_dao import ClienteDAO
+        
+        # Os clientes foram inseridos direto no banco: a primeira busca os indexaria
+        inicio = time.perf_counter()
+        indexados = ClienteDAO.indexar_nomes_pendentes()
+        print(f"{indexados} nomes normalizados e indexados em {time.perf_counter() - inicio:.1f}s\n")
+        
+        print(f"{'digitação':10s} {'mediana (ms)':>13s} {'p99 (ms)':>9s} {'máx (ms)':>9s}")
+        for descricao, textos in (
+            ("nome", [" ".join(reversed(normalizar(row["nome"]).split())) for row in amostra]),
+            ("CPF", [row["cpf"] for row in amostra]),
+        ):
+            mediana, p99, maximo = simular_digitacao(textos, args.limite)
+            print(f"{descricao:10s} {mediana:13.2f} {p99:9.2f} {maximo:9.2f}")
+        
+        DatabaseConfig.fechar_pool()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
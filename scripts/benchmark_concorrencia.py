@@ -0,0 +1,220 @@
+"""Compara a concorrência leitura/escrita entre o perfil padrão do SQLite e o perfil WAL.
+
+Simula vários terminais: um processo grava aluguéis (AluguelDAO.inserir e
+registrar_devolucao) enquanto outros processos leem como o dashboard e a
+tela de aluguéis. Cada perfil roda em um banco temporário próprio.
+
+Uso:
+    python -m scripts.benchmark_concorrencia [--leitores 3] [--segundos 5] [--dvds 2000] [--alugueis 20000]
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.config import DatabaseConfig
+
+PERFIS = {
+    "padrao (DELETE/FULL)": DatabaseConfig.PERFIL_PADRAO_SQLITE,
+    "desempenho (WAL)": DatabaseConfig.PERFIL_DESEMPENHO,
+}
+
+
+def preparar_banco(diretorio, perfil, total_dvds, total_alugueis, total_clientes=500):
+    """Cria e popula um banco temporário para o benchmark.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        perfil (dict): Perfil de PRAGMAs a ser usado.
+        total_dvds (int): Quantidade de DVDs.
+        total_alugueis (int): Quantidade de aluguéis históricos (já devolvidos).
+        total_clientes (int, optional): Quantidade de clientes. Defaults to 500.
+    """
+    configurar_processo(diretorio, perfil)
+    DatabaseConfig.initialize_database()
+    
+    inicio = datetime.now() - timedelta(days=365)
+    with DatabaseConfig.connection() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (cpf, nome, telefone, endereco) VALUES (?, ?, ?, ?)",
+            [(f"{i:011d}", f"Cliente {i}", "", "") for i in range(1, total_clientes + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel) VALUES (?, ?, ?, ?, 1)",
+            [(f"Filme {i}", "", 2000, 2020) for i in range(1, total_dvds + 1)]
+        )
+        for i in range(total_alugueis):
+            data = inicio + timedelta(minutes=i)
+            cursor = conn.execute(
+                "INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido) VALUES (?, ?, ?, 1)",
+                (data.isoformat(), random.randint(1, total_clientes), (data + timedelta(days=7)).isoformat())
+            )
+            conn.execute(
+                "INSERT INTO aluguel_dvd (aluguel_id, dvd_id) VALUES (?, ?)",
+                (cursor.lastrowid, random.randint(1, total_dvds))
+            )
+    
+    DatabaseConfig.fechar_pool()
+
+
+def configurar_processo(diretorio, perfil):
+    """Aponta o DatabaseConfig deste processo para o banco do benchmark.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        perfil (dict): Perfil de PRAGMAs a ser usado.
+    """
+    DatabaseConfig.DB_DIR = diretorio
+    DatabaseConfig.POOL_SIZE = 1
+    DatabaseConfig.configurar_perfil(perfil)
+
+
+def escritor(diretorio, perfil, segundos, total_dvds, total_clientes, fila):
+    """Processo que registra e devolve aluguéis continuamente.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        perfil (dict): Perfil de PRAGMAs a ser usado.
+        segundos (float): Duração da medição.
+        total_dvds (int): Quantidade de DVDs existentes.
+        total_clientes (int): Quantidade de clientes existentes.
+        fila (multiprocessing.Queue): Fila para devolver o resultado.
+    """
+    from database.aluguel_dao import AluguelDAO
+    from models.aluguel import Aluguel
+    
+    configurar_processo(diretorio, perfil)
+    operacoes = erros = 0
+    latencias = []
+    fim = time.perf_counter() + segundos
+    
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            aluguel = Aluguel(
+                cliente_id=random.randint(1, total_clientes),
+                dvds_ids=[random.randint(1, total_dvds)],
+                data_devolucao=datetime.now() + timedelta(days=7)
+            )
+            AluguelDAO.inserir(aluguel)
+            AluguelDAO.registrar_devolucao(aluguel.id)
+            operacoes += 1
+        except Exception:
+            erros += 1
+        latencias.append(time.perf_counter() - inicio)
+    
+    DatabaseConfig.fechar_pool()
+    fila.put(("escrita", operacoes, erros, latencias))
+
+
+def leitor(diretorio, perfil, segundos, total_clientes, fila):
+    """Processo que faz as leituras típicas das telas continuamente.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        perfil (dict): Perfil de PRAGMAs a ser usado.
+        segundos (float): Duração da medição.
+        total_clientes (int): Quantidade de clientes existentes.
+        fila (multiprocessing.Queue): Fila para devolver o resultado.
+    """
+    from database.aluguel_dao import AluguelDAO
+    from database.dvd_dao import DVDDAO
+    
+    configurar_processo(diretorio, perfil)
+    operacoes = erros = 0
+    latencias = []
+    fim = time.perf_counter() + segundos
+    
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            AluguelDAO.listar_por_cliente(random.randint(1, total_clientes))
+            AluguelDAO.listar_alugueis_em_atraso()
+            DVDDAO.listar_disponiveis()
+            operacoes += 1
+        except Exception:
+            erros += 1
+        latencias.append(time.perf_counter() - inicio)
+    
+    DatabaseConfig.fechar_pool()
+    fila.put(("leitura", operacoes, erros, latencias))
+
+
+def percentil(valores, p):
+    """Calcula um percentil simples (em milissegundos).
+    
+    Args:
+        valores (list): Latências em segundos.
+        p (float): Percentil entre 0 e 100.
+        
+    Returns:
+        float: Latência no percentil, em milissegundos.
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(len(ordenados) * p / 100))
+    return ordenados[indice] * 1000
+
+
+def medir(nome, perfil, args):
+    """Executa o benchmark para um perfil e imprime o resultado.
+    
+    Args:
+        nome (str): Nome do perfil.
+        perfil (dict): Perfil de PRAGMAs.
+        args (argparse.Namespace): Parâmetros do benchmark.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar_banco(diretorio, perfil, args.dvds, args.alugueis)
+        
+        fila = multiprocessing.Queue()
+        processos = [multiprocessing.Process(
+            target=escritor, args=(diretorio, perfil, args.segundos, args.dvds, 500, fila)
+        )]
+        processos += [
+            multiprocessing.Process(target=leitor, args=(diretorio, perfil, args.segundos, 500, fila))
+            for _ in range(args.leitores)
+        ]
+        
+        for processo in processos:
+            processo.start()
+        resultados = [fila.get() for _ in processos]
+        for processo in processos:
+            processo.join()
+    
+    print(f"\n== Perfil {nome} ==")
+    for tipo in ("escrita", "leitura"):
+        operacoes = sum(r[1] for r in resultados if r[0] == tipo)
+        erros = sum(r[2] for r in resultados if r[0] == tipo)
+        latencias = [lat for r in resultados if r[0] == tipo for lat in r[3]]
+        print(
+            f"  {tipo:8s}: {operacoes / args.segundos:8.1f} op/s | erros: {erros:4d} | "
+            f"p50: {percentil(latencias, 50):7.1f} ms | p99: {percentil(latencias, 99):7.1f} ms | "
+            f"máx: {percentil(latencias, 100):7.1f} ms"
+        )
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência leitura/escrita do SQLite.")
+    parser.add_argument("--leitores", type=int, default=3, help="Processos leitores simultâneos.")
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duração de cada medição.")
+    parser.add_argument("--dvds", type=int, default=2000, help="Quantidade de DVDs no banco.")
+    parser.add_argument("--alugueis", type=int, default=20000, help="Quantidade de aluguéis históricos.")
+    args = parser.parse_args()
+    
+    print(f"{args.leitores} leitor(es) + 1 escritor por {args.segundos:.0f}s; "
+          f"{args.dvds} DVDs, {args.alugueis} aluguéis.")
+    
+    for nome, perfil in PERFIS.items():
+        medir(nome, perfil, args)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Mede memória e tempo para carregar a tabela inteira de aluguéis.
+
+Compara AluguelDAO.listar_todos (modelos com __slots__, datas carregadas
+como inteiros e convertidas só no primeiro acesso) com o carregamento
+anterior, em que cada Aluguel tinha um __dict__ e as duas datas eram
+convertidas com fromisoformat em todas as linhas.
+
+Uso:
+    python -m scripts.benchmark_modelos [--alugueis 1000000]
+"""
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from database.config import DatabaseConfig
+
+
+class AluguelAntigo:
+    """Modelo de aluguel como era antes de __slots__, para comparação."""
+    
+    def __init__(self, id, data_aluguel, cliente_id, dvds_ids, data_devolucao, devolvido):
+        self.id = id
+        self.data_aluguel = data_aluguel
+        self.cliente_id = cliente_id
+        self.dvds_ids = dvds_ids
+        self.data_devolucao = data_devolucao
+        self.devolvido = devolvido
+
+
+def listar_todos_antigo():
+    """Carrega os aluguéis como antes: __dict__ por objeto e datas convertidas na hora.
+    
+    Returns:
+        list: Objetos AluguelAntigo.
+    """
+    with DatabaseConfig.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT a.id, a.data_aluguel, a.cliente_id, a.data_devolucao, a.devolvido, ad.dvd_id
+        FROM alugueis a
+        LEFT JOIN aluguel_dvd ad ON ad.aluguel_id = a.id
+        ORDER BY a.data_aluguel DESC, a.id DESC
+        """)
+        
+        alugueis = []
+        atual = None
+        for row in cursor:
+            if atual is None or atual.id != row["id"]:
+                atual = AluguelAntigo(
+                    id=row["id"],
+                    data_aluguel=datetime.fromisoformat(row["data_aluguel"]),
+                    cliente_id=row["cliente_id"],
+                    dvds_ids=[],
+                    data_devolucao=datetime.fromisoformat(row["data_devolucao"]) if row["data_devolucao"] else None,
+                    devolvido=bool(row["devolvido"])
+                )
+                alugueis.append(atual)
+            
+            if row["dvd_id"] is not None:
+                atual.dvds_ids.append(row["dvd_id"])
+    
+    return alugueis
+
+
+def gerar_alugueis(cursor, total, aleatorio):
+    """Insere aluguéis sintéticos com um ou dois DVDs cada.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor do banco temporário.
+        total (int): Quantidade de aluguéis.
+        aleatorio (random.Random): Gerador de números aleatórios.
+    """
+    inicio = datetime(2015, 1, 1)
+    total_dvds = max(1, total // 20)
+    
+    cursor.executemany(
+        "INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel) VALUES (?, '', 2000, 2015, 1)",
+        ((f"Filme {i}",) for i in range(total_dvds))
+    )
+    
+    def linhas():
+        for i in range(total):
+            data = inicio + timedelta(seconds=aleatorio.randrange(10 * 365 * 86400))
+            yield (data.isoformat(), aleatorio.randint(1, 1000), (data + timedelta(days=7)).isoformat())
+    
+    cursor.executemany(
+        "INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido) VALUES (?, ?, ?, 1)",
+        linhas()
+    )
+    cursor.executemany(
+        "INSERT INTO aluguel_dvd (aluguel_id, dvd_id) VALUES (?, ?)",
+        (
+            (aluguel_id, dvd_id)
+            for aluguel_id in range(1, total + 1)
+            for dvd_id in {aleatorio.randint(1, total_dvds) for _ in range(aleatorio.randint(1, 2))}
+        )
+    )
+
+
+def medir(funcao):
+    """Mede o tempo de carregamento e a memória retida pela lista carregada.
+    
+    Args:
+        funcao (callable): Função que carrega e retorna a lista de aluguéis.
+        
+    Returns:
+        tuple: (segundos sem tracemalloc, MB retidos, MB no pico, lista carregada).
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    del resultado
+    
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao()
+    retido, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return duracao, retido / 2 ** 20, pico / 2 ** 20, resultado
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Memória e tempo para carregar todos os aluguéis.")
+    parser.add_argument("--alugueis", type=int, default=1000000, help="Quantidade de aluguéis gerados.")
+    args = parser.parse_args()
+    
+    from database.aluguel_dao import AluguelDAO
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        DatabaseConfig.DB_DIR = diretorio
+        DatabaseConfig.initialize_database()
+        
+        inicio = time.perf_counter()
+        with DatabaseConfig.connection() as conn:
+            gerar_alugueis(conn.cursor(), args.alugueis, random.Random(42))
+        print(f"{args.alugueis} aluguéis gerados em {time.perf_counter() - inicio:.1f}s\n")
+        
+        print(f"{'carregamento':34s} {'tempo (s)':>10s} {'retido (MB)':>12s} {'pico (MB)':>10s}")
+        
+        duracao, retido, pico, alugueis = medir(listar_todos_antigo)
+        print(f"{'antigo (__dict__, datas na hora)':34s} {duracao:10.2f} {retido:12.1f} {pico:10.1f}")
+        del alugueis
+        
+        duracao, retido, pico, alugueis = medir(AluguelDAO.listar_todos)
+        print(f"{'atual (__slots__, datas inteiras)':34s} {duracao:10.2f} {retido:12.1f} {pico:10.1f}")
+        
+        # Custo de, depois de carregar, usar as datas de todos os aluguéis
+        inicio = time.perf_counter()
+        for aluguel in alugueis:
+            aluguel.data_aluguel
+            aluguel.data_devolucao
+        print(f"\nConverter depois as datas de todos os aluguéis: {time.perf_counter() - inicio:.2f}s")
+        del alugueis
+        
+        DatabaseConfig.fechar_pool()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Teste de estresse do mapa de disponibilidade em memória (DVDDAO.disponibilidade).
+
+Várias threads, como as do carregador da interface, alugam (por DVD e por
+título), devolvem, excluem aluguéis e mudam a disponibilidade de DVDs ao
+mesmo tempo. Ao final, o mapa é comparado com a tabela dvds: qualquer
+diferença indica um caminho de gravação que não atualiza o mapa, e o script
+termina com código de saída 1.
+
+Também compara o tempo de conferir uma cesta pelo mapa e por uma consulta
+ao banco.
+
+Uso:
+    python -m scripts.estresse_disponibilidade [--threads 4] [--operacoes 2000] [--dvds 2000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from database.config import DatabaseConfig
+
+
+def preparar_banco(total_dvds, total_clientes):
+    """Popula o banco temporário do teste.
+    
+    Args:
+        total_dvds (int): Quantidade de DVDs (cinco cópias por título).
+        total_clientes (int): Quantidade de clientes.
+    """
+    DatabaseConfig.initialize_database()
+    
+    with DatabaseConfig.connection() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (cpf, nome, telefone, endereco) VALUES (?, ?, ?, ?)",
+            [(f"{i:011d}", f"Cliente {i}", "", "") for i in range(1, total_clientes + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel) VALUES (?, ?, ?, ?, 1)",
+            [(f"Filme {i // 5}", "", 2000, 2020) for i in range(total_dvds)]
+        )
+
+
+def trabalhar(operacoes, total_dvds, total_clientes, semente, abertos, lock_abertos, erros):
+    """Thread que faz operações aleatórias que mudam a disponibilidade.
+    
+    Args:
+        operacoes (int): Quantidade de operações.
+        total_dvds (int): Quantidade de DVDs.
+        total_clientes (int): Quantidade de clientes.
+        semente (int): Semente do gerador aleatório da thread.
+        abertos (list): IDs dos aluguéis em aberto, compartilhada entre as threads.
+        lock_abertos (threading.Lock): Lock da lista de aluguéis em aberto.
+        erros (list): Exceções capturadas, compartilhada entre as threads.
+    """
+    from controllers.aluguel_controller import AluguelController
+    from controllers.dvd_controller import DVDController
+    from database.aluguel_dao import AluguelDAO
+    
+    aleatorio = random.Random(semente)
+    total_titulos = total_dvds // 5
+    
+    for _ in range(operacoes):
+        cliente_id = aleatorio.randint(1, total_clientes)
+        sorteio = aleatorio.random()
+        try:
+            if sorteio < 0.35:
+                dvds_ids = aleatorio.sample(range(1, total_dvds + 1), aleatorio.randint(1, 3))
+                aluguel = AluguelController.registrar_aluguel(cliente_id, dvds_ids)
+            elif sorteio < 0.55:
+                titulos_ids = [aleatorio.randint(1, total_titulos) for _ in range(aleatorio.randint(1, 3))]
+                aluguel = AluguelController.registrar_aluguel_por_titulos(cliente_id, titulos_ids)
+            else:
+                aluguel = None
+            
+            if aluguel:
+                with lock_abertos:
+                    abertos.append(aluguel.id)
+                continue
+            
+            with lock_abertos:
+                aluguel_id = abertos.pop(aleatorio.randrange(len(abertos))) if abertos else None
+            
+            if aluguel_id is None:
+                continue
+            if sorteio < 0.9:
+                AluguelController.registrar_devolucao(aluguel_id)
+            elif sorteio < 0.95:
+                AluguelDAO.excluir(aluguel_id)
+            else:
+                # Retira um DVD qualquer de circulação e devolve o aluguel
+                DVDController.atualizar_disponibilidade(aleatorio.randint(1, total_dvds), False)
+                AluguelController.registrar_devolucao(aluguel_id)
+        except Exception as erro:
+            erros.append(erro)
+
+
+def medir_cestas(total_dvds, quantidade=2000):
+    """Mede o tempo de conferir cestas de 3 DVDs pelo mapa e pelo banco.
+    
+    Args:
+        total_dvds (int): Quantidade de DVDs.
+        quantidade (int, optional): Cestas conferidas. Defaults to 2000.
+        
+    Returns:
+        tuple: (mediana pelo mapa, mediana pelo banco), em microssegundos.
+    """
+    from database.dvd_dao import DVDDAO
+    
+    aleatorio = random.Random(0)
+    cestas = [aleatorio.sample(range(1, total_dvds + 1), 3) for _ in range(quantidade)]
+    
+    pelo_mapa = []
+    for cesta in cestas:
+        inicio = time.perf_counter()
+        DVDDAO.disponibilidade.indisponiveis(cesta)
+        pelo_mapa.append((time.perf_counter() - inicio) * 1e6)
+    
+    pelo_banco = []
+    for cesta in cestas:
+        inicio = time.perf_counter()
+        with DatabaseConfig.connection() as conn:
+            conn.execute("SELECT id FROM dvds WHERE disponivel = 1 AND id IN (?, ?, ?)", cesta).fetchall()
+        pelo_banco.append((time.perf_counter() - inicio) * 1e6)
+    
+    return statistics.median(pelo_mapa), statistics.median(pelo_banco)
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Estresse do mapa de disponibilidade em memória.")
+    parser.add_argument("--threads", type=int, default=4, help="Threads gravando ao mesmo tempo.")
+    parser.add_argument("--operacoes", type=int, default=2000, help="Operações por thread.")
+    parser.add_argument("--dvds", type=int, default=2000, help="Quantidade de DVDs.")
+    parser.add_argument("--clientes", type=int, default=100, help="Quantidade de clientes.")
+    args = parser.parse_args()
+    
+    from controllers.dvd_controller import DVDController
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        DatabaseConfig.DB_DIR = diretorio
+        DatabaseConfig.fechar_pool()
+        
+        try:
+            preparar_banco(args.dvds, args.clientes)
+            DVDController.carregar_disponibilidade()
+            
+            abertos = []
+            lock_abertos = threading.Lock()
+            erros = []
+            threads = [
+                threading.Thread(target=trabalhar, args=(
+                    args.operacoes, args.dvds, args.clientes, semente, abertos, lock_abertos, erros
+                ))
+                for semente in range(args.threads)
+            ]
+            
+            inicio = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            duracao = time.perf_counter() - inicio
+            
+            so_no_mapa, so_no_banco = DVDController.verificar_disponibilidade()
+            mediana_mapa, mediana_banco = medir_cestas(args.dvds)
+        finally:
+            DatabaseConfig.fechar_pool()
+    
+    total = args.threads * args.operacoes
+    print(f"{args.threads} threads, {total} operações em {duracao:.1f}s ({len(erros)} erros)")
+    print(f"  disponíveis só no mapa: {len(so_no_mapa)} | só no banco: {len(so_no_banco)}")
+    print(f"  cesta de 3 DVDs: {mediana_mapa:.1f} µs pelo mapa, {mediana_banco:.1f} µs pelo banco (mediana)")
+    
+    if so_no_mapa or so_no_banco or erros:
+        print("\nFALHA: o mapa de disponibilidade não bate com a tabela dvds.")
+        return 1
+    
+    print("\nO mapa de disponibilidade confere com a tabela dvds.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Teste de estresse da reserva de DVDs com vários terminais alugando ao mesmo tempo.
+
+Vários processos disputam os mesmos DVDs chamando AluguelController.registrar_aluguel
+sem nunca devolvê-los. Ao final, cada DVD deve aparecer em no máximo um aluguel
+e a flag disponivel deve bater com os aluguéis gravados; caso contrário o script
+termina com código de saída 1.
+
+Uso:
+    python -m scripts.estresse_reservas [--processos 8] [--pedidos 2000] [--dvds 500]
+
+Com --sem-reserva, os processos usam a verificação antiga (lê a disponibilidade
+e só depois grava, em transações separadas), o que permite ver o teste falhar.
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.config import DatabaseConfig
+
+
+def configurar_processo(diretorio):
+    """Aponta o DatabaseConfig deste processo para o banco do teste.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+    """
+    DatabaseConfig.DB_DIR = diretorio
+    DatabaseConfig.POOL_SIZE = 1
+    DatabaseConfig.fechar_pool()
+
+
+def preparar_banco(diretorio, total_dvds, total_clientes):
+    """Cria e popula o banco temporário do teste.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        total_dvds (int): Quantidade de DVDs disputados.
+        total_clientes (int): Quantidade de clientes.
+    """
+    configurar_processo(diretorio)
+    DatabaseConfig.initialize_database()
+    
+    with DatabaseConfig.connection() as conn:
+        conn.executemany(
+            "INSERT INTO clientes (cpf, nome, telefone, endereco) VALUES (?, ?, ?, ?)",
+            [(f"{i:011d}", f"Cliente {i}", "", "") for i in range(1, total_clientes + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO dvds (nome, sinopse, ano_lancamento, ano_aquisicao, disponivel) VALUES (?, ?, ?, ?, 1)",
+            [(f"Filme {i}", "", 2000, 2020) for i in range(1, total_dvds + 1)]
+        )
+    
+    DatabaseConfig.fechar_pool()
+
+
+def alugar_sem_reserva(cliente_id, dvds_ids):
+    """Reproduz o fluxo antigo: lê a disponibilidade e grava em outra transação.
+    
+    Args:
+        cliente_id (int): ID do cliente.
+        dvds_ids (list): IDs dos DVDs.
+        
+    Returns:
+        int: ID do aluguel gravado ou None se algum DVD parecia indisponível.
+    """
+    from database.dvd_dao import DVDDAO
+    
+    for dvd_id in dvds_ids:
+        dvd = DVDDAO.buscar_por_id(dvd_id)
+        if not dvd or not dvd.disponivel:
+            return None
+    
+    with DatabaseConfig.connection() as conn:
+        cursor = conn.cursor()
+        agora = datetime.now()
+        cursor.execute(
+            "INSERT INTO alugueis (data_aluguel, cliente_id, data_devolucao, devolvido) VALUES (?, ?, ?, 0)",
+            (agora.isoformat(), cliente_id, (agora + timedelta(days=7)).isoformat())
+        )
+        aluguel_id = cursor.lastrowid
+        for dvd_id in dvds_ids:
+            cursor.execute("INSERT INTO aluguel_dvd (aluguel_id, dvd_id) VALUES (?, ?)", (aluguel_id, dvd_id))
+            cursor.execute("UPDATE dvds SET disponivel = 0 WHERE id = ?", (dvd_id,))
+    
+    return aluguel_id
+
+
+def terminal(diretorio, pedidos, total_dvds, total_clientes, sem_reserva, semente, fila):
+    """Processo que simula um terminal alugando DVDs sem parar.
+    
+    Args:
+        diretorio (str): Diretório do banco temporário.
+        pedidos (int): Quantidade de pedidos de aluguel a fazer.
+        total_dvds (int): Quantidade de DVDs existentes.
+        total_clientes (int): Quantidade de clientes existentes.
+        sem_reserva (bool): Usa o fluxo antigo, sem reserva atômica.
+        semente (int): Semente do gerador aleatório deste processo.
+        fila (multiprocessing.Queue): Fila para devolver o resultado.
+    """
+    from controllers.aluguel_controller import AluguelController
+    
+    configurar_processo(diretorio)
+    aleatorio = random.Random(semente)
+    aceitos = recusados = erros = 0
+    
+    for _ in range(pedidos):
+        cliente_id = aleatorio.randint(1, total_clientes)
+        dvds_ids = aleatorio.sample(range(1, total_dvds + 1), aleatorio.randint(1, 3))
+        try:
+            if sem_reserva:
+                sucesso = alugar_sem_reserva(cliente_id, dvds_ids) is not None
+            else:
+                sucesso = AluguelController.registrar_aluguel(cliente_id, dvds_ids) is not None
+        except Exception:
+            erros += 1
+            continue
+        
+        if sucesso:
+            aceitos += 1
+        else:
+            recusados += 1
+    
+    DatabaseConfig.fechar_pool()
+    fila.put((aceitos, recusados, erros))
+
+
+def verificar_consistencia(cursor):
+    """Procura DVDs alugados mais de uma vez ou com disponibilidade incoerente.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor do banco do teste.
+        
+    Returns:
+        tuple: (DVDs em mais de um aluguel, DVDs cuja flag disponivel não bate com os aluguéis).
+    """
+    cursor.execute("""
+    SELECT dvd_id
+    FROM aluguel_dvd
+    GROUP BY dvd_id
+    HAVING COUNT(*) > 1
+    """)
+    duplicados = [row["dvd_id"] for row in cursor.fetchall()]
+    
+    cursor.execute("""
+    SELECT d.id
+    FROM dvds d
+    WHERE d.disponivel = EXISTS (SELECT 1 FROM aluguel_dvd ad WHERE ad.dvd_id = d.id)
+    """)
+    incoerentes = [row["id"] for row in cursor.fetchall()]
+    
+    return duplicados, incoerentes
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Estresse da reserva atômica de DVDs.")
+    parser.add_argument("--processos", type=int, default=8, help="Terminais simultâneos.")
+    parser.add_argument("--pedidos", type=int, default=2000, help="Pedidos de aluguel por terminal.")
+    parser.add_argument("--dvds", type=int, default=500, help="Quantidade de DVDs disputados.")
+    parser.add_argument("--clientes", type=int, default=100, help="Quantidade de clientes.")
+    parser.add_argument("--sem-reserva", action="store_true", help="Usa o fluxo antigo de ler e depois gravar.")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as diretorio:
+        preparar_banco(diretorio, args.dvds, args.clientes)
+        
+        fila = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(target=terminal, args=(
+                diretorio, args.pedidos, args.dvds, args.clientes, args.sem_reserva, semente, fila
+            ))
+            for semente in range(args.processos)
+        ]
+        
+        inicio = time.perf_counter()
+        for processo in processos:
+            processo.start()
+        resultados = [fila.get() for _ in processos]
+        for processo in processos:
+            processo.join()
+        duracao = time.perf_counter() - inicio
+        
+        configurar_processo(diretorio)
+        with DatabaseConfig.connection() as conn:
+            duplicados, incoerentes = verificar_consistencia(conn.cursor())
+        DatabaseConfig.fechar_pool()
+    
+    aceitos = sum(r[0] for r in resultados)
+    recusados = sum(r[1] for r in resultados)
+    erros = sum(r[2] for r in resultados)
+    total = args.processos * args.pedidos
+    
+    print(f"{args.processos} terminais, {total} pedidos em {duracao:.1f}s ({total / duracao:.0f} pedidos/s)")
+    print(f"  aceitos: {aceitos} | recusados: {recusados} | erros: {erros}")
+    print(f"  DVDs alugados mais de uma vez: {len(duplicados)}")
+    print(f"  DVDs com disponibilidade incoerente: {len(incoerentes)}")
+    
+    if duplicados or incoerentes or erros:
+        print("\nFALHA: a reserva de DVDs não foi consistente.")
+        return 1
+    
+    print("\nNenhum DVD foi alugado duas vezes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
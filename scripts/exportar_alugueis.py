@@ -0,0 +1,76 @@
+"""Exporta todos os aluguéis para um arquivo CSV.
+
+Os aluguéis são lidos com AluguelDAO.iter_todos e gravados um a um, então
+a memória usada não depende do tamanho da tabela.
+
+Uso:
+    python -m scripts.exportar_alugueis alugueis.csv [--lote 1000] [--banco database/locadora.db]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+from database.config import DatabaseConfig
+
+COLUNAS = ("id", "data_aluguel", "cliente_id", "data_devolucao", "devolvido", "dvds_ids")
+
+
+def exportar(arquivo, tamanho_lote=1000):
+    """Grava os aluguéis em CSV, do mais recente para o mais antigo.
+    
+    Args:
+        arquivo (file): Arquivo de texto aberto para escrita (com newline="").
+        tamanho_lote (int, optional): Linhas lidas do banco por vez. Defaults to 1000.
+        
+    Returns:
+        int: Quantidade de aluguéis exportados.
+    """
+    from database.aluguel_dao import AluguelDAO
+    
+    escritor = csv.writer(arquivo)
+    escritor.writerow(COLUNAS)
+    
+    total = 0
+    for aluguel in AluguelDAO.iter_todos(tamanho_lote):
+        escritor.writerow((
+            aluguel.id,
+            aluguel.data_aluguel_iso,
+            aluguel.cliente_id,
+            aluguel.data_devolucao_iso or "",
+            1 if aluguel.devolvido else 0,
+            " ".join(map(str, aluguel.dvds_ids))
+        ))
+        total += 1
+    
+    return total
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Exporta todos os aluguéis para CSV.")
+    parser.add_argument("saida", help="Arquivo CSV a gravar.")
+    parser.add_argument("--lote", type=int, default=1000, help="Linhas lidas do banco por vez.")
+    parser.add_argument("--banco", help="Arquivo SQLite a usar (padrão: banco da aplicação).")
+    args = parser.parse_args()
+    
+    if args.banco:
+        DatabaseConfig.DB_DIR, DatabaseConfig.DB_FILE = os.path.split(os.path.abspath(args.banco))
+    
+    try:
+        DatabaseConfig.initialize_database()
+        
+        inicio = time.perf_counter()
+        with open(args.saida, "w", newline="", encoding="utf-8") as arquivo:
+            total = exportar(arquivo, args.lote)
+        duracao = time.perf_counter() - inicio
+    finally:
+        DatabaseConfig.fechar_pool()
+    
+    print(f"{total} aluguéis exportados para {args.saida} em {duracao:.2f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Aplica (ou apenas lista) as migrações de esquema pendentes.
+
+Uso:
+    python -m scripts.migrar [--dry-run] [--banco database/locadora.db]
+"""
+import argparse
+import os
+import sys
+
+from database import migracoes
+from database.config import DatabaseConfig
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Aplica as migrações de esquema pendentes.")
+    parser.add_argument("--banco", help="Arquivo SQLite a migrar (padrão: banco da aplicação).")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas lista as migrações pendentes.")
+    args = parser.parse_args()
+    
+    if args.banco:
+        DatabaseConfig.DB_DIR, DatabaseConfig.DB_FILE = os.path.split(os.path.abspath(args.banco))
+    
+    try:
+        with DatabaseConfig.connection() as conn:
+            print(f"Versão atual do esquema: {migracoes.versao_atual(conn)}")
+            resultado = migracoes.migrar(conn, dry_run=args.dry_run)
+            versao_final = migracoes.versao_atual(conn)
+    finally:
+        DatabaseConfig.fechar_pool()
+    
+    if not resultado:
+        print("Nenhuma migração pendente.")
+        return 0
+    
+    acao = "Pendente" if args.dry_run else "Aplicada"
+    for versao, descricao in resultado:
+        print(f"  {acao}: {versao:04d} - {descricao}")
+    
+    print(f"Versão final do esquema: {versao_final}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
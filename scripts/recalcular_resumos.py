@@ -0,0 +1,105 @@
+"""Reconstrói (ou apenas confere) as tabelas de resumo do dashboard.
+
+As tabelas resumo_dvd, resumo_titulo, resumo_cliente e resumo_diario são
+mantidas por gatilhos a cada aluguel gravado ou excluído. Este script as
+recalcula do zero, o que só é necessário se o banco foi alterado com os
+gatilhos desativados.
+
+Uso:
+    python -m scripts.recalcular_resumos [--verificar] [--banco database/locadora.db]
+
+Com --verificar, nada é gravado: o script compara os resumos com os aluguéis
+e termina com código de saída 1 se encontrar divergências.
+"""
+import argparse
+import os
+import sys
+import time
+
+from database.config import DatabaseConfig
+from database.dashboard_dao import RESUMOS, DashboardDAO
+
+# Colunas com valores em reais, comparadas arredondadas aos centavos
+VALORES_EM_REAIS = ("receita", "multas")
+
+
+def consultas_comparadas(tabela, colunas, consulta):
+    """Monta as consultas que leem um resumo e o conteúdo esperado dele.
+    
+    Args:
+        tabela (str): Nome da tabela de resumo.
+        colunas (tuple): Colunas da tabela.
+        consulta (str): Consulta que calcula o conteúdo esperado (de DashboardDAO).
+        
+    Returns:
+        tuple: (consulta sobre a tabela, consulta do conteúdo esperado).
+    """
+    selecionadas = ", ".join(
+        f"round({coluna}, 2)" if coluna in VALORES_EM_REAIS else coluna for coluna in colunas
+    )
+    return f"SELECT {selecionadas} FROM {tabela}", f"SELECT {selecionadas} FROM ({consulta})"
+
+
+def divergencias(cursor):
+    """Conta as linhas de cada resumo que não batem com os aluguéis.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor do banco a verificar.
+        
+    Returns:
+        dict: Linhas faltando ou sobrando em cada tabela de resumo.
+    """
+    resultado = {}
+    for tabela, (colunas, consulta) in RESUMOS.items():
+        atual, esperado = consultas_comparadas(tabela, colunas, consulta)
+        cursor.execute(f"""
+        SELECT
+            (SELECT COUNT(*) FROM ({esperado} EXCEPT {atual})),
+            (SELECT COUNT(*) FROM ({atual} EXCEPT {esperado}))
+        """)
+        faltando, sobrando = cursor.fetchone()
+        resultado[tabela] = faltando + sobrando
+    return resultado
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Reconstrói as tabelas de resumo do dashboard.")
+    parser.add_argument("--banco", help="Arquivo SQLite a usar (padrão: banco da aplicação).")
+    parser.add_argument("--verificar", action="store_true", help="Apenas compara os resumos com os aluguéis.")
+    args = parser.parse_args()
+    
+    if args.banco:
+        DatabaseConfig.DB_DIR, DatabaseConfig.DB_FILE = os.path.split(os.path.abspath(args.banco))
+    
+    try:
+        DatabaseConfig.initialize_database()
+        
+        if args.verificar:
+            with DatabaseConfig.connection() as conn:
+                resultado = divergencias(conn.cursor())
+            
+            for tabela, total in resultado.items():
+                print(f"  {tabela}: {total} linha(s) divergente(s)")
+            
+            if any(resultado.values()):
+                print("\nOs resumos estão desatualizados; rode o script sem --verificar.")
+                return 1
+            
+            print("\nOs resumos conferem com os aluguéis.")
+            return 0
+        
+        inicio = time.perf_counter()
+        linhas = DashboardDAO.recalcular_resumos()
+        duracao = time.perf_counter() - inicio
+    finally:
+        DatabaseConfig.fechar_pool()
+    
+    for tabela, total in linhas.items():
+        print(f"  {tabela}: {total} linha(s)")
+    print(f"\nResumos reconstruídos em {duracao:.2f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Relatório de aluguéis de um período, calculado sobre o retrato em colunas.
+
+Carrega todos os aluguéis em um RetratoAlugueis e mostra os filmes e
+clientes com mais aluguéis, o faturamento mês a mês e os aluguéis em
+atraso, além do tempo e da memória gastos com o retrato.
+
+Uso:
+    python -m scripts.relatorio_alugueis [--inicio 2024-01-01] [--fim 2025-01-01] [--limite 10] [--banco database/locadora.db]
+
+Sem --inicio e --fim, o período é o ano atual.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from database.config import DatabaseConfig
+
+
+def data(texto):
+    """Converte um argumento AAAA-MM-DD em datetime.
+    
+    Args:
+        texto (str): Data informada na linha de comando.
+        
+    Returns:
+        datetime: Data convertida.
+    """
+    return datetime.strptime(texto, "%Y-%m-%d")
+
+
+def main():
+    """Função principal do script."""
+    hoje = datetime.now()
+    
+    parser = argparse.ArgumentParser(description="Relatório de aluguéis de um período.")
+    parser.add_argument("--inicio", type=data, default=datetime(hoje.year, 1, 1), help="Início do período (inclusivo).")
+    parser.add_argument("--fim", type=data, default=datetime(hoje.year + 1, 1, 1), help="Fim do período (exclusivo).")
+    parser.add_argument("--limite", type=int, default=10, help="Tamanho dos rankings.")
+    parser.add_argument("--banco", help="Arquivo SQLite a usar (padrão: banco da aplicação).")
+    args = parser.parse_args()
+    
+    if args.banco:
+        DatabaseConfig.DB_DIR, DatabaseConfig.DB_FILE = os.path.split(os.path.abspath(args.banco))
+    
+    from database.cliente_dao import ClienteDAO
+    from database.dvd_dao import DVDDAO
+    from database.retrato_alugueis import RetratoAlugueis
+    
+    try:
+        DatabaseConfig.initialize_database()
+        
+        inicio = time.perf_counter()
+        retrato = RetratoAlugueis.carregar()
+        duracao = time.perf_counter() - inicio
+        print(f"{len(retrato)} aluguéis carregados em {duracao:.2f}s "
+              f"({retrato.tamanho_em_bytes() / 2 ** 20:.1f} MB em colunas)")
+        print(f"Período: {args.inicio:%d/%m/%Y} a {args.fim:%d/%m/%Y} (exclusivo)\n")
+        
+        inicio = time.perf_counter()
+        filmes = retrato.filmes_mais_alugados(args.limite, args.inicio, args.fim)
+        clientes = retrato.clientes_mais_alugam(args.limite, args.inicio, args.fim)
+        faturamento = retrato.faturamento_mensal(args.inicio, args.fim)
+        atrasados = retrato.alugueis_em_atraso(hoje)
+        duracao = time.perf_counter() - inicio
+        
+        print("Filmes mais alugados:")
+        for dvd_id, total in filmes:
+            dvd = DVDDAO.buscar_por_id(dvd_id)
+            print(f"  {total:6d}  {dvd.nome if dvd else f'DVD #{dvd_id}'}")
+        
+        print("\nClientes que mais alugam:")
+        for cliente_id, total in clientes:
+            cliente = ClienteDAO.buscar_por_id(cliente_id)
+            print(f"  {total:6d}  {cliente.nome if cliente else f'Cliente #{cliente_id}'}")
+        
+        print(f"\n{'mês':8s} {'aluguéis':>9s} {'DVDs':>7s} {'receita (R$)':>13s} {'multas (R$)':>12s}")
+        for mes, alugueis, dvds, receita, multas in faturamento:
+            print(f"{mes:8s} {alugueis:9d} {dvds:7d} {receita:13.2f} {multas:12.2f}")
+        
+        print(f"\nAluguéis em atraso hoje: {atrasados}")
+        print(f"Relatório calculado em {duracao * 1000:.1f} ms")
+    finally:
+        DatabaseConfig.fechar_pool()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Verifica os planos de execução das consultas mais frequentes da aplicação.
+
+Roda EXPLAIN QUERY PLAN sobre as consultas dos DAOs e do dashboard e termina
+com código de saída 1 se alguma delas varrer uma tabela inteira sem índice.
+
+Uso:
+    python -m scripts.verificar_planos [--banco database/locadora.db]
+
+Sem --banco, a verificação é feita em um banco temporário recém-criado.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from database import aluguel_dao, cliente_dao, dashboard_dao, dvd_dao, titulo_dao
+from database.aluguel_dao import AluguelDAO
+from database.cliente_dao import ClienteDAO
+from database.config import DatabaseConfig
+from database.dvd_dao import DVDDAO
+from database.migracoes import m0010_titulos
+
+# Subconsulta que escolhe os aluguéis de uma página de AluguelDAO.listar_pagina
+_ORIGEM_PAGINA, _PARAMETROS_PAGINA = AluguelDAO._origem_pagina(("9999", 0), 200)
+
+# (descrição, consulta, parâmetros), montadas com as mesmas constantes e
+# funções que os DAOs executam; os parâmetros só precisam ter o tipo certo.
+# Buscas por substring (LIKE '%texto%') ficam de fora: nenhum índice B-tree as atende.
+CONSULTAS = [
+    ("DVDDAO.buscar_por_id", dvd_dao.CONSULTA_POR_ID, (1,)),
+    ("DVDDAO.listar_todos", dvd_dao.CONSULTA_TODOS, ()),
+    ("DVDDAO.listar_pagina", *DVDDAO._consulta_pagina(("", 0), 200)),
+    ("DVDDAO.listar_disponiveis", dvd_dao.CONSULTA_DISPONIVEIS, ()),
+    ("DVDDAO.indexar_palavras_pendentes", dvd_dao.CONSULTA_HA_PENDENTES, ()),
+    ("DVDDAO._gravar_palavras", dvd_dao.CONSULTA_PALAVRAS_SEM_TRIGRAMAS, ()),
+    ("DVDDAO._palavras_parecidas", *DVDDAO._consulta_palavras_parecidas("frz", 0.25)),
+    ("DVDDAO.buscar_aproximado", dvd_dao.CONSULTA_DVDS_DA_PALAVRA, ("frozen", 2, 28, dvd_dao.DVDS_POR_PALAVRA)),
+    ("TituloDAO.buscar_por_id", titulo_dao.CONSULTA_POR_ID, (1,)),
+    ("TituloDAO.copias_disponiveis", titulo_dao.CONSULTA_COPIAS_DISPONIVEIS, (1,)),
+    ("TituloDAO.listar_todos", titulo_dao.CONSULTA_TODOS, ()),
+    ("TituloDAO.listar_disponiveis", titulo_dao.CONSULTA_DISPONIVEIS, ()),
+    ("gatilhos titulos_dvds_*_ligar",
+     m0010_titulos.TITULO_DO_DVD.format(nome="?", ano="?"), ("Matrix", 1999)),
+    ("ClienteDAO.buscar_por_id", cliente_dao.CONSULTA_POR_ID, (1,)),
+    ("ClienteDAO.buscar_por_cpf", cliente_dao.CONSULTA_POR_CPF, ("00000000000",)),
+    ("ClienteDAO.listar_todos", cliente_dao.CONSULTA_TODOS, ()),
+    ("ClienteDAO.listar_pagina", *ClienteDAO._consulta_pagina(("", 0), 200)),
+    ("ClienteDAO.buscar_por_prefixo (CPF)", cliente_dao.CONSULTA_POR_PREFIXO_CPF, ("123", "123:", 50)),
+    ("ClienteDAO.indexar_nomes_pendentes", cliente_dao.CONSULTA_HA_PENDENTES, ()),
+    ("ClienteDAO._termos_por_seletividade",
+     cliente_dao.CONSULTA_CONTAGEM_TERMO, ("ana", "ana" + cliente_dao.FIM_PREFIXO, cliente_dao.LIMITE_VARREDURA)),
+    ("ClienteDAO.buscar_por_nome", *ClienteDAO._consulta_por_nome(["silva", "jo"])),
+    ("ClienteDAO.pesquisar", *ClienteDAO._consulta_pesquisa(["silva", "jo"], "jo silva", 50)),
+    ("AluguelDAO.excluir", aluguel_dao.CONSULTA_DVDS_DO_ALUGUEL, (1,)),
+    ("AluguelDAO._reservar_copias", aluguel_dao.CONSULTA_COPIAS_LIVRES, (1, 2)),
+    ("AluguelDAO.buscar_por_id", AluguelDAO._consulta_com_dvds(aluguel_dao.FILTRO_POR_ID), (1,)),
+    ("AluguelDAO.registrar_devolucao", AluguelDAO._consulta_com_dvds(aluguel_dao.FILTRO_EM_ABERTO), (1,)),
+    ("AluguelDAO.listar_todos", AluguelDAO._consulta_com_dvds(), ()),
+    ("AluguelDAO.listar_pagina", AluguelDAO._consulta_com_dvds(origem=_ORIGEM_PAGINA), _PARAMETROS_PAGINA),
+    ("AluguelDAO.listar_por_cliente", AluguelDAO._consulta_com_dvds(aluguel_dao.FILTRO_POR_CLIENTE), (1,)),
+    ("AluguelDAO.listar_alugueis_em_atraso",
+     AluguelDAO._consulta_com_dvds(aluguel_dao.FILTRO_EM_ATRASO, aluguel_dao.ORDEM_EM_ATRASO), ("2000-01-01",)),
+    ("AluguelDAO.listar_para_exibicao", *AluguelDAO._consulta_exibicao()),
+    ("AluguelDAO.listar_para_exibicao (página)", *AluguelDAO._consulta_exibicao(apos=("9999", 0), limite=200)),
+    ("DashboardDAO.estatisticas_gerais", dashboard_dao.CONSULTA_ESTATISTICAS, ("2000-01-01",)),
+    ("DashboardDAO.filmes_mais_alugados", dashboard_dao.CONSULTA_FILMES_MAIS_ALUGADOS, (10,)),
+    ("DashboardDAO.clientes_mais_alugam", dashboard_dao.CONSULTA_CLIENTES_MAIS_ALUGAM, (10,)),
+] + [
+    (f"DashboardDAO.faturamento_agrupado ({agrupamento})",
+     dashboard_dao.CONSULTA_FATURAMENTO.format(expressao=expressao), ("2000-01-01", "2000-04-01"))
+    for agrupamento, expressao in dashboard_dao.AGRUPAMENTOS_FATURAMENTO.items()
+]
+
+
+def varredura_sem_indice(detalhe, subconsultas=()):
+    """Indica se um passo do plano percorre uma tabela inteira sem índice.
+    
+    Args:
+        detalhe (str): Texto de um passo do EXPLAIN QUERY PLAN.
+        subconsultas (iterable, optional): Nomes de subconsultas do mesmo plano
+            (CO-ROUTINE ou MATERIALIZE), cuja leitura não é uma varredura de tabela.
+            Defaults to ().
+            
+    Returns:
+        bool: True se o passo é um SCAN sem índice.
+    """
+    # "SCAN CONSTANT ROW" é a linha única de um SELECT sem FROM, não uma tabela
+    if not detalhe.startswith("SCAN ") or " USING " in detalhe or detalhe == "SCAN CONSTANT ROW":
+        return False
+    return detalhe.split()[1] not in subconsultas
+
+
+def verificar(cursor):
+    """Verifica o plano de todas as consultas de CONSULTAS.
+    
+    Args:
+        cursor (sqlite3.Cursor): Cursor do banco a ser verificado.
+        
+    Returns:
+        list: Descrições das consultas que fazem varredura sem índice.
+    """
+    falhas = []
+    
+    for descricao, consulta, parametros in CONSULTAS:
+        cursor.execute("EXPLAIN QUERY PLAN " + consulta, parametros)
+        passos = [row["detail"] for row in cursor.fetchall()]
+        
+        subconsultas = {passo.split()[1] for passo in passos if passo.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+        ruins = [passo for passo in passos if varredura_sem_indice(passo, subconsultas)]
+        print(f"[{'FALHA' if ruins else 'ok'}] {descricao}")
+        for passo in passos:
+            print(f"        {passo}")
+        
+        if ruins:
+            falhas.append(descricao)
+    
+    return falhas
+
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(description="Verifica os planos das consultas frequentes.")
+    parser.add_argument("--banco", help="Arquivo SQLite a verificar (padrão: banco temporário novo).")
+    args = parser.parse_args()
+    
+    temporario = None
+    if args.banco:
+        DatabaseConfig.DB_DIR, DatabaseConfig.DB_FILE = os.path.split(os.path.abspath(args.banco))
+    else:
+        temporario = tempfile.TemporaryDirectory()
+        DatabaseConfig.DB_DIR = temporario.name
+    
+    try:
+        DatabaseConfig.initialize_database()
+        
+        with DatabaseConfig.connection() as conn:
+            falhas = verificar(conn.cursor())
+    finally:
+        DatabaseConfig.fechar_pool()
+        if temporario:
+            temporario.cleanup()
+    
+    if falhas:
+        print(f"\n{len(falhas)} consulta(s) fazem varredura completa sem índice.")
+        return 1
+    
+    print("\nTodas as consultas usam índice.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -90,7 +90,7 @@ def criar_dvds_basicos():
             ('Coco', 'Menino no mundo dos mortos', 2017, 2021)
         ]
         
-        # Duplicar filmes para ter mais exemplares
+        # Três cópias de cada filme; os gatilhos de dvds as reúnem no mesmo título
         for _ in range(3):
             for nome, sinopse, ano_lancamento, ano_aquisicao in filmes:
                 try:
@@ -118,37 +118,38 @@ def simular_alugueis(clientes, meses=2):
         # Simula entre 5 a 15 aluguéis por dia
         num_alugueis_dia = random.randint(5, 15)
         
+        pedidos = []
         for _ in range(num_alugueis_dia):
-            try:
-                # Seleciona cliente aleatório
-                cliente = random.choice(clientes)
-                
-                # Seleciona 1-3 DVDs aleatórios
-                num_dvds = random.randint(1, 3)
-                dvds_selecionados = random.sample(dvds, min(num_dvds, len(dvds)))
-                dvd_ids = [dvd.id for dvd in dvds_selecionados]
-                
-                # Cria aluguel (dias_para_devolucao entre 3 e 10 dias)
-                dias_devolucao = random.randint(3, 10)
-                aluguel = AluguelController.registrar_aluguel(
-                    cliente.id, 
-                    dvd_ids, 
-                    dias_devolucao
-                )
+            # Seleciona cliente aleatório
+            cliente = random.choice(clientes)
+            
+            # Seleciona 1-3 DVDs aleatórios
+            num_dvds = random.randint(1, 3)
+            dvds_selecionados = random.sample(dvds, min(num_dvds, len(dvds)))
+            dvd_ids = [dvd.id for dvd in dvds_selecionados]
+            
+            # Cria aluguel (dias_para_devolucao entre 3 e 10 dias)
+            dias_devolucao = random.randint(3, 10)
+            pedidos.append((cliente.id, dvd_ids, dias_devolucao))
+        
+        try:
+            # Registra todos os aluguéis do dia em uma única transação
+            alugueis = AluguelController.registrar_alugueis_em_lote(pedidos)
+        except Exception as e:
+            print(f"Erro ao criar aluguéis: {e}")
+            alugueis = []
+        
+        for aluguel in alugueis:
+            if aluguel:
+                total_alugueis += 1
                 
-                if aluguel:
-                    total_alugueis += 1
+                # 70% de chance de devolver o DVD (simula devoluções)
+                if random.random() < 0.7:
+                    dias_para_devolucao = random.randint(1, 7)
+                    data_devolucao = data_atual + timedelta(days=dias_para_devolucao)
                     
-                    # 70% de chance de devolver o DVD (simula devoluções)
-                    if random.random() < 0.7:
-                        dias_para_devolucao = random.randint(1, 7)
-                        data_devolucao = data_atual + timedelta(days=dias_para_devolucao)
-                        
-                        if data_devolucao <= datetime.now():
-                            AluguelController.registrar_devolucao(aluguel.id)
-                            
-            except Exception as e:
-                print(f"Erro ao criar aluguel: {e}")
+                    if data_devolucao <= datetime.now():
+                        AluguelController.registrar_devolucao(aluguel.id)
         
         if (dia + 1) % 10 == 0:
             print(f"  {dia + 1} dias simulados... ({total_alugueis} aluguéis)")
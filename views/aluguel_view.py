@@ -1,23 +1,36 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QPushButton, QTableView, QAbstractItemView, QHeaderView,
                              QMessageBox, QFormLayout, QGroupBox, QDateEdit, QComboBox,
                              QListWidget, QListWidgetItem, QSplitter, QSpinBox)
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QIcon
+from collections import Counter
 from datetime import datetime, timedelta
 
 from controllers.aluguel_controller import AluguelController
 from controllers.cliente_controller import ClienteController
 from controllers.dvd_controller import DVDController
+from views.modelos_tabela import ModeloTabela
 
 class AluguelView(QWidget):
     """Interface para gerenciamento de aluguéis."""
     
-    def __init__(self):
+    # Canais de leitura do carregador, cancelados quando a aba sai de foco
+    CANAIS_LEITURA = ("alugueis.lista", "alugueis.clientes", "alugueis.dvds")
+    
+    # Aluguéis buscados por vez ao rolar a lista
+    TAMANHO_PAGINA = 200
+    
+    def __init__(self, carregador):
+        """Inicializa a view.
+        
+        Args:
+            carregador (Carregador): Executor das chamadas ao banco em segundo plano.
+        """
         super().__init__()
         
+        self.carregador = carregador
         self.init_ui()
-        self.carregar_alugueis()
     
     def init_ui(self):
         """Inicializa a interface do usuário."""
@@ -37,7 +50,6 @@ class AluguelView(QWidget):
         
         # Campos de entrada
         self.cliente_combo = QComboBox()
-        self.atualizar_combo_clientes()
         
         self.data_aluguel_input = QDateEdit()
         self.data_aluguel_input.setDate(QDate.currentDate())
@@ -55,9 +67,9 @@ class AluguelView(QWidget):
         # Atualiza a data de devolução quando o número de dias muda
         self.dias_devolucao_input.valueChanged.connect(self.atualizar_data_devolucao)
         
-        # Lista de DVDs disponíveis
+        # Títulos com cópias disponíveis (qualquer cópia livre é alugada)
         self.dvd_combo = QComboBox()
-        self.atualizar_combo_dvds()
+        self._titulos = {}
         
         self.adicionar_dvd_btn = QPushButton("Adicionar DVD")
         self.adicionar_dvd_btn.setIcon(self.style().standardIcon(self.style().SP_ArrowRight))
@@ -75,7 +87,7 @@ class AluguelView(QWidget):
         form_layout.addRow("Data de Aluguel:", self.data_aluguel_input)
         form_layout.addRow("Dias para Devolução:", self.dias_devolucao_input)
         form_layout.addRow("Data de Devolução:", self.data_devolucao_input)
-        form_layout.addRow("DVD:", dvd_layout)
+        form_layout.addRow("Título:", dvd_layout)
         form_layout.addRow("DVDs Selecionados:", self.dvds_selecionados_list)
         form_layout.addRow("", self.remover_dvd_btn)
         
@@ -116,9 +128,16 @@ class AluguelView(QWidget):
         filtro_layout.addWidget(self.limpar_filtro_btn)
         
         # Tabela de aluguéis
-        self.tabela_alugueis = QTableWidget()
-        self.tabela_alugueis.setColumnCount(6)
-        self.tabela_alugueis.setHorizontalHeaderLabels(["ID", "Data Aluguel", "Cliente", "DVDs", "Data Devolução", "Status"])
+        self.modelo_alugueis = ModeloTabela(
+            ["ID", "Data Aluguel", "Cliente", "DVDs", "Data Devolução", "Status"],
+            estilo_linha=self.estilo_aluguel,
+            carregar_mais=self.carregar_proxima_pagina
+        )
+        self._filtro_cliente = None
+        self._ultima_chave = None
+        self.tabela_alugueis = QTableView()
+        self.tabela_alugueis.setModel(self.modelo_alugueis)
+        self.tabela_alugueis.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tabela_alugueis.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         # Botão de devolução
@@ -147,25 +166,66 @@ class AluguelView(QWidget):
         self.registrar_btn.clicked.connect(self.registrar_aluguel)
         self.limpar_btn.clicked.connect(self.limpar_campos)
         self.devolver_btn.clicked.connect(self.registrar_devolucao)
-        self.tabela_alugueis.itemClicked.connect(self.selecionar_aluguel)
+        self.tabela_alugueis.clicked.connect(self.selecionar_aluguel)
+    
+    def carregar_dados(self):
+        """Recarrega os dados exibidos pela aba."""
+        self.atualizar_combo_clientes()
+        self.atualizar_combo_dvds()
+        self.filtrar_alugueis()
     
     def atualizar_combo_clientes(self):
         """Atualiza o combo de clientes."""
-        self.cliente_combo.clear()
+        self.carregador.executar(
+            "alugueis.clientes", ClienteController.listar_clientes, ao_concluir=self.preencher_combo_clientes
+        )
+    
+    def preencher_combo_clientes(self, clientes):
+        """Preenche o combo de clientes.
         
-        clientes = ClienteController.listar_clientes()
+        Args:
+            clientes (list): Lista de objetos Cliente.
+        """
+        self.cliente_combo.clear()
         
         for cliente in clientes:
             self.cliente_combo.addItem(f"{cliente.nome} ({cliente.telefone})", cliente.id)
     
     def atualizar_combo_dvds(self):
-        """Atualiza o combo de DVDs disponíveis."""
+        """Atualiza o combo de títulos com cópias disponíveis."""
+        self.carregador.executar(
+            "alugueis.dvds", DVDController.listar_titulos_disponiveis, ao_concluir=self.preencher_combo_dvds
+        )
+    
+    def preencher_combo_dvds(self, titulos):
+        """Guarda os títulos disponíveis e preenche o combo com eles.
+        
+        Args:
+            titulos (list): Lista de objetos Titulo com cópias disponíveis.
+        """
+        self._titulos = {titulo.id: titulo for titulo in titulos}
+        self.exibir_titulos_disponiveis()
+    
+    def exibir_titulos_disponiveis(self):
+        """Preenche o combo com os títulos que ainda têm cópias livres além das já selecionadas."""
+        selecionados = Counter(
+            self.dvds_selecionados_list.item(i).data(Qt.UserRole)
+            for i in range(self.dvds_selecionados_list.count())
+        )
+        atual = self.dvd_combo.currentData()
+        
         self.dvd_combo.clear()
         
-        dvds = DVDController.listar_dvds_disponiveis()
+        for titulo in self._titulos.values():
+            restantes = titulo.copias_disponiveis - selecionados[titulo.id]
+            if restantes > 0:
+                self.dvd_combo.addItem(
+                    f"{titulo.nome} ({titulo.ano_lancamento}) - {restantes} disponíveis", titulo.id
+                )
         
-        for dvd in dvds:
-            self.dvd_combo.addItem(f"{dvd.nome} ({dvd.ano_lancamento})", dvd.id)
+        indice = self.dvd_combo.findData(atual)
+        if indice >= 0:
+            self.dvd_combo.setCurrentIndex(indice)
     
     def atualizar_data_devolucao(self):
         """Atualiza a data de devolução com base no número de dias."""
@@ -175,28 +235,20 @@ class AluguelView(QWidget):
         self.data_devolucao_input.setDate(QDate(data_devolucao.year, data_devolucao.month, data_devolucao.day))
     
     def adicionar_dvd(self):
-        """Adiciona um DVD à lista de selecionados."""
+        """Adiciona uma cópia do título escolhido à lista de selecionados."""
         if self.dvd_combo.count() == 0:
             QMessageBox.warning(self, "Aviso", "Não há DVDs disponíveis para aluguel.")
             return
         
-        dvd_id = self.dvd_combo.currentData()
-        dvd_texto = self.dvd_combo.currentText()
+        titulo = self._titulos[self.dvd_combo.currentData()]
         
-        # Verifica se o DVD já está na lista
-        for i in range(self.dvds_selecionados_list.count()):
-            item = self.dvds_selecionados_list.item(i)
-            if item.data(Qt.UserRole) == dvd_id:
-                QMessageBox.warning(self, "Aviso", "Este DVD já foi selecionado.")
-                return
-        
-        # Adiciona o DVD à lista
-        item = QListWidgetItem(dvd_texto)
-        item.setData(Qt.UserRole, dvd_id)
+        # Adiciona o título à lista; a cópia só é escolhida ao registrar
+        item = QListWidgetItem(f"{titulo.nome} ({titulo.ano_lancamento})")
+        item.setData(Qt.UserRole, titulo.id)
         self.dvds_selecionados_list.addItem(item)
         
-        # Remove o DVD do combo
-        self.dvd_combo.removeItem(self.dvd_combo.currentIndex())
+        # Desconta a cópia do combo (o título sai quando não sobra nenhuma)
+        self.exibir_titulos_disponiveis()
     
     def remover_dvd(self):
         """Remove um DVD da lista de selecionados."""
@@ -206,15 +258,12 @@ class AluguelView(QWidget):
             QMessageBox.warning(self, "Aviso", "Selecione um DVD para remover.")
             return
         
-        dvd_id = item.data(Qt.UserRole)
-        dvd_texto = item.text()
-        
         # Remove o DVD da lista
         row = self.dvds_selecionados_list.row(item)
         self.dvds_selecionados_list.takeItem(row)
         
-        # Adiciona o DVD de volta ao combo
-        self.dvd_combo.addItem(dvd_texto, dvd_id)
+        # Devolve a cópia ao combo
+        self.exibir_titulos_disponiveis()
     
     def limpar_campos(self):
         """Limpa os campos de entrada."""
@@ -243,94 +292,157 @@ class AluguelView(QWidget):
         data_aluguel = self.data_aluguel_input.date().toPyDate()
         dias_devolucao = self.dias_devolucao_input.value()
         
-        # Obtém a lista de IDs dos DVDs selecionados
-        dvds_ids = []
+        # Obtém a lista de IDs dos títulos selecionados (um por cópia)
+        titulos_ids = []
         for i in range(self.dvds_selecionados_list.count()):
             item = self.dvds_selecionados_list.item(i)
-            dvds_ids.append(item.data(Qt.UserRole))
+            titulos_ids.append(item.data(Qt.UserRole))
         
         # Converte a data para datetime
         data_aluguel_dt = datetime.combine(data_aluguel, datetime.min.time())
         
         # Registra o aluguel
-        aluguel = AluguelController.registrar_aluguel(cliente_id, dvds_ids, dias_devolucao)
+        self.registrar_btn.setEnabled(False)
+        self.carregador.gravar(
+            "alugueis.registrar", AluguelController.registrar_aluguel_por_titulos,
+            cliente_id, titulos_ids, dias_devolucao,
+            ao_concluir=self.concluir_registro,
+            ao_falhar=lambda erro: self.concluir_registro(None)
+        )
+    
+    def concluir_registro(self, aluguel):
+        """Atualiza a tela depois de registrar um aluguel.
+        
+        Args:
+            aluguel (Aluguel): Aluguel registrado ou None se não foi possível registrar.
+        """
+        self.registrar_btn.setEnabled(True)
         
         if aluguel:
             self.limpar_campos()
             self.carregar_alugueis()
             QMessageBox.information(self, "Sucesso", "Aluguel registrado com sucesso!")
         else:
-            QMessageBox.critical(self, "Erro", "Erro ao registrar aluguel. Verifique se todos os DVDs estão disponíveis.")
+            QMessageBox.critical(
+                self, "Erro", "Erro ao registrar aluguel. Verifique se ainda há cópias disponíveis dos títulos."
+            )
+            self.atualizar_combo_dvds()
     
     def carregar_alugueis(self, filtro_cliente=None):
-        """Carrega a lista de aluguéis na tabela.
+        """Carrega a primeira página de aluguéis; as demais vêm conforme a rolagem.
         
         Args:
             filtro_cliente (str, optional): Nome do cliente para filtrar. Defaults to None.
         """
-        self.tabela_alugueis.setRowCount(0)
+        self._filtro_cliente = filtro_cliente
+        self.modelo_alugueis.interromper_paginacao()
+        self.carregador.executar(
+            "alugueis.lista", AluguelController.listar_alugueis_exibicao,
+            filtro_cliente, None, self.TAMANHO_PAGINA,
+            ao_concluir=self.preencher_tabela
+        )
+    
+    def carregar_proxima_pagina(self):
+        """Busca a página seguinte à última exibida (chamada pelo modelo da tabela)."""
+        self.carregador.executar(
+            "alugueis.lista", AluguelController.listar_alugueis_exibicao,
+            self._filtro_cliente, self._ultima_chave, self.TAMANHO_PAGINA,
+            ao_concluir=self.acrescentar_pagina, ao_falhar=self.falha_pagina
+        )
+    
+    def preencher_tabela(self, alugueis):
+        """Exibe a primeira página de aluguéis na tabela.
         
-        alugueis = AluguelController.listar_alugueis()
+        Args:
+            alugueis (list): Dicionários retornados por listar_alugueis_exibicao.
+        """
+        self._ultima_chave = (alugueis[-1]["data_aluguel_iso"], alugueis[-1]["id"]) if alugueis else None
+        self.modelo_alugueis.definir_linhas(
+            self.linhas_tabela(alugueis), ha_mais=len(alugueis) == self.TAMANHO_PAGINA
+        )
+    
+    def acrescentar_pagina(self, alugueis):
+        """Acrescenta uma página de aluguéis à tabela.
         
-        for aluguel in alugueis:
-            # Busca o cliente
-            cliente = ClienteController.buscar_cliente(aluguel.cliente_id)
-            nome_cliente = cliente.nome if cliente else "Cliente não encontrado"
-            
-            # Aplica o filtro por nome do cliente se especificado
-            if filtro_cliente and filtro_cliente.lower() not in nome_cliente.lower():
-                continue
-            
-            row = self.tabela_alugueis.rowCount()
-            self.tabela_alugueis.insertRow(row)
-            
-            # Busca os DVDs
-            dvds_nomes = []
-            for dvd_id in aluguel.dvds_ids:
-                dvd = DVDController.buscar_dvd(dvd_id)
-                if dvd:
-                    dvds_nomes.append(dvd.nome)
-            
-            dvds_texto = ", ".join(dvds_nomes) if dvds_nomes else "Nenhum DVD"
-            
-            # Formata as datas
-            data_aluguel = aluguel.data_aluguel.strftime("%d/%m/%Y") if aluguel.data_aluguel else ""
-            data_devolucao = aluguel.data_devolucao.strftime("%d/%m/%Y") if aluguel.data_devolucao else ""
+        Args:
+            alugueis (list): Dicionários retornados por listar_alugueis_exibicao.
+        """
+        if alugueis:
+            self._ultima_chave = (alugueis[-1]["data_aluguel_iso"], alugueis[-1]["id"])
+        self.modelo_alugueis.acrescentar_linhas(
+            self.linhas_tabela(alugueis), ha_mais=len(alugueis) == self.TAMANHO_PAGINA
+        )
+    
+    def falha_pagina(self, erro):
+        """Libera a tabela para pedir a página de novo e informa o erro.
+        
+        Args:
+            erro (Exception): Exceção lançada na busca da página.
+        """
+        self.modelo_alugueis.falha_paginacao()
+        self.carregador.falhou.emit("alugueis.lista", erro)
+    
+    @staticmethod
+    def linhas_tabela(alugueis):
+        """Converte os aluguéis nas tuplas exibidas pela tabela.
+        
+        Args:
+            alugueis (list): Dicionários retornados por listar_alugueis_exibicao.
             
+        Returns:
+            list: Uma tupla por aluguel, com a situação depois das colunas exibidas.
+        """
+        linhas = []
+        for aluguel in alugueis:
             # Define o status
-            status = "Devolvido" if aluguel.devolvido else "Em aberto"
+            status = "Devolvido" if aluguel["devolvido"] else "Em aberto"
+            situacao = "devolvido" if aluguel["devolvido"] else "aberto"
             
             # Calcula o atraso
-            dias_atraso = aluguel.calcular_atraso()
-            if dias_atraso > 0 and not aluguel.devolvido:
+            dias_atraso = aluguel["dias_atraso"]
+            if dias_atraso > 0 and not aluguel["devolvido"]:
                 status = f"Em atraso ({dias_atraso} dias)"
+                situacao = "atraso"
             
-            # Adiciona os dados à tabela
-            self.tabela_alugueis.setItem(row, 0, QTableWidgetItem(str(aluguel.id)))
-            self.tabela_alugueis.setItem(row, 1, QTableWidgetItem(data_aluguel))
-            self.tabela_alugueis.setItem(row, 2, QTableWidgetItem(nome_cliente))
-            self.tabela_alugueis.setItem(row, 3, QTableWidgetItem(dvds_texto))
-            self.tabela_alugueis.setItem(row, 4, QTableWidgetItem(data_devolucao))
-            self.tabela_alugueis.setItem(row, 5, QTableWidgetItem(status))
+            # A situação fica depois das colunas exibidas e define a cor da linha
+            linhas.append((
+                str(aluguel["id"]),
+                aluguel["data_aluguel"],
+                aluguel["cliente_nome"],
+                aluguel["dvds"],
+                aluguel["data_devolucao"],
+                status,
+                situacao
+            ))
+        
+        return linhas
+    
+    @staticmethod
+    def estilo_aluguel(linha):
+        """Define as cores de uma linha da tabela de aluguéis.
+        
+        Args:
+            linha (tuple): Valores da linha, com a situação na última posição.
             
-            # Define a cor da linha de acordo com o status
-            if "Em atraso" in status:
-                for col in range(self.tabela_alugueis.columnCount()):
-                    self.tabela_alugueis.item(row, col).setBackground(Qt.red)
-                    self.tabela_alugueis.item(row, col).setForeground(Qt.white)
-            elif status == "Devolvido":
-                for col in range(self.tabela_alugueis.columnCount()):
-                    self.tabela_alugueis.item(row, col).setBackground(Qt.green)
+        Returns:
+            tuple: (cor_fundo, cor_texto) ou None para as cores padrão.
+        """
+        situacao = linha[-1]
+        if situacao == "atraso":
+            return Qt.red, Qt.white
+        if situacao == "devolvido":
+            return Qt.green, None
+        return None
     
-    def selecionar_aluguel(self, item):
+    def selecionar_aluguel(self, index):
         """Seleciona um aluguel da tabela.
         
         Args:
-            item (QTableWidgetItem): Item clicado na tabela.
+            index (QModelIndex): Célula clicada na tabela.
         """
-        row = item.row()
-        aluguel_id = int(self.tabela_alugueis.item(row, 0).text())
-        status = self.tabela_alugueis.item(row, 5).text()
+        linha = self.modelo_alugueis.linha(index.row())
+        aluguel_id = int(linha[0])
+        status = linha[5]
         
         # Habilita ou desabilita o botão de devolução
         self.devolver_btn.setEnabled("Devolvido" not in status)
@@ -345,8 +457,19 @@ class AluguelView(QWidget):
             return
         
         # Calcula o valor do aluguel
-        valores = AluguelController.calcular_valor_aluguel(aluguel_id)
+        self.carregador.executar(
+            "alugueis.valor", AluguelController.calcular_valor_aluguel, aluguel_id,
+            ao_concluir=lambda valores: self.confirmar_devolucao(aluguel_id, valores),
+            ao_falhar=lambda erro: self.confirmar_devolucao(aluguel_id, None)
+        )
+    
+    def confirmar_devolucao(self, aluguel_id, valores):
+        """Mostra o valor a pagar e, se confirmado, registra a devolução.
         
+        Args:
+            aluguel_id (int): ID do aluguel a ser devolvido.
+            valores (dict): Valores calculados por calcular_valor_aluguel, ou None em caso de erro.
+        """
         if not valores:
             QMessageBox.critical(self, "Erro", "Erro ao calcular o valor do aluguel.")
             return
@@ -369,14 +492,24 @@ class AluguelView(QWidget):
         )
         
         if resposta == QMessageBox.Yes:
-            sucesso = AluguelController.registrar_devolucao(aluguel_id)
-            
-            if sucesso:
-                self.carregar_alugueis()
-                self.atualizar_combo_dvds()
-                QMessageBox.information(self, "Sucesso", "Devolução registrada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao registrar devolução.")
+            self.carregador.gravar(
+                "alugueis.devolver", AluguelController.registrar_devolucao, aluguel_id,
+                ao_concluir=self.concluir_devolucao,
+                ao_falhar=lambda erro: self.concluir_devolucao(False)
+            )
+    
+    def concluir_devolucao(self, sucesso):
+        """Atualiza a tela depois de registrar uma devolução.
+        
+        Args:
+            sucesso (bool): Se a devolução foi registrada.
+        """
+        if sucesso:
+            self.carregar_alugueis()
+            self.atualizar_combo_dvds()
+            QMessageBox.information(self, "Sucesso", "Devolução registrada com sucesso!")
+        else:
+            QMessageBox.critical(self, "Erro", "Erro ao registrar devolução.")
     
     def filtrar_alugueis(self):
         """Filtra os aluguéis pelo nome do cliente."""
@@ -0,0 +1,200 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from database.config import DatabaseConfig
+
+class _SinaisTarefa(QObject):
+    """Sinais usados pelas tarefas para devolver o resultado à thread da interface."""
+    
+    terminou = pyqtSignal(str, int, object, object)
+
+
+class _Tarefa(QRunnable):
+    """Executa uma chamada a um controller em uma thread do pool."""
+    
+    def __init__(self, sinais, canal, geracao, funcao, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        
+        self._sinais = sinais
+        self.canal = canal
+        self.geracao = geracao
+        self._funcao = funcao
+        self._args = args
+        self._kwargs = kwargs
+    
+    def run(self):
+        """Executa a função e emite o resultado ou a exceção."""
+        try:
+            resultado = self._funcao(*self._args, **self._kwargs)
+        except Exception as e:
+            self._sinais.terminou.emit(self.canal, self.geracao, None, e)
+        else:
+            self._sinais.terminou.emit(self.canal, self.geracao, resultado, None)
+
+
+class Carregador(QObject):
+    """Executa as chamadas aos controllers fora da thread da interface.
+    
+    Leituras (executar) pertencem a um canal (por exemplo "dvds.lista"). Uma
+    nova leitura no mesmo canal torna a anterior obsoleta: se ela ainda não
+    começou, é retirada da fila; se já está rodando, seu resultado é
+    descartado. Gravações (gravar) nunca são substituídas nem canceladas:
+    todas rodam e todas devolvem o resultado. Os callbacks sempre rodam na
+    thread da interface, então podem mexer nos widgets.
+    """
+    
+    # Emitido com True quando a primeira tarefa começa e False quando a fila esvazia
+    ocupado = pyqtSignal(bool)
+    # Emitido com (canal, exceção) quando uma tarefa sem ao_falhar falha
+    falhou = pyqtSignal(str, object)
+    
+    def __init__(self, parent=None):
+        """Inicializa o carregador.
+        
+        Args:
+            parent (QObject, optional): Objeto pai. Defaults to None.
+        """
+        super().__init__(parent)
+        
+        # Mais threads que conexões só deixaria tarefas esperando pelo pool
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(DatabaseConfig.POOL_SIZE)
+        
+        self._sinais = _SinaisTarefa()
+        self._sinais.terminou.connect(self._entregar)
+        
+        self._geracoes = {}
+        self._callbacks = {}
+        self._tarefas = {}
+        self._gravacoes = {}
+        self._pendentes = 0
+    
+    def executar(self, canal, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Agenda uma leitura em segundo plano.
+        
+        Args:
+            canal (str): Nome do canal; substitui a chamada anterior do mesmo canal.
+            funcao (callable): Função a executar (normalmente um método de controller).
+            *args: Argumentos posicionais da função.
+            ao_concluir (callable, optional): Recebe o resultado, na thread da interface. Defaults to None.
+            ao_falhar (callable, optional): Recebe a exceção, na thread da interface. Defaults to None.
+            **kwargs: Argumentos nomeados da função.
+        """
+        self._retirar_da_fila(canal)
+        
+        geracao = self._agendar(canal, funcao, args, kwargs)
+        self._callbacks[canal] = (geracao, ao_concluir, ao_falhar)
+    
+    def gravar(self, canal, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Agenda uma gravação em segundo plano.
+        
+        Ao contrário de executar, a chamada não substitui as anteriores do
+        mesmo canal nem é afetada por cancelar: dois cliques em "Salvar"
+        gravam duas vezes, e cada um recebe a sua resposta.
+        
+        Args:
+            canal (str): Nome do canal, informado em falhou se a gravação falhar sem ao_falhar.
+            funcao (callable): Função a executar (normalmente um método de controller).
+            *args: Argumentos posicionais da função.
+            ao_concluir (callable, optional): Recebe o resultado, na thread da interface. Defaults to None.
+            ao_falhar (callable, optional): Recebe a exceção, na thread da interface. Defaults to None.
+            **kwargs: Argumentos nomeados da função.
+        """
+        geracao = self._agendar(canal, funcao, args, kwargs)
+        self._gravacoes[(canal, geracao)] = (ao_concluir, ao_falhar)
+    
+    def _agendar(self, canal, funcao, args, kwargs):
+        """Cria a tarefa de uma chamada e a coloca na fila do pool.
+        
+        Args:
+            canal (str): Nome do canal.
+            funcao (callable): Função a executar.
+            args (tuple): Argumentos posicionais da função.
+            kwargs (dict): Argumentos nomeados da função.
+            
+        Returns:
+            int: Geração da chamada no canal.
+        """
+        geracao = self._geracoes.get(canal, 0) + 1
+        self._geracoes[canal] = geracao
+        
+        tarefa = _Tarefa(self._sinais, canal, geracao, funcao, args, kwargs)
+        self._tarefas[(canal, geracao)] = tarefa
+        
+        self._pendentes += 1
+        if self._pendentes == 1:
+            self.ocupado.emit(True)
+        
+        self._pool.start(tarefa)
+        return geracao
+    
+    def cancelar(self, *canais):
+        """Descarta as leituras em andamento dos canais informados (gravações não são afetadas).
+        
+        Args:
+            *canais (str): Canais a cancelar.
+        """
+        for canal in canais:
+            self._retirar_da_fila(canal)
+            self._callbacks.pop(canal, None)
+    
+    def aguardar(self, milissegundos=-1):
+        """Aguarda o término das tarefas em execução (útil ao fechar a janela).
+        
+        Args:
+            milissegundos (int, optional): Tempo máximo de espera; -1 espera sem limite. Defaults to -1.
+            
+        Returns:
+            bool: True se todas as tarefas terminaram.
+        """
+        return self._pool.waitForDone(milissegundos)
+    
+    def _retirar_da_fila(self, canal):
+        """Remove da fila a leitura atual do canal, se ela ainda não começou.
+        
+        A leitura é achada pela geração guardada em _callbacks, e não pela
+        última do canal, que pode ser uma gravação agendada depois dela.
+        
+        Args:
+            canal (str): Nome do canal.
+        """
+        registro = self._callbacks.get(canal)
+        if registro is None:
+            return
+        
+        chave = (canal, registro[0])
+        tarefa = self._tarefas.get(chave)
+        
+        if tarefa is not None and self._pool.tryTake(tarefa):
+            del self._tarefas[chave]
+            self._tarefa_finalizada()
+    
+    def _tarefa_finalizada(self):
+        """Atualiza o contador de tarefas pendentes."""
+        self._pendentes -= 1
+        if self._pendentes == 0:
+            self.ocupado.emit(False)
+    
+    @pyqtSlot(str, int, object, object)
+    def _entregar(self, canal, geracao, resultado, erro):
+        """Entrega o resultado de uma tarefa ao callback, se ela não estiver obsoleta."""
+        self._tarefas.pop((canal, geracao), None)
+        self._tarefa_finalizada()
+        
+        if (canal, geracao) in self._gravacoes:
+            ao_concluir, ao_falhar = self._gravacoes.pop((canal, geracao))
+        else:
+            registro = self._callbacks.get(canal)
+            if registro is None or registro[0] != geracao:
+                return
+            
+            del self._callbacks[canal]
+            _, ao_concluir, ao_falhar = registro
+        
+        if erro is not None:
+            if ao_falhar:
+                ao_falhar(erro)
+            else:
+                self.falhou.emit(canal, erro)
+        elif ao_concluir:
+            ao_concluir(resultado)
\ No newline at end of file
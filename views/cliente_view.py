@@ -1,19 +1,36 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QPushButton, QTableView, QAbstractItemView, QHeaderView,
                              QMessageBox, QFormLayout, QGroupBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 
 from controllers.cliente_controller import ClienteController
+from views.modelos_tabela import ModeloTabela
 
 class ClienteView(QWidget):
     """Interface para gerenciamento de clientes."""
     
-    def __init__(self):
+    # Canais de leitura do carregador, cancelados quando a aba sai de foco
+    CANAIS_LEITURA = ("clientes.lista",)
+    
+    # Clientes buscados por vez ao rolar a lista completa
+    TAMANHO_PAGINA = 200
+    
+    # Espera depois da última tecla antes de buscar, para não consultar a cada letra
+    ATRASO_BUSCA_MS = 250
+    # Resultados exibidos pela busca enquanto se digita
+    LIMITE_BUSCA = 50
+    
+    def __init__(self, carregador):
+        """Inicializa a view.
+        
+        Args:
+            carregador (Carregador): Executor das chamadas ao banco em segundo plano.
+        """
         super().__init__()
         
+        self.carregador = carregador
         self.init_ui()
-        self.carregar_clientes()
     
     def init_ui(self):
         """Inicializa a interface do usuário."""
@@ -80,22 +97,30 @@ class ClienteView(QWidget):
         search_layout = QHBoxLayout()
         
         self.busca_cpf_input = QLineEdit()
-        self.busca_cpf_input.setPlaceholderText("Digite o CPF para buscar (deixe vazio para listar todos)")
-        self.busca_cpf_input.setMaxLength(11)
+        self.busca_cpf_input.setPlaceholderText("Digite o início do CPF ou do nome (deixe vazio para listar todos)")
+        
+        # Reiniciado a cada tecla; a busca só roda quando a digitação para
+        self.timer_busca = QTimer(self)
+        self.timer_busca.setSingleShot(True)
+        self.timer_busca.setInterval(self.ATRASO_BUSCA_MS)
         
         self.buscar_btn = QPushButton("Buscar")
         self.buscar_btn.setIcon(self.style().standardIcon(self.style().SP_FileDialogDetailedView))
         
-        search_layout.addWidget(QLabel("CPF:"))
+        search_layout.addWidget(QLabel("CPF ou nome:"))
         search_layout.addWidget(self.busca_cpf_input)
         search_layout.addWidget(self.buscar_btn)
         
         search_group.setLayout(search_layout)
         
         # Tabela de clientes
-        self.tabela_clientes = QTableWidget()
-        self.tabela_clientes.setColumnCount(5)
-        self.tabela_clientes.setHorizontalHeaderLabels(["ID", "CPF", "Nome", "Telefone", "Endereço"])
+        self.modelo_clientes = ModeloTabela(
+            ["ID", "CPF", "Nome", "Telefone", "Endereço"], carregar_mais=self.carregar_proxima_pagina
+        )
+        self._ultima_chave = None
+        self.tabela_clientes = QTableView()
+        self.tabela_clientes.setModel(self.modelo_clientes)
+        self.tabela_clientes.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tabela_clientes.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         # Adiciona os widgets ao layout principal
@@ -116,23 +141,83 @@ class ClienteView(QWidget):
         self.atualizar_btn.clicked.connect(self.carregar_clientes)
         self.buscar_btn.clicked.connect(self.buscar_cliente)
         self.busca_cpf_input.returnPressed.connect(self.buscar_cliente)
-        self.tabela_clientes.itemClicked.connect(self.selecionar_cliente)
+        self.busca_cpf_input.textChanged.connect(lambda: self.timer_busca.start())
+        self.timer_busca.timeout.connect(self.buscar_enquanto_digita)
+        self.tabela_clientes.clicked.connect(self.selecionar_cliente)
+    
+    def carregar_dados(self):
+        """Recarrega os dados exibidos pela aba."""
+        self.carregar_clientes()
     
     def carregar_clientes(self):
-        """Carrega a lista de clientes na tabela."""
-        self.tabela_clientes.setRowCount(0)
+        """Carrega a primeira página da lista de clientes; as demais vêm conforme a rolagem."""
+        self.modelo_clientes.interromper_paginacao()
+        self.carregador.executar(
+            "clientes.lista", ClienteController.listar_clientes_pagina, None, self.TAMANHO_PAGINA,
+            ao_concluir=self.exibir_primeira_pagina
+        )
+    
+    def carregar_proxima_pagina(self):
+        """Busca a página seguinte à última exibida (chamada pelo modelo da tabela)."""
+        self.carregador.executar(
+            "clientes.lista", ClienteController.listar_clientes_pagina, self._ultima_chave, self.TAMANHO_PAGINA,
+            ao_concluir=self.acrescentar_pagina, ao_falhar=self.falha_pagina
+        )
+    
+    def exibir_primeira_pagina(self, clientes):
+        """Exibe a primeira página da lista de clientes.
         
-        clientes = ClienteController.listar_clientes()
+        Args:
+            clientes (list): Lista de objetos Cliente.
+        """
+        self._ultima_chave = (clientes[-1].nome, clientes[-1].id) if clientes else None
+        self.modelo_clientes.definir_linhas(
+            self.linhas_tabela(clientes), ha_mais=len(clientes) == self.TAMANHO_PAGINA
+        )
+    
+    def acrescentar_pagina(self, clientes):
+        """Acrescenta uma página à lista de clientes.
+        
+        Args:
+            clientes (list): Lista de objetos Cliente.
+        """
+        if clientes:
+            self._ultima_chave = (clientes[-1].nome, clientes[-1].id)
+        self.modelo_clientes.acrescentar_linhas(
+            self.linhas_tabela(clientes), ha_mais=len(clientes) == self.TAMANHO_PAGINA
+        )
+    
+    def falha_pagina(self, erro):
+        """Libera a tabela para pedir a página de novo e informa o erro.
+        
+        Args:
+            erro (Exception): Exceção lançada na busca da página.
+        """
+        self.modelo_clientes.falha_paginacao()
+        self.carregador.falhou.emit("clientes.lista", erro)
+    
+    def preencher_tabela(self, clientes):
+        """Exibe uma lista de clientes na tabela.
+        
+        Args:
+            clientes (list): Lista de objetos Cliente.
+        """
+        self.modelo_clientes.definir_linhas(self.linhas_tabela(clientes))
+    
+    @staticmethod
+    def linhas_tabela(clientes):
+        """Converte clientes nas tuplas exibidas pela tabela.
         
-        for cliente in clientes:
-            row = self.tabela_clientes.rowCount()
-            self.tabela_clientes.insertRow(row)
+        Args:
+            clientes (list): Lista de objetos Cliente.
             
-            self.tabela_clientes.setItem(row, 0, QTableWidgetItem(str(cliente.id)))
-            self.tabela_clientes.setItem(row, 1, QTableWidgetItem(cliente.cpf or ""))
-            self.tabela_clientes.setItem(row, 2, QTableWidgetItem(cliente.nome))
-            self.tabela_clientes.setItem(row, 3, QTableWidgetItem(cliente.telefone))
-            self.tabela_clientes.setItem(row, 4, QTableWidgetItem(cliente.endereco))
+        Returns:
+            generator: Uma tupla de textos por cliente.
+        """
+        return (
+            (str(cliente.id), cliente.cpf or "", cliente.nome, cliente.telefone or "", cliente.endereco or "")
+            for cliente in clientes
+        )
     
     def limpar_campos(self):
         """Limpa os campos de entrada."""
@@ -154,7 +239,7 @@ class ClienteView(QWidget):
             QMessageBox.warning(self, "Aviso", "O CPF do cliente é obrigatório.")
             self.cpf_input.setFocus()
             return
-            
+        
         if not nome:
             QMessageBox.warning(self, "Aviso", "O nome do cliente é obrigatório.")
             self.nome_input.setFocus()
@@ -168,28 +253,50 @@ class ClienteView(QWidget):
         
         cliente_id = self.id_input.text()
         
-        try:
-            if cliente_id:  # Atualização
-                sucesso = ClienteController.atualizar_cliente(
-                    int(cliente_id), cpf, nome, telefone, endereco
-                )
-                mensagem = "Cliente atualizado com sucesso!" if sucesso else "Erro ao atualizar cliente."
-            else:  # Novo cadastro
-                cliente = ClienteController.cadastrar_cliente(cpf, nome, telefone, endereco)
-                sucesso = cliente is not None
-                mensagem = "Cliente cadastrado com sucesso!" if sucesso else "Erro ao cadastrar cliente."
-            
-            if sucesso:
-                self.limpar_campos()
-                self.carregar_clientes()
-                QMessageBox.information(self, "Sucesso", mensagem)
-            else:
-                QMessageBox.critical(self, "Erro", mensagem)
-        except Exception as e:
-            if "UNIQUE constraint failed" in str(e):
-                QMessageBox.critical(self, "Erro", "Este CPF já está cadastrado no sistema.")
-            else:
-                QMessageBox.critical(self, "Erro", f"Erro ao salvar cliente: {str(e)}")
+        if cliente_id:  # Atualização
+            self.carregador.gravar(
+                "clientes.salvar", ClienteController.atualizar_cliente,
+                int(cliente_id), cpf, nome, telefone, endereco,
+                ao_concluir=lambda sucesso: self.concluir_salvamento(
+                    sucesso, "Cliente atualizado com sucesso!" if sucesso else "Erro ao atualizar cliente."
+                ),
+                ao_falhar=self.exibir_erro_salvamento
+            )
+        else:  # Novo cadastro
+            self.carregador.gravar(
+                "clientes.salvar", ClienteController.cadastrar_cliente,
+                cpf, nome, telefone, endereco,
+                ao_concluir=lambda cliente: self.concluir_salvamento(
+                    cliente is not None,
+                    "Cliente cadastrado com sucesso!" if cliente else "Erro ao cadastrar cliente."
+                ),
+                ao_falhar=self.exibir_erro_salvamento
+            )
+    
+    def concluir_salvamento(self, sucesso, mensagem):
+        """Atualiza a tela depois de salvar ou excluir um cliente.
+        
+        Args:
+            sucesso (bool): Se a operação foi bem-sucedida.
+            mensagem (str): Mensagem exibida ao usuário.
+        """
+        if sucesso:
+            self.limpar_campos()
+            self.carregar_clientes()
+            QMessageBox.information(self, "Sucesso", mensagem)
+        else:
+            QMessageBox.critical(self, "Erro", mensagem)
+    
+    def exibir_erro_salvamento(self, erro):
+        """Exibe um erro ocorrido ao gravar um cliente.
+        
+        Args:
+            erro (Exception): Exceção lançada pela operação.
+        """
+        if "UNIQUE constraint failed" in str(erro):
+            QMessageBox.critical(self, "Erro", "Este CPF já está cadastrado no sistema.")
+        else:
+            QMessageBox.critical(self, "Erro", f"Erro ao salvar cliente: {str(erro)}")
     
     def excluir_cliente(self):
         """Exclui um cliente selecionado."""
@@ -206,28 +313,21 @@ class ClienteView(QWidget):
         )
         
         if resposta == QMessageBox.Yes:
-            sucesso = ClienteController.excluir_cliente(int(cliente_id))
-            
-            if sucesso:
-                self.limpar_campos()
-                self.carregar_clientes()
-                QMessageBox.information(self, "Sucesso", "Cliente excluído com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao excluir cliente.")
+            self.carregador.gravar(
+                "clientes.excluir", ClienteController.excluir_cliente, int(cliente_id),
+                ao_concluir=lambda sucesso: self.concluir_salvamento(
+                    sucesso, "Cliente excluído com sucesso!" if sucesso else "Erro ao excluir cliente."
+                ),
+                ao_falhar=self.exibir_erro_salvamento
+            )
     
-    def selecionar_cliente(self, item):
+    def selecionar_cliente(self, index):
         """Seleciona um cliente da tabela para edição.
         
         Args:
-            item (QTableWidgetItem): Item clicado na tabela.
+            index (QModelIndex): Célula clicada na tabela.
         """
-        row = item.row()
-        
-        cliente_id = self.tabela_clientes.item(row, 0).text()
-        cpf = self.tabela_clientes.item(row, 1).text()
-        nome = self.tabela_clientes.item(row, 2).text()
-        telefone = self.tabela_clientes.item(row, 3).text()
-        endereco = self.tabela_clientes.item(row, 4).text()
+        cliente_id, cpf, nome, telefone, endereco = self.modelo_clientes.linha(index.row())
         
         self.id_input.setText(cliente_id)
         self.cpf_input.setText(cpf)
@@ -236,30 +336,43 @@ class ClienteView(QWidget):
         self.endereco_input.setText(endereco)
     
     def buscar_cliente(self):
-        """Busca clientes por CPF ou lista todos se CPF estiver vazio."""
-        cpf_busca = self.busca_cpf_input.text().strip()
-        
-        self.tabela_clientes.setRowCount(0)
-        
-        if cpf_busca:
-            # Busca por CPF específico
-            if not cpf_busca.isdigit():
-                QMessageBox.warning(self, "Aviso", "Digite apenas números para o CPF.")
-                return
-                
-            cliente = ClienteController.buscar_cliente_por_cpf(cpf_busca)
-            
-            if cliente:
-                row = self.tabela_clientes.rowCount()
-                self.tabela_clientes.insertRow(row)
-                
-                self.tabela_clientes.setItem(row, 0, QTableWidgetItem(str(cliente.id)))
-                self.tabela_clientes.setItem(row, 1, QTableWidgetItem(cliente.cpf or ""))
-                self.tabela_clientes.setItem(row, 2, QTableWidgetItem(cliente.nome))
-                self.tabela_clientes.setItem(row, 3, QTableWidgetItem(cliente.telefone))
-                self.tabela_clientes.setItem(row, 4, QTableWidgetItem(cliente.endereco))
-            else:
-                QMessageBox.information(self, "Resultado", "Nenhum cliente encontrado com este CPF.")
+        """Busca imediatamente (Enter ou botão), avisando se nada foi encontrado."""
+        self.timer_busca.stop()
+        self.executar_busca(avisar=True)
+    
+    def buscar_enquanto_digita(self):
+        """Busca disparada pelo timer quando a digitação para, sem mensagens."""
+        self.executar_busca(avisar=False)
+    
+    def executar_busca(self, avisar):
+        """Busca clientes pelo início do CPF ou do nome, ou lista todos se a busca estiver vazia.
+        
+        A busca roda no canal da lista: uma nova busca descarta a anterior
+        ainda em andamento, então só o resultado da última tecla é exibido.
+        
+        Args:
+            avisar (bool): Se True, exibe uma mensagem quando nada é encontrado.
+        """
+        texto = self.busca_cpf_input.text().strip()
+        
+        if texto:
+            self.modelo_clientes.interromper_paginacao()
+            self.carregador.executar(
+                "clientes.lista", ClienteController.buscar_clientes_por_prefixo, texto, self.LIMITE_BUSCA,
+                ao_concluir=lambda clientes: self.exibir_resultado_busca(clientes, avisar)
+            )
         else:
             # Lista todos os clientes
-            self.carregar_clientes()
\ No newline at end of file
+            self.carregar_clientes()
+    
+    def exibir_resultado_busca(self, clientes, avisar=True):
+        """Exibe o resultado da busca por CPF ou nome.
+        
+        Args:
+            clientes (list): Lista de objetos Cliente encontrados.
+            avisar (bool, optional): Se True, avisa quando a lista está vazia. Defaults to True.
+        """
+        self.preencher_tabela(clientes)
+        
+        if not clientes and avisar:
+            QMessageBox.information(self, "Resultado", "Nenhum cliente encontrado para esta busca.")
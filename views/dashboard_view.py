@@ -1,24 +1,38 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, 
-    QTableWidgetItem, QGroupBox, QGridLayout, QPushButton
+    QTableWidgetItem, QGroupBox, QGridLayout, QPushButton, QComboBox
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QIcon
-from controllers.aluguel_controller import AluguelController
-from controllers.cliente_controller import ClienteController
-from controllers.dvd_controller import DVDController
-from database.aluguel_dao import AluguelDAO
-from datetime import datetime, timedelta
-import sqlite3
-from database.config import DatabaseConfig
+from controllers.dashboard_controller import DashboardController
 
 class DashboardView(QWidget):
     """View para exibir dashboard com estatísticas da locadora."""
     
-    def __init__(self):
+    # Canais de leitura do carregador, cancelados quando a aba sai de foco
+    CANAIS_LEITURA = ("dashboard.filmes", "dashboard.clientes", "dashboard.faturamento", "dashboard.estatisticas")
+    
+    # Períodos de faturamento: (rótulo, função do controller, argumentos)
+    PERIODOS_FATURAMENTO = (
+        ("Últimos 3 meses", DashboardController.faturamento_mensal, (3,)),
+        ("Últimos 6 meses", DashboardController.faturamento_mensal, (6,)),
+        ("Últimos 12 meses", DashboardController.faturamento_mensal, (12,)),
+        ("Ano atual", DashboardController.faturamento_ano_atual, ()),
+        ("Últimos 10 anos", DashboardController.faturamento_anual, (10,)),
+    )
+    
+    # Períodos exibidos em cards, além do card com o total
+    CARDS_PERIODOS = 3
+    
+    def __init__(self, carregador):
+        """Inicializa a view.
+        
+        Args:
+            carregador (Carregador): Executor das chamadas ao banco em segundo plano.
+        """
         super().__init__()
+        self.carregador = carregador
         self.init_ui()
-        self.carregar_dados()
     
     def init_ui(self):
         """Inicializa a interface do usuário."""
@@ -68,17 +82,30 @@ class DashboardView(QWidget):
         right_column = QVBoxLayout()
         
         # Faturamento por mês
-        faturamento_group = QGroupBox("Faturamento - Últimos 3 Meses")
+        faturamento_group = QGroupBox("Faturamento")
         faturamento_layout = QVBoxLayout()
         
+        # Seleção do período
+        periodo_layout = QHBoxLayout()
+        periodo_layout.addWidget(QLabel("Período:"))
+        self.combo_periodo = QComboBox()
+        for rotulo, _, _ in self.PERIODOS_FATURAMENTO:
+            self.combo_periodo.addItem(rotulo)
+        self.combo_periodo.currentIndexChanged.connect(self.carregar_faturamento)
+        periodo_layout.addWidget(self.combo_periodo)
+        periodo_layout.addStretch()
+        faturamento_layout.addLayout(periodo_layout)
+        
         # Cards de faturamento
         self.cards_layout = QGridLayout()
         faturamento_layout.addLayout(self.cards_layout)
         
         # Tabela detalhada de faturamento
         self.tabela_faturamento = QTableWidget()
-        self.tabela_faturamento.setColumnCount(4)
-        self.tabela_faturamento.setHorizontalHeaderLabels(["Mês", "Aluguéis", "Receita (R$)", "Ticket Médio (R$)"])
+        self.tabela_faturamento.setColumnCount(5)
+        self.tabela_faturamento.setHorizontalHeaderLabels(
+            ["Período", "Aluguéis", "Receita (R$)", "Multas (R$)", "Ticket Médio (R$)"]
+        )
         self.tabela_faturamento.setMaximumHeight(200)
         faturamento_layout.addWidget(self.tabela_faturamento)
         
@@ -117,30 +144,29 @@ class DashboardView(QWidget):
         self.setLayout(layout)
     
     def carregar_dados(self):
-        """Carrega todos os dados do dashboard."""
-        self.carregar_filmes_mais_alugados()
-        self.carregar_clientes_mais_alugam()
-        self.carregar_faturamento_mensal()
-        self.carregar_estatisticas_gerais()
+        """Carrega todos os dados do dashboard em segundo plano."""
+        self.carregador.executar(
+            "dashboard.filmes", DashboardController.filmes_mais_alugados, ao_concluir=self.exibir_filmes_mais_alugados
+        )
+        self.carregador.executar(
+            "dashboard.clientes", DashboardController.clientes_mais_alugam, ao_concluir=self.exibir_clientes_mais_alugam
+        )
+        self.carregar_faturamento()
+        self.carregador.executar(
+            "dashboard.estatisticas", DashboardController.estatisticas_gerais, ao_concluir=self.exibir_estatisticas_gerais
+        )
     
-    def carregar_filmes_mais_alugados(self):
-        """Carrega os filmes mais alugados."""
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT d.nome, COUNT(ad.dvd_id) as total_alugueis, 
-               COUNT(ad.dvd_id) * 5.0 as receita_estimada
-        FROM dvds d
-        JOIN aluguel_dvd ad ON d.id = ad.dvd_id
-        GROUP BY d.id, d.nome
-        ORDER BY total_alugueis DESC
-        LIMIT 10
-        """
-        
-        cursor.execute(query)
-        resultados = cursor.fetchall()
+    def carregar_faturamento(self):
+        """Carrega o faturamento do período selecionado em segundo plano."""
+        _, funcao, args = self.PERIODOS_FATURAMENTO[self.combo_periodo.currentIndex()]
+        self.carregador.executar("dashboard.faturamento", funcao, *args, ao_concluir=self.exibir_faturamento)
+    
+    def exibir_filmes_mais_alugados(self, resultados):
+        """Exibe os filmes mais alugados.
         
+        Args:
+            resultados (list): Tuplas (nome, total_alugueis, receita_estimada).
+        """
         self.tabela_filmes.setRowCount(len(resultados))
         
         for i, (nome, total_alugueis, receita) in enumerate(resultados):
@@ -149,26 +175,13 @@ class DashboardView(QWidget):
             self.tabela_filmes.setItem(i, 2, QTableWidgetItem(f"R$ {receita:.2f}"))
         
         self.tabela_filmes.resizeColumnsToContents()
-        conn.close()
     
-    def carregar_clientes_mais_alugam(self):
-        """Carrega os clientes que mais alugam."""
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        query = """
-        SELECT c.nome, c.cpf, COUNT(a.id) as total_alugueis,
-               COUNT(a.id) * 5.0 as valor_total
-        FROM clientes c
-        JOIN alugueis a ON c.id = a.cliente_id
-        GROUP BY c.id, c.nome, c.cpf
-        ORDER BY total_alugueis DESC
-        LIMIT 10
-        """
-        
-        cursor.execute(query)
-        resultados = cursor.fetchall()
+    def exibir_clientes_mais_alugam(self, resultados):
+        """Exibe os clientes que mais alugam.
         
+        Args:
+            resultados (list): Tuplas (nome, cpf, total_alugueis, valor_total).
+        """
         self.tabela_clientes.setRowCount(len(resultados))
         
         for i, (nome, cpf, total_alugueis, valor_total) in enumerate(resultados):
@@ -178,67 +191,38 @@ class DashboardView(QWidget):
             self.tabela_clientes.setItem(i, 3, QTableWidgetItem(f"R$ {valor_total:.2f}"))
         
         self.tabela_clientes.resizeColumnsToContents()
-        conn.close()
     
-    def carregar_faturamento_mensal(self):
-        """Carrega o faturamento dos últimos 3 meses."""
-        conn = DatabaseConfig.get_connection()
-        cursor = conn.cursor()
-        
-        # Calcula as datas dos últimos 3 meses
-        hoje = datetime.now()
-        meses = []
-        
-        for i in range(3):
-            data_mes = hoje - timedelta(days=30 * i)
-            inicio_mes = data_mes.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            if i == 0:
-                fim_mes = hoje
-            else:
-                proximo_mes = inicio_mes.replace(month=inicio_mes.month + 1) if inicio_mes.month < 12 else inicio_mes.replace(year=inicio_mes.year + 1, month=1)
-                fim_mes = proximo_mes - timedelta(days=1)
-            
-            meses.append((inicio_mes, fim_mes, data_mes.strftime('%B %Y')))
+    def exibir_faturamento(self, faturamento):
+        """Exibe o faturamento do período na tabela e nos cards.
         
+        Args:
+            faturamento (dict): Resultado de DashboardController.faturamento_periodo.
+        """
         # Limpa cards anteriores
         for i in reversed(range(self.cards_layout.count())):
             self.cards_layout.itemAt(i).widget().setParent(None)
         
-        self.tabela_faturamento.setRowCount(len(meses))
-        
-        for i, (inicio, fim, nome_mes) in enumerate(meses):
-            query = """
-            SELECT COUNT(a.id) as total_alugueis,
-                   COUNT(ad.dvd_id) as total_dvds_alugados
-            FROM alugueis a
-            LEFT JOIN aluguel_dvd ad ON a.id = ad.aluguel_id
-            WHERE datetime(a.data_aluguel) BETWEEN ? AND ?
-            """
-            
-            cursor.execute(query, (inicio.isoformat(), fim.isoformat()))
-            resultado = cursor.fetchone()
-            
-            total_alugueis = resultado[0] if resultado[0] else 0
-            total_dvds = resultado[1] if resultado[1] else 0
-            receita = total_dvds * 5.0  # R$ 5,00 por DVD
-            ticket_medio = receita / total_alugueis if total_alugueis > 0 else 0
-            
-            # Adiciona à tabela
-            self.tabela_faturamento.setItem(i, 0, QTableWidgetItem(nome_mes))
+        periodos = faturamento["periodos"]
+        self.tabela_faturamento.setRowCount(len(periodos))
+        
+        for i, (titulo, total_alugueis, receita, multas, ticket_medio) in enumerate(periodos):
+            self.tabela_faturamento.setItem(i, 0, QTableWidgetItem(titulo))
             self.tabela_faturamento.setItem(i, 1, QTableWidgetItem(str(total_alugueis)))
             self.tabela_faturamento.setItem(i, 2, QTableWidgetItem(f"R$ {receita:.2f}"))
-            self.tabela_faturamento.setItem(i, 3, QTableWidgetItem(f"R$ {ticket_medio:.2f}"))
-            
-            # Cria card para o mês
-            card = self.criar_card_faturamento(nome_mes, total_alugueis, receita)
+            self.tabela_faturamento.setItem(i, 3, QTableWidgetItem(f"R$ {multas:.2f}"))
+            self.tabela_faturamento.setItem(i, 4, QTableWidgetItem(f"R$ {ticket_medio:.2f}"))
+        
+        # Card do intervalo inteiro seguido dos períodos mais recentes
+        cards = [faturamento["total"]] + periodos[:self.CARDS_PERIODOS]
+        for i, (titulo, total_alugueis, receita, multas, _) in enumerate(cards):
+            card = self.criar_card_faturamento(titulo, total_alugueis, receita, multas)
             self.cards_layout.addWidget(card, i // 2, i % 2)
         
         self.tabela_faturamento.resizeColumnsToContents()
-        conn.close()
     
-    def criar_card_faturamento(self, mes, alugueis, receita):
-        """Cria um card de faturamento para um mês."""
-        card = QGroupBox(mes)
+    def criar_card_faturamento(self, periodo, alugueis, receita, multas):
+        """Cria um card de faturamento para um período."""
+        card = QGroupBox(periodo)
         layout = QVBoxLayout()
         
         label_alugueis = QLabel(f"Aluguéis: {alugueis}")
@@ -248,34 +232,33 @@ class DashboardView(QWidget):
         label_receita.setFont(QFont("Arial", 12, QFont.Bold))
         label_receita.setStyleSheet("color: green;")
         
+        label_multas = QLabel(f"Multas: R$ {multas:.2f}")
+        
         layout.addWidget(label_alugueis)
         layout.addWidget(label_receita)
+        layout.addWidget(label_multas)
         
         card.setLayout(layout)
-        card.setMaximumHeight(100)
+        card.setMaximumHeight(120)
         
         return card
     
-    def carregar_estatisticas_gerais(self):
-        """Carrega as estatísticas gerais."""
+    def exibir_estatisticas_gerais(self, estatisticas):
+        """Exibe as estatísticas gerais.
+        
+        Args:
+            estatisticas (dict): Totais retornados por DashboardController.estatisticas_gerais.
+        """
         # Total de clientes
-        clientes = ClienteController.listar_clientes()
-        self.label_total_clientes.setText(f"Total de Clientes: {len(clientes)}")
+        self.label_total_clientes.setText(f"Total de Clientes: {estatisticas['total_clientes']}")
         
         # Total de DVDs
-        dvds = DVDController.listar_dvds()
-        total_dvds = len(dvds)
-        dvds_disponiveis = len([dvd for dvd in dvds if dvd.disponivel])
-        dvds_alugados = total_dvds - dvds_disponiveis
-        
-        self.label_total_dvds.setText(f"Total de DVDs: {total_dvds}")
-        self.label_dvds_disponiveis.setText(f"DVDs Disponíveis: {dvds_disponiveis}")
-        self.label_dvds_alugados.setText(f"DVDs Alugados: {dvds_alugados}")
+        self.label_total_dvds.setText(f"Total de DVDs: {estatisticas['total_dvds']}")
+        self.label_dvds_disponiveis.setText(f"DVDs Disponíveis: {estatisticas['dvds_disponiveis']}")
+        self.label_dvds_alugados.setText(f"DVDs Alugados: {estatisticas['dvds_alugados']}")
         
         # Total de aluguéis
-        alugueis = AluguelController.listar_alugueis()
-        self.label_total_alugueis.setText(f"Total de Aluguéis: {len(alugueis)}")
+        self.label_total_alugueis.setText(f"Total de Aluguéis: {estatisticas['total_alugueis']}")
         
         # Aluguéis em atraso
-        alugueis_atraso = AluguelController.listar_alugueis_em_atraso()
-        self.label_alugueis_atraso.setText(f"Aluguéis em Atraso: {len(alugueis_atraso)}")
\ No newline at end of file
+        self.label_alugueis_atraso.setText(f"Aluguéis em Atraso: {estatisticas['alugueis_atraso']}")
\ No newline at end of file
@@ -1,20 +1,39 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                             QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QPushButton, QTableView, QAbstractItemView, QHeaderView,
                              QMessageBox, QFormLayout, QGroupBox, QSpinBox, QCheckBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon
 from datetime import datetime
 
 from controllers.dvd_controller import DVDController
+from views.modelos_tabela import ModeloTabela
 
 class DVDView(QWidget):
     """Interface para gerenciamento de DVDs."""
     
-    def __init__(self):
+    # Canais de leitura do carregador, cancelados quando a aba sai de foco
+    CANAIS_LEITURA = ("dvds.lista",)
+    
+    # DVDs buscados por vez ao rolar a lista completa
+    TAMANHO_PAGINA = 200
+    
+    # Espera depois da última tecla antes de buscar, para não consultar a cada letra
+    ATRASO_BUSCA_MS = 250
+    # Resultados exibidos pela busca enquanto se digita
+    LIMITE_BUSCA = 50
+    # Menor texto buscado automaticamente: dvds_fts só indexa prefixos de 2 e 3 letras
+    MINIMO_CARACTERES_BUSCA = 2
+    
+    def __init__(self, carregador):
+        """Inicializa a view.
+        
+        Args:
+            carregador (Carregador): Executor das chamadas ao banco em segundo plano.
+        """
         super().__init__()
         
+        self.carregador = carregador
         self.init_ui()
-        self.carregar_dvds()
     
     def init_ui(self):
         """Inicializa a interface do usuário."""
@@ -88,6 +107,11 @@ class DVDView(QWidget):
         self.busca_input = QLineEdit()
         self.busca_input.setPlaceholderText("Digite o título ou código do DVD (deixe vazio para listar todos)")
         
+        # Reiniciado a cada tecla; a busca só roda quando a digitação para
+        self.timer_busca = QTimer(self)
+        self.timer_busca.setSingleShot(True)
+        self.timer_busca.setInterval(self.ATRASO_BUSCA_MS)
+        
         self.buscar_btn = QPushButton("Buscar")
         self.buscar_btn.setIcon(self.style().standardIcon(self.style().SP_FileDialogDetailedView))
         
@@ -98,9 +122,14 @@ class DVDView(QWidget):
         search_group.setLayout(search_layout)
         
         # Tabela de DVDs
-        self.tabela_dvds = QTableWidget()
-        self.tabela_dvds.setColumnCount(6)
-        self.tabela_dvds.setHorizontalHeaderLabels(["ID", "Nome", "Sinopse", "Ano Lançamento", "Ano Aquisição", "Disponível"])
+        self.modelo_dvds = ModeloTabela(
+            ["ID", "Nome", "Sinopse", "Ano Lançamento", "Ano Aquisição", "Disponível"],
+            carregar_mais=self.carregar_proxima_pagina
+        )
+        self._ultima_chave = None
+        self.tabela_dvds = QTableView()
+        self.tabela_dvds.setModel(self.modelo_dvds)
+        self.tabela_dvds.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tabela_dvds.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         # Adiciona os widgets ao layout principal
@@ -121,50 +150,143 @@ class DVDView(QWidget):
         self.atualizar_btn.clicked.connect(self.carregar_dvds)
         self.buscar_btn.clicked.connect(self.buscar_dvd)
         self.busca_input.returnPressed.connect(self.buscar_dvd)
-        self.tabela_dvds.itemClicked.connect(self.selecionar_dvd)
+        self.busca_input.textChanged.connect(lambda: self.timer_busca.start())
+        self.timer_busca.timeout.connect(self.buscar_enquanto_digita)
+        self.tabela_dvds.clicked.connect(self.selecionar_dvd)
+    
+    def carregar_dados(self):
+        """Recarrega os dados exibidos pela aba."""
+        self.carregar_dvds()
     
     def buscar_dvd(self):
-        """Busca clientes por CPF ou lista todos se CPF estiver vazio."""
+        """Busca imediatamente (Enter ou botão), avisando se nada foi encontrado."""
+        self.timer_busca.stop()
+        self.executar_busca(avisar=True)
+    
+    def buscar_enquanto_digita(self):
+        """Busca disparada pelo timer quando a digitação para, sem mensagens."""
         dvd_busca = self.busca_input.text().strip()
         
-        self.tabela_dvds.setRowCount(0)
+        # Uma única letra casaria com boa parte do acervo; espera a próxima
+        if dvd_busca and not dvd_busca.isdigit() and len(dvd_busca) < self.MINIMO_CARACTERES_BUSCA:
+            return
+        
+        self.executar_busca(avisar=False)
+    
+    def executar_busca(self, avisar):
+        """Busca DVDs pelo código ou por palavras do título/sinopse, ou lista todos se a busca estiver vazia.
+        
+        A busca roda no canal da lista: uma nova busca descarta a anterior
+        ainda em andamento, então só o resultado da última tecla é exibido.
+        
+        Args:
+            avisar (bool): Se True, exibe uma mensagem quando nada é encontrado.
+        """
+        dvd_busca = self.busca_input.text().strip()
         
         if dvd_busca:
-            # Busca por ID específico
-            dvd = DVDController.buscar_dvd(dvd_busca)
+            self.modelo_dvds.interromper_paginacao()
             
-            if dvd:
-                row = self.tabela_dvds.rowCount()
-                self.tabela_dvds.insertRow(row)
-                
-                self.tabela_dvds.setItem(row, 0, QTableWidgetItem(str(dvd.id)))
-                self.tabela_dvds.setItem(row, 1, QTableWidgetItem(dvd.nome))
-                self.tabela_dvds.setItem(row, 2, QTableWidgetItem(dvd.sinopse))
-                self.tabela_dvds.setItem(row, 3, QTableWidgetItem(str(dvd.ano_lancamento) if dvd.ano_lancamento else ""))
-                self.tabela_dvds.setItem(row, 4, QTableWidgetItem(str(dvd.ano_aquisicao) if dvd.ano_aquisicao else ""))
-                self.tabela_dvds.setItem(row, 5, QTableWidgetItem("Sim" if dvd.disponivel else "Não"))
+            if dvd_busca.isdigit():
+                # Busca por ID específico
+                self.carregador.executar(
+                    "dvds.lista", DVDController.buscar_dvd, int(dvd_busca),
+                    ao_concluir=lambda dvd: self.exibir_resultado_busca([dvd] if dvd else [], avisar)
+                )
             else:
-                QMessageBox.information(self, "Resultado", "Nenhum dvd encontrado com este titulo.")
+                # Busca por texto, ordenada por relevância
+                self.carregador.executar(
+                    "dvds.lista", DVDController.pesquisar_dvds, dvd_busca, self.LIMITE_BUSCA,
+                    ao_concluir=lambda dvds: self.exibir_resultado_busca(dvds, avisar)
+                )
         else:
-            # Lista todos os clientes
+            # Lista todos os DVDs
             self.carregar_dvds()
-   
+    
+    def exibir_resultado_busca(self, dvds, avisar=True):
+        """Exibe o resultado de uma busca, avisando se nada foi encontrado.
+        
+        Args:
+            dvds (list): Lista de objetos DVD encontrados.
+            avisar (bool, optional): Se True, avisa quando a lista está vazia. Defaults to True.
+        """
+        self.preencher_tabela(dvds)
+        
+        if not dvds and avisar:
+            QMessageBox.information(self, "Resultado", "Nenhum DVD encontrado para esta busca.")
+    
     def carregar_dvds(self):
-        """Carrega a lista de DVDs na tabela."""
-        self.tabela_dvds.setRowCount(0)
+        """Carrega a primeira página da lista de DVDs; as demais vêm conforme a rolagem."""
+        self.modelo_dvds.interromper_paginacao()
+        self.carregador.executar(
+            "dvds.lista", DVDController.listar_dvds_pagina, None, self.TAMANHO_PAGINA,
+            ao_concluir=self.exibir_primeira_pagina
+        )
+    
+    def carregar_proxima_pagina(self):
+        """Busca a página seguinte à última exibida (chamada pelo modelo da tabela)."""
+        self.carregador.executar(
+            "dvds.lista", DVDController.listar_dvds_pagina, self._ultima_chave, self.TAMANHO_PAGINA,
+            ao_concluir=self.acrescentar_pagina, ao_falhar=self.falha_pagina
+        )
+    
+    def exibir_primeira_pagina(self, dvds):
+        """Exibe a primeira página da lista de DVDs.
+        
+        Args:
+            dvds (list): Lista de objetos DVD.
+        """
+        self._ultima_chave = (dvds[-1].nome, dvds[-1].id) if dvds else None
+        self.modelo_dvds.definir_linhas(self.linhas_tabela(dvds), ha_mais=len(dvds) == self.TAMANHO_PAGINA)
+    
+    def acrescentar_pagina(self, dvds):
+        """Acrescenta uma página à lista de DVDs.
+        
+        Args:
+            dvds (list): Lista de objetos DVD.
+        """
+        if dvds:
+            self._ultima_chave = (dvds[-1].nome, dvds[-1].id)
+        self.modelo_dvds.acrescentar_linhas(self.linhas_tabela(dvds), ha_mais=len(dvds) == self.TAMANHO_PAGINA)
+    
+    def falha_pagina(self, erro):
+        """Libera a tabela para pedir a página de novo e informa o erro.
+        
+        Args:
+            erro (Exception): Exceção lançada na busca da página.
+        """
+        self.modelo_dvds.falha_paginacao()
+        self.carregador.falhou.emit("dvds.lista", erro)
+    
+    def preencher_tabela(self, dvds):
+        """Exibe uma lista de DVDs na tabela.
         
-        dvds = DVDController.listar_dvds()
+        Args:
+            dvds (list): Lista de objetos DVD.
+        """
+        self.modelo_dvds.definir_linhas(self.linhas_tabela(dvds))
+    
+    @staticmethod
+    def linhas_tabela(dvds):
+        """Converte DVDs nas tuplas exibidas pela tabela.
         
-        for dvd in dvds:
-            row = self.tabela_dvds.rowCount()
-            self.tabela_dvds.insertRow(row)
+        Args:
+            dvds (list): Lista de objetos DVD.
             
-            self.tabela_dvds.setItem(row, 0, QTableWidgetItem(str(dvd.id)))
-            self.tabela_dvds.setItem(row, 1, QTableWidgetItem(dvd.nome))
-            self.tabela_dvds.setItem(row, 2, QTableWidgetItem(dvd.sinopse))
-            self.tabela_dvds.setItem(row, 3, QTableWidgetItem(str(dvd.ano_lancamento) if dvd.ano_lancamento else ""))
-            self.tabela_dvds.setItem(row, 4, QTableWidgetItem(str(dvd.ano_aquisicao) if dvd.ano_aquisicao else ""))
-            self.tabela_dvds.setItem(row, 5, QTableWidgetItem("Sim" if dvd.disponivel else "Não"))
+        Returns:
+            generator: Uma tupla de textos por DVD.
+        """
+        return (
+            (
+                str(dvd.id),
+                dvd.nome,
+                dvd.sinopse or "",
+                str(dvd.ano_lancamento) if dvd.ano_lancamento else "",
+                str(dvd.ano_aquisicao) if dvd.ano_aquisicao else "",
+                "Sim" if dvd.disponivel else "Não"
+            )
+            for dvd in dvds
+        )
     
     def limpar_campos(self):
         """Limpa os campos de entrada."""
@@ -192,15 +314,31 @@ class DVDView(QWidget):
         dvd_id = self.id_input.text()
         
         if dvd_id:  # Atualização
-            sucesso = DVDController.atualizar_dvd(
-                int(dvd_id), nome, sinopse, ano_lancamento, ano_aquisicao, disponivel
+            self.carregador.gravar(
+                "dvds.salvar", DVDController.atualizar_dvd,
+                int(dvd_id), nome, sinopse, ano_lancamento, ano_aquisicao, disponivel,
+                ao_concluir=lambda sucesso: self.concluir_salvamento(
+                    sucesso, "DVD atualizado com sucesso!" if sucesso else "Erro ao atualizar DVD."
+                ),
+                ao_falhar=self.exibir_erro
             )
-            mensagem = "DVD atualizado com sucesso!" if sucesso else "Erro ao atualizar DVD."
         else:  # Novo cadastro
-            dvd = DVDController.cadastrar_dvd(nome, sinopse, ano_lancamento, ano_aquisicao)
-            sucesso = dvd is not None
-            mensagem = "DVD cadastrado com sucesso!" if sucesso else "Erro ao cadastrar DVD."
+            self.carregador.gravar(
+                "dvds.salvar", DVDController.cadastrar_dvd,
+                nome, sinopse, ano_lancamento, ano_aquisicao,
+                ao_concluir=lambda dvd: self.concluir_salvamento(
+                    dvd is not None, "DVD cadastrado com sucesso!" if dvd else "Erro ao cadastrar DVD."
+                ),
+                ao_falhar=self.exibir_erro
+            )
+    
+    def concluir_salvamento(self, sucesso, mensagem):
+        """Atualiza a tela depois de salvar ou excluir um DVD.
         
+        Args:
+            sucesso (bool): Se a operação foi bem-sucedida.
+            mensagem (str): Mensagem exibida ao usuário.
+        """
         if sucesso:
             self.limpar_campos()
             self.carregar_dvds()
@@ -208,6 +346,14 @@ class DVDView(QWidget):
         else:
             QMessageBox.critical(self, "Erro", mensagem)
     
+    def exibir_erro(self, erro):
+        """Exibe um erro ocorrido ao gravar um DVD.
+        
+        Args:
+            erro (Exception): Exceção lançada pela operação.
+        """
+        QMessageBox.critical(self, "Erro", f"Erro ao gravar DVD: {str(erro)}")
+    
     def excluir_dvd(self):
         """Exclui um DVD selecionado."""
         dvd_id = self.id_input.text()
@@ -223,34 +369,27 @@ class DVDView(QWidget):
         )
         
         if resposta == QMessageBox.Yes:
-            sucesso = DVDController.excluir_dvd(int(dvd_id))
-            
-            if sucesso:
-                self.limpar_campos()
-                self.carregar_dvds()
-                QMessageBox.information(self, "Sucesso", "DVD excluído com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao excluir DVD.")
+            self.carregador.gravar(
+                "dvds.excluir", DVDController.excluir_dvd, int(dvd_id),
+                ao_concluir=lambda sucesso: self.concluir_salvamento(
+                    sucesso, "DVD excluído com sucesso!" if sucesso else "Erro ao excluir DVD."
+                ),
+                ao_falhar=self.exibir_erro
+            )
     
-    def selecionar_dvd(self, item):
+    def selecionar_dvd(self, index):
         """Seleciona um DVD da tabela para edição.
         
         Args:
-            item (QTableWidgetItem): Item clicado na tabela.
+            index (QModelIndex): Célula clicada na tabela.
         """
-        row = item.row()
-        
-        dvd_id = self.tabela_dvds.item(row, 0).text()
-        nome = self.tabela_dvds.item(row, 1).text()
-        sinopse = self.tabela_dvds.item(row, 2).text()
+        dvd_id, nome, sinopse, ano_lancamento_text, ano_aquisicao_text, disponivel_text = \
+            self.modelo_dvds.linha(index.row())
         
-        ano_lancamento_text = self.tabela_dvds.item(row, 3).text()
         ano_lancamento = int(ano_lancamento_text) if ano_lancamento_text else datetime.now().year
-        
-        ano_aquisicao_text = self.tabela_dvds.item(row, 4).text()
         ano_aquisicao = int(ano_aquisicao_text) if ano_aquisicao_text else datetime.now().year
         
-        disponivel = self.tabela_dvds.item(row, 5).text() == "Sim"
+        disponivel = disponivel_text == "Sim"
         
         self.id_input.setText(dvd_id)
         self.nome_input.setText(nome)
@@ -1,11 +1,13 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QMessageBox
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QMessageBox, QProgressBar
 from PyQt5.QtCore import Qt
 
 from views.cliente_view import ClienteView
 from views.dvd_view import DVDView
 from views.aluguel_view import AluguelView
 from views.dashboard_view import DashboardView
+from views.carregador import Carregador
+from controllers.dvd_controller import DVDController
 from database.config import DatabaseConfig
 
 class MainWindow(QMainWindow):
@@ -17,17 +19,28 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Sistema de Locadora de DVDs")
         self.setGeometry(100, 100, 1000, 600)
         
-        # Inicializa o banco de dados
-        DatabaseConfig.initialize_database()
+        # Todo acesso ao banco passa pelo carregador, fora da thread da interface
+        self.carregador = Carregador(self)
+        self.banco_pronto = False
+        
+        # Indicador de carregamento na barra de status
+        self.progresso = QProgressBar()
+        self.progresso.setRange(0, 0)
+        self.progresso.setMaximumWidth(150)
+        self.progresso.setVisible(False)
+        self.statusBar().addPermanentWidget(self.progresso)
+        
+        self.carregador.ocupado.connect(self.progresso.setVisible)
+        self.carregador.falhou.connect(self.exibir_falha)
         
         # Cria o widget de abas
         self.tab_widget = QTabWidget()
         
         # Cria as abas
-        self.dashboard_view = DashboardView()
-        self.cliente_view = ClienteView()
-        self.dvd_view = DVDView()
-        self.aluguel_view = AluguelView()
+        self.dashboard_view = DashboardView(self.carregador)
+        self.cliente_view = ClienteView(self.carregador)
+        self.dvd_view = DVDView(self.carregador)
+        self.aluguel_view = AluguelView(self.carregador)
         
         # Adiciona as abas ao widget
         self.tab_widget.addTab(self.aluguel_view, "📋 Aluguéis")
@@ -42,19 +55,73 @@ class MainWindow(QMainWindow):
         
         # Conecta os sinais
         self.tab_widget.currentChanged.connect(self.tab_changed)
+        
+        # Inicializa o banco de dados e então carrega a aba inicial
+        self.statusBar().showMessage("Inicializando banco de dados...")
+        self.carregador.executar(
+            "inicializacao", DatabaseConfig.initialize_database,
+            ao_concluir=self.banco_inicializado,
+            ao_falhar=self.falha_inicializacao
+        )
+    
+    def banco_inicializado(self, _):
+        """Carrega a aba atual assim que o banco estiver pronto."""
+        self.banco_pronto = True
+        self.statusBar().clearMessage()
+        self.tab_changed(self.tab_widget.currentIndex())
+        
+        # Disponibilidade dos DVDs em memória, lida uma vez no início
+        self.carregador.executar("disponibilidade", DVDController.carregar_disponibilidade)
+    
+    def falha_inicializacao(self, erro):
+        """Informa que o banco de dados não pôde ser inicializado.
+        
+        Args:
+            erro (Exception): Exceção lançada na inicialização.
+        """
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Erro", f"Erro ao inicializar o banco de dados: {str(erro)}")
+    
+    def exibir_falha(self, canal, erro):
+        """Mostra na barra de status o erro de um carregamento em segundo plano.
+        
+        Args:
+            canal (str): Canal do carregador que falhou.
+            erro (Exception): Exceção lançada.
+        """
+        self.statusBar().showMessage(f"Erro ao carregar dados: {str(erro)}", 10000)
     
     def tab_changed(self, index):
         """Manipula a mudança de aba.
         
+        Cancela os carregamentos das outras abas, que ficariam obsoletos,
+        e recarrega os dados da aba selecionada.
+        
         Args:
             index (int): Índice da aba selecionada.
         """
-        # Atualiza dados conforme a aba selecionada
-        if index == 3:  # Aba de Dashboard
-            self.dashboard_view.carregar_dados()
-        elif index == 0:  # Aba de Aluguéis
-            self.aluguel_view.atualizar_combo_clientes()
-            self.aluguel_view.atualizar_combo_dvds()
+        # As abas só carregam depois que as migrações terminarem
+        if not self.banco_pronto:
+            return
+        
+        atual = self.tab_widget.widget(index)
+        
+        for i in range(self.tab_widget.count()):
+            view = self.tab_widget.widget(i)
+            if view is not atual:
+                self.carregador.cancelar(*view.CANAIS_LEITURA)
+        
+        if atual is not None:
+            atual.carregar_dados()
+    
+    def closeEvent(self, event):
+        """Aguarda as tarefas em andamento antes de fechar a janela.
+        
+        Args:
+            event (QCloseEvent): Evento de fechamento.
+        """
+        self.carregador.aguardar()
+        super().closeEvent(event)
 
 def main():
     """Função principal para iniciar a aplicação."""
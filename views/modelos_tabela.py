@@ -0,0 +1,159 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+class ModeloTabela(QAbstractTableModel):
+    """Modelo somente leitura para as tabelas de listagem.
+    
+    Cada registro é guardado como uma tupla de valores já formatados, sem
+    nenhum objeto Qt por célula. A tupla pode ter valores extras depois das
+    colunas exibidas (por exemplo, flags usadas para colorir a linha).
+    
+    As linhas são entregues à view em lotes: a QTableView chama fetchMore()
+    conforme o usuário rola, então só as linhas próximas da área visível
+    chegam a ser desenhadas.
+    
+    Com carregar_mais, o modelo também pode ser preenchido por páginas do
+    banco: quando a view pede mais linhas do que as já carregadas, e a última
+    página indicou que há mais, carregar_mais() é chamada para buscar a
+    próxima, que chega depois por acrescentar_linhas() ou, se a busca
+    falhar, é liberada para ser pedida de novo por falha_paginacao().
+    """
+    
+    TAMANHO_LOTE = 200
+    
+    def __init__(self, colunas, estilo_linha=None, parent=None, carregar_mais=None):
+        """Inicializa o modelo.
+        
+        Args:
+            colunas (list): Títulos das colunas exibidas.
+            estilo_linha (callable, optional): Função que recebe a tupla da linha e
+                retorna (cor_fundo, cor_texto) ou None. Defaults to None.
+            parent (QObject, optional): Objeto pai. Defaults to None.
+            carregar_mais (callable, optional): Função sem argumentos que agenda a busca
+                da próxima página. Defaults to None.
+        """
+        super().__init__(parent)
+        self._colunas = list(colunas)
+        self._estilo_linha = estilo_linha
+        self._carregar_mais = carregar_mais
+        self._linhas = []
+        self._exibidas = 0
+        self._ha_mais = False
+        self._aguardando = False
+    
+    def definir_linhas(self, linhas, ha_mais=False):
+        """Substitui todo o conteúdo do modelo.
+        
+        Args:
+            linhas (iterable): Tuplas com os valores de cada linha.
+            ha_mais (bool, optional): Se há mais páginas a buscar no banco. Defaults to False.
+        """
+        self.beginResetModel()
+        self._linhas = list(linhas)
+        self._exibidas = min(self.TAMANHO_LOTE, len(self._linhas))
+        self._ha_mais = ha_mais
+        self._aguardando = False
+        self.endResetModel()
+    
+    def acrescentar_linhas(self, linhas, ha_mais=False):
+        """Acrescenta a página pedida por carregar_mais e a entrega à view.
+        
+        Args:
+            linhas (iterable): Tuplas com os valores de cada linha.
+            ha_mais (bool, optional): Se ainda há páginas depois desta. Defaults to False.
+        """
+        self._linhas.extend(linhas)
+        self._ha_mais = ha_mais
+        self._aguardando = False
+        self.fetchMore()
+    
+    def falha_paginacao(self):
+        """Libera um novo pedido de página depois que a busca pedida por carregar_mais falhou."""
+        self._aguardando = False
+    
+    def interromper_paginacao(self):
+        """Deixa de pedir páginas até o próximo definir_linhas (ao recarregar a lista)."""
+        self._ha_mais = False
+    
+    def limpar(self):
+        """Remove todas as linhas do modelo."""
+        self.definir_linhas([])
+    
+    def linha(self, row):
+        """Retorna a tupla de uma linha.
+        
+        Args:
+            row (int): Número da linha.
+            
+        Returns:
+            tuple: Valores da linha.
+        """
+        return self._linhas[row]
+    
+    def total_linhas(self):
+        """Retorna o total de linhas carregadas, inclusive as ainda não exibidas.
+        
+        Returns:
+            int: Número de linhas do modelo.
+        """
+        return len(self._linhas)
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Número de linhas já entregues à view."""
+        if parent.isValid():
+            return 0
+        return self._exibidas
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Número de colunas exibidas."""
+        if parent.isValid():
+            return 0
+        return len(self._colunas)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Texto e cores de uma célula."""
+        if not index.isValid():
+            return None
+        
+        linha = self._linhas[index.row()]
+        
+        if role == Qt.DisplayRole:
+            return linha[index.column()]
+        
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole) and self._estilo_linha:
+            estilo = self._estilo_linha(linha)
+            if estilo:
+                cor = estilo[0] if role == Qt.BackgroundRole else estilo[1]
+                return QColor(cor) if cor is not None else None
+        
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Títulos das colunas."""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._colunas[section]
+        return super().headerData(section, orientation, role)
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        """Indica se ainda há linhas carregadas que a view não recebeu."""
+        if parent.isValid():
+            return False
+        if self._exibidas < len(self._linhas):
+            return True
+        return self._ha_mais and not self._aguardando and self._carregar_mais is not None
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Entrega o próximo lote de linhas à view."""
+        if parent.isValid():
+            return
+        
+        quantidade = min(self.TAMANHO_LOTE, len(self._linhas) - self._exibidas)
+        if quantidade <= 0:
+            if self._ha_mais and not self._aguardando and self._carregar_mais is not None:
+                self._aguardando = True
+                self._carregar_mais()
+            return
+        
+        self.beginInsertRows(QModelIndex(), self._exibidas, self._exibidas + quantidade - 1)
+        self._exibidas += quantidade
+        self.endInsertRows()
\ No newline at end of file